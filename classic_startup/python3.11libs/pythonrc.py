@@ -37,6 +37,14 @@ def classic_startup():
         )
     )
 
+    # use the zip archive of the engine python packages instead when it has
+    # been built for this python version and validated, see
+    # tk_houdini/zip_bundle.py. The packages are then read from a single file.
+    tk_houdini_python_path = (
+        _get_bundle_path(os.path.dirname(tk_houdini_python_path))
+        or tk_houdini_python_path
+    )
+
     # add to the system path
     sys.path.insert(0, tk_houdini_python_path)
 
@@ -62,4 +70,36 @@ def classic_startup():
             print(details)
 
 
+def _get_bundle_path(engine_root_path):
+    """
+    Returns the path to the zip archive of the engine python packages for this
+    python version if it was validated when the engine was deployed, None
+    otherwise.
+
+    The stamp written next to the archive by tk_houdini/zip_bundle.py holds the
+    size and modification time of the validated archive. Only the stamp and the
+    archive are looked at, the sources are checked when the engine is deployed.
+    """
+    if os.environ.get("TK_HOUDINI_ZIP_BUNDLE") == "0":
+        return None
+
+    bundle_path = os.path.join(
+        engine_root_path, "tk-houdini-py%d%d.zip" % sys.version_info[:2]
+    )
+    try:
+        with open(bundle_path + ".stamp") as stamp_file:
+            stamp = stamp_file.read().split()
+        bundle_stat = os.stat(bundle_path)
+    except (IOError, OSError):
+        return None
+
+    if stamp != [str(bundle_stat.st_size), str(bundle_stat.st_mtime_ns)]:
+        sys.stderr.write(
+            "Flow Production Tracking: not using %s, it changed since it was "
+            "validated.\n" % bundle_path
+        )
+        return None
+    return bundle_path
+
+
 classic_startup()
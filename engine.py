@@ -14,8 +14,7 @@ A Houdini engine for Tank.
 
 import os
 import re
-import ctypes
-import shutil
+import sys
 import time
 
 import sgtk
@@ -81,19 +80,64 @@ class HoudiniEngine(sgtk.platform.Engine):
 
         self.logger.debug("%s: Initializing..." % self)
 
+        # record the startup critical path. The timeline is written to the
+        # session temp directory as a Chrome trace once post_app_init is done.
+        tk_houdini = self.import_module("tk_houdini")
+        self._startup_timeline = tk_houdini.StartupTimeline(self.logger)
+        self._startup_timeline.begin("HoudiniEngine.init_engine")
+
+        # the scripts of the generated menu, shelf and panels call into this
+        # module, under a name they can import.
+        tk_houdini.entry_points.register()
+
+        # the startup files import the bootstrap code from the zip archive of
+        # the packages when it was validated, see tk_houdini/zip_bundle.py.
+        for module_name in ("tk_houdini", "tk_houdini_basic"):
+            module = sys.modules.get(module_name)
+            if module is not None and getattr(module, "__file__", None):
+                self.logger.debug(
+                    "Startup code %s imported from %s"
+                    % (module_name, os.path.dirname(module.__file__))
+                )
+
+        # remove the temp directories left behind by crashed sessions. This
+        # runs in a background thread.
+        if tk_houdini.bootstrap.g_temp_env in os.environ:
+            tk_houdini.bootstrap.start_temp_dir_janitor()
+
         self._houdini_version = hou.applicationVersion()
 
+        # registered commands and panels of the current context, see
+        # tk_houdini.ui_generation.get_command_index
+        self._command_index = None
+
+        # UI state of the contexts switched away from, reused when switching
+        # back to them
+        self._ui_snapshots = tk_houdini.UISnapshotCache(
+            self.get_setting("ui_snapshot_count", 8),
+            self.get_setting("ui_snapshot_max_age", 3600),
+        )
+
+        # index of the app otl files, created the first time otls are loaded
+        self._otl_manifest = None
+
+        # source paths of the otl files installed in this session to the path
+        # they were installed from, which is their local copy when the file was
+        # already mirrored, and their modification time when they were
+        # installed. The installed path is kept for the session, so a file
+        # mirrored later isn't installed a second time from its copy.
+        self._installed_otls = {}
+
+        # local copies of the resource files read from the bundle cache
+        self._resource_mirror = None
+        if self.get_setting("mirror_resources"):
+            self._resource_mirror = tk_houdini.ResourceMirror(self.logger)
+
         # keep track of if a UI exists
         self._ui_enabled = hasattr(hou, "ui")
 
         url_doc_supported_versions = "https://help.autodesk.com/view/SGDEV/ENU/?guid=SGD_si_integrations_engine_supported_versions_html"
 
-        # Unable to use sgtk.platform.qt from here because it has not been
-        # provisionned by tk-core yet
-        from sgtk.util.qt_importer import QtImporter
-
-        qt = QtImporter()
-
         if self._houdini_version[0:2] < VERSION_OLDEST_COMPATIBLE:
             # Older than the oldest compatible version
 
@@ -124,6 +168,7 @@ For information regarding support engine versions, please visit this page:
             )
 
             if self._ui_enabled:
+                qt = self._get_qt_importer()
                 qt.QtGui.QMessageBox.warning(
                     # Can't use hou.ui.displayMessage because does not support Rich Text
                     None,  # parent
@@ -179,6 +224,7 @@ For information regarding support engine versions, please visit this page:
             ):
                 # Show the message if in UI mode and the warning dialog isn't
                 # overridden by the config.
+                qt = self._get_qt_importer()
                 qt.QtGui.QMessageBox.warning(
                     # Can't use hou.ui.displayMessage because does not support Rich Text
                     None,  # parent
@@ -212,11 +258,22 @@ Please report any issues to:
                     ),
                 )
 
+        self._startup_timeline.end("HoudiniEngine.init_engine")
+
     def pre_app_init(self):
         """
         Called at startup, but after QT has been initialized.
         """
+        with self._startup_timeline.phase("HoudiniEngine.pre_app_init"):
+            self._pre_app_init()
+
+    def _pre_app_init(self):
+        """
+        Sets up the file change timer and the menu name when a UI is available,
+        or checks the app profile otherwise.
+        """
         if not self._ui_enabled:
+            self._check_app_profile()
             return
 
         # We can use the dynamic menus and shelf api to
@@ -227,17 +284,61 @@ Please report any issues to:
         if self.get_setting("automatic_context_switch", True):
             tk_houdini.ensure_file_change_timer_running()
 
-        self._menu_name = "Flow Production Tracking"
-        if self.get_setting("use_short_menu_name", False):
-            self._menu_name = "FPTR"
+        self._menu_name = tk_houdini.get_menu_name(
+            self.get_setting("use_short_menu_name", False)
+        )
+
+    def _check_app_profile(self):
+        """
+        Checks that the engine runs in the environment of the app profile
+        selected by the TK_HOUDINI_APP_PROFILE env variable, if any.
+
+        The apps of a profile are the ones of an environment of the pipeline
+        configuration named after it, which the pick_environment core hook of
+        the configuration returns when the variable is set. The engine only
+        loads the apps of its environment, including after a context change,
+        so the other apps aren't initialized and their otls aren't loaded.
+        """
+        tk_houdini = self.import_module("tk_houdini")
+        profile_name = os.environ.get(tk_houdini.bootstrap.g_app_profile_env)
+        if not profile_name:
+            return
+
+        environment_name = self.environment["name"]
+        if environment_name == profile_name:
+            self.logger.debug("Using app profile '%s'" % profile_name)
+        else:
+            self.logger.warning(
+                "App profile '%s' is selected but the engine runs in environment "
+                "'%s', all its apps are loaded. The pick_environment core hook of "
+                "the configuration should return the '%s' environment when the "
+                "%s env variable is set."
+                % (
+                    profile_name,
+                    environment_name,
+                    profile_name,
+                    tk_houdini.bootstrap.g_app_profile_env,
+                )
+            )
 
     def post_app_init(self):
         """
         Init that runs after all apps have been loaded.
         """
+        with self._startup_timeline.phase("HoudiniEngine.post_app_init"):
+            self._post_app_init()
 
-        from sgtk.platform.qt import QtCore
+        self._unblock_qt_imports()
+
+        # the trace is written once the phases deferred with a QTimer are done
+        tk_houdini = self.import_module("tk_houdini")
+        self._startup_timeline.finish(tk_houdini.bootstrap.get_session_dir())
 
+    def _post_app_init(self):
+        """
+        Builds the menu, shelf and panels, loads the app otls and runs the
+        startup commands.
+        """
         tk_houdini = self.import_module("tk_houdini")
         bootstrap = tk_houdini.bootstrap
 
@@ -250,27 +351,50 @@ Please report any issues to:
             def _load_otls():
                 self._load_app_otls(oplibrary_path)
 
+            def _load_otls_deferred():
+                try:
+                    _load_otls()
+                finally:
+                    self._startup_timeline.release()
+
             # We have the same problem here on Windows that we have above with
             # the population of the shelf. If we defer the execution of the otl
             # loading by an event loop cycle, Houdini loads up quickly.
             if self.has_ui and sgtk.util.is_windows():
-                QtCore.QTimer.singleShot(1, _load_otls)
+                from sgtk.platform.qt import QtCore
+
+                self._startup_timeline.hold()
+                QtCore.QTimer.singleShot(1, _load_otls_deferred)
             else:
                 _load_otls()
 
         if not self.has_ui:
-            # no UI. everything after this requires the UI!
+            # no UI. everything after this requires the UI, except the Flow
+            # host which is used by farm jobs too.
+            self._init_flow_host()
             return
 
+        from sgtk.platform.qt import QtCore
+
         if bootstrap.g_temp_env in os.environ:
 
             commands = None
+            panel_commands = []
             enable_sg_menu = self.get_setting("enable_sg_menu", True)
             enable_sg_shelf = self.get_setting("enable_sg_shelf", True)
 
             # menu and/or shelf definitions will be written here
             xml_tmp_dir = os.environ[bootstrap.g_temp_env]
 
+            # the definitions Houdini doesn't look for on the startup path are
+            # private to this session. This is a different folder when the temp
+            # directory is shared by several sessions.
+            session_dir = bootstrap.get_session_dir()
+
+            # whether the menu definition Houdini reads from the startup path
+            # was written during this call.
+            menu_file_changed = False
+
             if enable_sg_menu or enable_sg_shelf:
 
                 # get the list of registered commands to supply to the menu
@@ -281,8 +405,20 @@ Please report any issues to:
                 # populate a callback map. this is a map of command ids to a
                 # corresponding callback. these are used by the menu and shelf
                 # for executing installed app commands.
-                self._callback_map = dict(
-                    (cmd.get_id(), cmd.callback) for cmd in commands
+                self._callback_map = tk_houdini.get_command_index(self).callbacks
+
+                # Get the list of registered commands to build panels for. The
+                # commands returned are AppCommand objects defined in
+                # tk_houdini.ui_generation
+                panel_commands = tk_houdini.get_registered_panels(self)
+
+                # the generated shelf and panel definitions are cached across
+                # sessions, keyed by everything they are generated from. On a
+                # cache hit they are read or restored instead of being
+                # generated.
+                ui_cache = tk_houdini.UICache(self.logger)
+                ui_cache_key = tk_houdini.get_ui_cache_key(
+                    self, commands, panel_commands
                 )
 
             if commands and enable_sg_menu:
@@ -295,9 +431,12 @@ Please report any issues to:
                 # that we can access it from the menu scripts when they get
                 # ahold of the current engine.
                 self._menu = tk_houdini.AppCommandsMenu(self, commands)
-                if not os.path.exists(menu_file):
-                    # just create the xml for the menus
-                    self._menu.create_menu(menu_file)
+
+                # just create the xml for the menus. It only depends on the
+                # menu name, the file is usually already written by the
+                # launcher, in which case it is left alone.
+                with self._startup_timeline.phase("AppCommandsMenu.create_menu"):
+                    menu_file_changed = self._menu.create_menu(menu_file)
 
             if commands and enable_sg_shelf:
 
@@ -313,8 +452,9 @@ Please report any issues to:
                     # existing shelf set, so for now we just leave the shelf and
                     # add/remove tools.
                     self._shelf.destroy_tools()
-                    shelf_file = self._safe_path_join(xml_tmp_dir, "sg_shelf.xml")
-                    self._shelf.create_shelf(shelf_file)
+                    shelf_file = self._safe_path_join(session_dir, "sg_shelf.xml")
+                    with self._startup_timeline.phase("AppCommandsShelf.create_shelf"):
+                        self._shelf.create_shelf(shelf_file, ui_cache, ui_cache_key)
 
                 def _poll_for_ui_available_then_setup_shelves():
                     """
@@ -333,7 +473,10 @@ Please report any issues to:
                             100, _poll_for_ui_available_then_setup_shelves
                         )
                     else:
-                        _setup_shelf()
+                        try:
+                            _setup_shelf()
+                        finally:
+                            self._startup_timeline.release()
 
                 # We have a problem specific to Windows where Houdini takes a really
                 # long time to launch when Toolkit is being used. This it related to
@@ -350,6 +493,7 @@ Please report any issues to:
                 # Instead, wait for the UI to be created before attempting to create
                 # shelves.
                 if sgtk.util.is_windows():
+                    self._startup_timeline.hold()
                     QtCore.QTimer.singleShot(
                         100, _poll_for_ui_available_then_setup_shelves
                     )
@@ -358,30 +502,41 @@ Please report any issues to:
 
             if commands:
 
-                # Get the list of registered commands to build panels for. The
-                # commands returned are AppCommand objects defined in
-                # tk_houdini.ui_generation
-                panel_commands = tk_houdini.get_registered_panels(self)
-
                 # expose the wrapped panel method on the engine so that the
                 # panels can call it directly
                 self.get_wrapped_panel_widget = tk_houdini.get_wrapped_panel_widget
 
                 if panel_commands:
                     self._panels_file = self._safe_path_join(
-                        xml_tmp_dir, "sg_panels.pypanel"
+                        session_dir, "sg_panels.pypanel"
                     )
                     panels = tk_houdini.AppCommandsPanelHandler(
                         self, commands, panel_commands
                     )
-                    panels.create_panels(self._panels_file)
 
-            if self._houdini_version >= (21, 0, 479):
+                    if (
+                        ui_cache.restore(
+                            ui_cache_key, "sg_panels.pypanel", self._panels_file
+                        )
+                        is None
+                    ):
+                        with self._startup_timeline.phase(
+                            "AppCommandsPanelHandler.create_panels"
+                        ):
+                            panels.create_panels(self._panels_file)
+                        ui_cache.store(
+                            ui_cache_key, "sg_panels.pypanel", self._panels_file
+                        )
+                    else:
+                        panels.install_panels(self._panels_file)
+
+            if self._houdini_version >= (21, 0, 479) and menu_file_changed:
                 # Houdini 21.0+ introduced changes to how startup paths are cached, which can
                 # prevent custom menus (like the FPTR menu) from appearing unless the cache is
                 # refreshed. The call below ensures that Houdini recognizes and loads our custom
                 # menu definitions from the temporary directory, as documented in SideFx ticket
-                # 169562 (SG-40163).
+                # 169562 (SG-40163). When the menu file found in the temporary directory was
+                # already up to date, Houdini has loaded it at startup and the refresh is skipped.
                 hou.refreshStartupPathCacheDirectory(xml_tmp_dir)
 
         # Typically we only call this method for engines which don't have a
@@ -396,9 +551,16 @@ Please report any issues to:
         # houdini itself, despite the global nature of the method.
 
         # Run a series of app instance commands at startup.
-        self._run_app_instance_commands()
+        with self._startup_timeline.phase("_run_app_instance_commands"):
+            self._run_app_instance_commands()
 
-        # Instantiate FlowHost if current context is configured with Flow
+        self._init_flow_host()
+
+    def _init_flow_host(self):
+        """
+        Instantiates the Flow host if the current context is configured with
+        Flow.
+        """
         if hasattr(self.context, "flow_project_id") and self.context.flow_project_id:
             self.logger.info("Instantiating Flow host as HoudiniHost...")
             host_mod = self.import_module("flowam.host")
@@ -428,17 +590,55 @@ Please report any issues to:
 
         # Update the menu and shelf to reflect the new context
         if self.has_ui:
-            # Get new commands for the updated context
-            commands = tk_houdini.get_registered_commands(self)
-            self._callback_map = dict((cmd.get_id(), cmd.callback) for cmd in commands)
+            # Get new commands for the updated context, and compare them with
+            # the commands of the previous context so that only the changed
+            # menu entries and shelf tools are updated.
+            old_index = self._command_index
+            if old_index is not None:
+                self._ui_snapshots.put(
+                    old_context, self._capture_ui_snapshot(old_index)
+                )
+
+            # swap in the state prepared the last time the new context was
+            # current, if the apps and commands didn't change since.
+            snapshot = self._ui_snapshots.get(
+                new_context, tk_houdini.ui_snapshot.get_command_set_hash(self)
+            )
+            if snapshot is not None:
+                self.logger.debug("Using the UI snapshot of %s" % new_context)
+                self._command_index = snapshot.index
+
+            index = tk_houdini.get_command_index(self)
+            commands = list(index.commands)
+            self._callback_map = index.callbacks
+            diff = tk_houdini.diff_command_indexes(old_index, index)
+            self.logger.debug(
+                "Commands changed by the context switch: %d added, %d removed, "
+                "%d updated." % (len(diff.added), len(diff.removed), len(diff.changed))
+            )
 
             # Update menu with new context
             if hasattr(self, "_menu") and self._menu:
-                self._menu.refresh(commands)
+                self._menu.refresh(commands, diff, snapshot)
 
             # Update shelf with new context
             if hasattr(self, "_shelf") and self._shelf:
-                self._shelf.refresh(commands)
+                self._shelf.refresh(commands, diff, snapshot)
+
+    def _capture_ui_snapshot(self, index):
+        """
+        Returns the UI state prepared for the current context.
+
+        :param index: The `CommandIndex` of the current context.
+        :returns: A `UISnapshot`.
+        """
+        tk_houdini = self.import_module("tk_houdini")
+        snapshot = tk_houdini.UISnapshot(index)
+        if hasattr(self, "_menu") and self._menu:
+            self._menu.capture_snapshot(snapshot)
+        if hasattr(self, "_shelf") and self._shelf:
+            self._shelf.capture_snapshot(snapshot)
+        return snapshot
 
     def destroy_engine(self):
         """
@@ -447,6 +647,9 @@ Please report any issues to:
 
         self.logger.debug("%s: Destroying..." % self)
 
+        # the engine may be destroyed before its apps are loaded
+        self._unblock_qt_imports()
+
         if hasattr(self, "_shelf") and self._shelf:
             # there doesn't appear to be a way to programmatically add a shelf
             # to an existing shelf set. in order to enable context switching,
@@ -457,8 +660,10 @@ Please report any issues to:
         tk_houdini = self.import_module("tk_houdini")
         bootstrap = tk_houdini.bootstrap
         if bootstrap.g_temp_env in os.environ:
-            # clean up and keep on going
-            shutil.rmtree(os.environ[bootstrap.g_temp_env])
+            # clean up and keep on going. The removal happens in a background
+            # thread so the teardown doesn't block on it. A stable temp
+            # directory is kept for the next sessions.
+            bootstrap.remove_session_dir_async()
 
     @property
     def has_ui(self):
@@ -467,6 +672,66 @@ Please report any issues to:
         """
         return self._ui_enabled
 
+    def _is_headless(self):
+        """
+        Whether the engine runs in headless mode, in which Qt is never imported.
+
+        This requires Houdini to run without a UI, e.g. hython on the farm, and
+        the headless_mode setting to be on. The TK_HOUDINI_HEADLESS env variable
+        overrides the setting when set to "1" or "0".
+        """
+        if hasattr(hou, "ui"):
+            return False
+
+        tk_houdini = self.import_module("tk_houdini")
+        headless = os.environ.get(tk_houdini.bootstrap.g_headless_env)
+        if headless in ("0", "1"):
+            return headless == "1"
+        return self.get_setting("headless_mode", False)
+
+    def _define_qt_base(self):
+        """
+        Returns an empty Qt base in headless mode, so Qt is not imported.
+        Toolkit code checks the Qt modules of sgtk.platform.qt before using them,
+        they are None in this mode.
+
+        tk-core also imports Qt for its Qt5 and Qt6 modules and for the
+        authentication UI, and the apps may import it when they are initialized,
+        so the imports of the Qt bindings are blocked until the apps are loaded,
+        see tk_houdini/headless.py.
+        """
+        if self._is_headless():
+            self.logger.debug("Running in headless mode, Qt is not imported.")
+            tk_houdini = self.import_module("tk_houdini")
+            self._qt_import_blocker = tk_houdini.QtImportBlocker()
+            self._qt_import_blocker.install()
+            return {}
+        return super()._define_qt_base()
+
+    def _define_qt6_base(self):
+        """
+        Returns an empty Qt6 base in headless mode, so Qt is not imported.
+        """
+        if self._is_headless():
+            return {}
+        return super()._define_qt6_base()
+
+    def _unblock_qt_imports(self):
+        """
+        Lets the Qt bindings be imported again once the engine is started in
+        headless mode, so the scripts of the session can still use them.
+        """
+        blocker = getattr(self, "_qt_import_blocker", None)
+        if blocker is None:
+            return
+
+        blocker.uninstall()
+        self._qt_import_blocker = None
+        if blocker.blocked:
+            self.logger.debug(
+                "Qt imports blocked in headless mode: %s" % ", ".join(blocker.blocked)
+            )
+
     def _emit_log_message(self, handler, record):
         """
         Called by the engine whenever a new log message is available. All log
@@ -615,6 +880,19 @@ Please report any issues to:
     # internal methods
     ############################################################################
 
+    @staticmethod
+    def _get_qt_importer():
+        """
+        Returns a QtImporter to display the compatibility warnings from
+        init_engine. Importing Qt is expensive, so this is only done when a
+        dialog is actually displayed.
+        """
+        # Unable to use sgtk.platform.qt from init_engine because it has not
+        # been provisionned by tk-core yet
+        from sgtk.util.qt_importer import QtImporter
+
+        return QtImporter()
+
     @staticmethod
     def version_str(version_tuple):
         return ".".join([str(v) for v in version_tuple])
@@ -682,20 +960,111 @@ Please report any issues to:
 
         Look in any application folder for a otls subdirectory and load any .otl
         file from there.
+
+        Only the files which are not already installed in this session, or
+        which changed since they were installed, are installed. When the
+        ``uninstall_stale_otls`` setting is on, the files of the apps which are
+        no longer loaded are uninstalled. When the ``consolidate_otls`` setting
+        is on, the files are merged into a cached library which is installed
+        instead, and the library installed for the previous apps is always
+        uninstalled.
+
         :param oplibrary_path: A temporary path that can be used to install otls to
         """
 
-        def install_otls_from_dir(root_path):
-            for filename in os.listdir(root_path):
-                full_path = self._safe_path_join(root_path, filename)
-                if os.path.splitext(filename)[-1] == ".otl":
-                    path = full_path.replace(os.path.sep, "/")
-                    hou.hda.installFile(path, oplibrary_path, True)
+        if self._otl_manifest is None:
+            tk_houdini = self.import_module("tk_houdini")
+            self._otl_manifest = tk_houdini.OtlManifest(
+                self.logger, self._houdini_version
+            )
 
+        otl_files = []
         for app in self.apps.values():
-            otl_path = self._safe_path_join(app.disk_location, "otls")
-            for a_path in self._get_otl_paths(otl_path):
-                install_otls_from_dir(a_path)
+            with self._startup_timeline.phase("_load_app_otls", app=app.name):
+                otl_path = self._safe_path_join(app.disk_location, "otls")
+                otl_files.extend(
+                    self._otl_manifest.get_otl_files(
+                        app.descriptor.get_uri(), otl_path, self._get_otl_files
+                    )
+                )
+
+        self._otl_manifest.save()
+
+        # install a single library merging all the otl files instead of each
+        # file individually.
+        library_path = None
+        if self.get_setting("consolidate_otls") and otl_files:
+            with self._startup_timeline.phase("consolidate_otls"):
+                tk_houdini = self.import_module("tk_houdini")
+                library_path = tk_houdini.OtlLibraryCache(
+                    self.logger, self._houdini_version
+                ).get_library(otl_files)
+
+        if library_path:
+            otl_files = [library_path.replace(os.path.sep, "/")]
+
+        with self._startup_timeline.phase("install_otls"):
+            for source_path in otl_files:
+                try:
+                    mtime = os.path.getmtime(source_path)
+                except OSError:
+                    mtime = None
+                installed = self._installed_otls.get(source_path)
+                if installed and installed[1] == mtime:
+                    continue
+
+                if library_path or installed:
+                    # the library is already local, and the copy of a file
+                    # which changed in the session may not be mirrored again
+                    # yet.
+                    path = source_path
+                else:
+                    path = self._get_resource_path(source_path)
+                if installed and installed[0] != path:
+                    self._uninstall_otl(installed[0], oplibrary_path)
+                hou.hda.installFile(path, oplibrary_path, True)
+                self._installed_otls[source_path] = (path, mtime)
+
+        # a library is built for each set of apps, the previous one would
+        # otherwise keep providing the same definitions.
+        if self.get_setting("uninstall_stale_otls") or self.get_setting(
+            "consolidate_otls"
+        ):
+            for source_path in list(self._installed_otls):
+                if source_path in otl_files:
+                    continue
+                path, _ = self._installed_otls.pop(source_path)
+                self._uninstall_otl(path, oplibrary_path)
+
+    def _uninstall_otl(self, path, oplibrary_path):
+        """
+        Uninstalls an otl file installed by :meth:`_load_app_otls`.
+
+        :param str path: The path the file was installed from.
+        :param oplibrary_path: The path the file was installed to.
+        """
+        self.logger.debug("Uninstalling otl %s" % (path,))
+        try:
+            hou.hda.uninstallFile(path, oplibrary_path, True)
+        except hou.OperationFailed as e:
+            self.logger.warning("Unable to uninstall %s: %s" % (path, e))
+
+    def _get_otl_files(self, otl_path):
+        """
+        Gathers the otl files of an app otl folder.
+
+        :param otl_path: The otls folder of an app.
+        :returns: A tuple with the list of folders returned by
+            :meth:`_get_otl_paths` and the list of otl files they contain.
+        """
+        otl_paths = self._get_otl_paths(otl_path)
+        otl_files = []
+        for root_path in otl_paths:
+            for filename in os.listdir(root_path):
+                if os.path.splitext(filename)[-1] == ".otl":
+                    full_path = self._safe_path_join(root_path, filename)
+                    otl_files.append(full_path.replace(os.path.sep, "/"))
+        return otl_paths, otl_files
 
     def _get_otl_paths(self, otl_path):
         """
@@ -877,11 +1246,26 @@ Please report any issues to:
         """
         from sgtk.platform import constants
 
-        return self._safe_path_join(
-            self.disk_location,
-            constants.BUNDLE_STYLESHEET_FILE,
+        return self._get_resource_path(
+            self._safe_path_join(
+                self.disk_location,
+                constants.BUNDLE_STYLESHEET_FILE,
+            )
         )
 
+    def _get_resource_path(self, path):
+        """
+        Returns the path to read a resource file from. This is the path to its
+        local copy when the ``mirror_resources`` setting is on and the file has
+        been mirrored, the given path otherwise.
+
+        :param str path: Path to a resource file, e.g. an icon or an otl.
+        :returns: The path to read the file from.
+        """
+        if self._resource_mirror is None:
+            return path
+        return self._resource_mirror.get_path(path)
+
     def _get_engine_root_path(self):
         """
         Returns the path to the directory containing this engine.py.
@@ -988,6 +1372,8 @@ Please report any issues to:
         dialog.activateWindow()
 
         if sgtk.util.is_windows():
+            import ctypes
+
             # special case to get windows to raise the dialog
             ctypes.windll.user32.SetActiveWindow(dialog.winId())
 
@@ -997,6 +1383,10 @@ Please report any issues to:
         """
         Launches a modal dialog. Overridden from base class.
         """
+        if self._is_headless():
+            self.logger.warning("Unable to show '%s' in headless mode." % title)
+            return None
+
         from sgtk.platform.qt import QtCore, QtGui
 
         # In houdini, the script editor runs in a custom thread. Any commands executed here
@@ -1033,6 +1423,10 @@ Please report any issues to:
         """
         Shows a modeless dialog. Overridden from base class.
         """
+        if self._is_headless():
+            self.logger.warning("Unable to show '%s' in headless mode." % title)
+            return None
+
         from sgtk.platform.qt import QtCore, QtGui
 
         # In houdini, the script editor runs in a custom thread. Any commands executed here
@@ -0,0 +1,194 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Caches what the plugin resolves while bootstrapping, so a warm relaunch can
+skip parsing the plugin info.yml file and resolving the configuration.
+
+This module is imported before toolkit is bootstrapped, it only depends on the
+standard library.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Name of the env variable setting how long, in seconds, a resolved
+# configuration is reused.
+TTL_ENV = "TK_HOUDINI_BOOTSTRAP_CACHE_TTL"
+
+# By default, the configuration is resolved on every launch. Reusing it is opt
+# in: a launch using a reused configuration checks for its latest version once
+# the engine is started, and the next launches resolve it again when a newer
+# version was released.
+DEFAULT_TTL = 0
+
+# Bump when the format of the cache file changes.
+_CACHE_VERSION = 2
+
+
+class BootstrapCache(object):
+    """
+    Small json file storing the plugin info and the resolved configuration of a
+    plugin.
+
+    The plugin info is valid as long as the plugin info.yml file has the
+    recorded size and modification time. The resolved configuration is
+    specific to the plugin info it was resolved from, and to the site and the
+    user it was resolved for. It is only reused when a time to live is set, and
+    expires after it.
+    """
+
+    def __init__(self, cache_folder, plugin_root_path, ttl=None):
+        """
+        :param str cache_folder: Folder to store the cache file in.
+        :param str plugin_root_path: Path to the root folder of the plugin.
+        :param int ttl: How long a resolved configuration is reused, in
+            seconds. Defaults to the value of the TK_HOUDINI_BOOTSTRAP_CACHE_TTL
+            env variable, or 0, i.e. it isn't reused.
+        """
+        self._plugin_root_path = plugin_root_path
+        self._info_yml_path = os.path.join(plugin_root_path, "info.yml")
+        self._cache_path = os.path.join(
+            cache_folder,
+            "plugin-%s.json"
+            % hashlib.sha1(plugin_root_path.encode("utf-8")).hexdigest()[:16],
+        )
+        if ttl is None:
+            try:
+                ttl = int(os.environ.get(TTL_ENV, DEFAULT_TTL))
+            except ValueError:
+                ttl = DEFAULT_TTL
+        self._ttl = ttl
+        self._data = None
+
+    @property
+    def path(self):
+        """
+        Path to the cache file.
+        """
+        return self._cache_path
+
+    def get_plugin_info(self, parse_info_yml):
+        """
+        Returns the plugin info, from the cache if info.yml didn't change.
+
+        :param parse_info_yml: Callable accepting the path to the info.yml file
+            and returning its content as a dictionary.
+        :returns: A tuple with the plugin id and the base configuration.
+        """
+        info_yml_key = self._get_info_yml_key()
+        data = self._load()
+        if data.get("info_yml") != info_yml_key:
+            plugin_info = parse_info_yml(self._info_yml_path)
+            # the resolved configuration is specific to the plugin info
+            self._data = data = {
+                "version": _CACHE_VERSION,
+                "info_yml": info_yml_key,
+                "plugin_id": plugin_info["plugin_id"],
+                "base_configuration": plugin_info["base_configuration"],
+            }
+            self._save()
+
+        return data["plugin_id"], data["base_configuration"]
+
+    def get_resolved_configuration(self, site, login):
+        """
+        Returns the configuration resolved by a previous bootstrap for the same
+        site and user, if it hasn't expired.
+
+        :param str site: The url of the site.
+        :param str login: The login of the user.
+        :returns: A descriptor uri or None.
+        """
+        if self._ttl <= 0:
+            return None
+        data = self._load()
+        if data.get("info_yml") != self._get_info_yml_key():
+            return None
+        resolved = data.get("resolved_configuration")
+        if not resolved or time.time() - resolved["time"] > self._ttl:
+            return None
+        if resolved.get("site") != site or resolved.get("login") != login:
+            return None
+        return resolved["uri"]
+
+    def set_resolved_configuration(self, uri, site=None, login=None):
+        """
+        Records the configuration resolved by the bootstrap.
+
+        :param str uri: The uri of the configuration descriptor, or None to
+            clear the recorded configuration.
+        :param str site: The url of the site it was resolved for.
+        :param str login: The login of the user it was resolved for.
+        """
+        data = self._load()
+        if not data:
+            # the plugin info must be cached first
+            return
+        if uri is None:
+            data.pop("resolved_configuration", None)
+        else:
+            data["resolved_configuration"] = {
+                "uri": uri,
+                "site": site,
+                "login": login,
+                "time": time.time(),
+            }
+        self._save()
+
+    def _get_info_yml_key(self):
+        """
+        Returns what identifies the current version of the info.yml file.
+        """
+        try:
+            stat = os.stat(self._info_yml_path)
+        except OSError:
+            return None
+        return [self._plugin_root_path, stat.st_size, stat.st_mtime]
+
+    def _load(self):
+        """
+        Reads the cache file the first time it is needed.
+
+        :returns: The cached data, empty if there is none.
+        """
+        if self._data is None:
+            try:
+                with open(self._cache_path, "r") as cache_file:
+                    self._data = json.load(cache_file)
+            except (IOError, OSError, ValueError):
+                self._data = {}
+            if (
+                not isinstance(self._data, dict)
+                or self._data.get("version") != _CACHE_VERSION
+            ):
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        """
+        Atomically writes the cache file. Failures are ignored, the cache is an
+        optimization.
+        """
+        folder = os.path.dirname(self._cache_path)
+        tmp_path = None
+        try:
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            handle, tmp_path = tempfile.mkstemp(dir=folder, prefix=".plugin-")
+            with os.fdopen(handle, "w") as tmp_file:
+                json.dump(self._data, tmp_file)
+            os.replace(tmp_path, self._cache_path)
+        except (IOError, OSError):
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -11,6 +11,15 @@
 import os
 import sys
 
+# Name of the env variable which, when set to "1", bootstraps the engine
+# asynchronously. Matches tk_houdini.bootstrap.g_async_bootstrap_env, which
+# can't be imported before the engine is bootstrapped.
+ASYNC_BOOTSTRAP_ENV = "TK_HOUDINI_ASYNC_BOOTSTRAP"
+
+# Name of the env variable storing the path to the socket of the toolkit daemon.
+# Matches tk_houdini.bootstrap.g_toolkit_daemon_env.
+TOOLKIT_DAEMON_ENV = "TK_HOUDINI_TOOLKIT_DAEMON"
+
 
 def bootstrap(plugin_root_path):
     """
@@ -42,6 +51,10 @@ def bootstrap(plugin_root_path):
         manifest = None
         running_stand_alone = False
 
+    # caches the plugin info and the resolved configuration when running in
+    # situ.
+    bootstrap_cache = None
+
     if running_stand_alone:
         # running stand alone. import core from the manifest's core path and
         # extract the plugin info from the manifest
@@ -60,20 +73,20 @@ def bootstrap(plugin_root_path):
         bundle_cache = os.path.join(plugin_root_path, "bundle_cache")
     else:
         # running in situ as part of zero config. sgtk has already added sgtk
-        # to the python path. need to extract the plugin info from info.yml
-
-        # import the yaml parser
-        from tank_vendor import yaml
-
-        # build the path to the info.yml file
-        plugin_info_yml = os.path.join(plugin_root_path, "info.yml")
-
-        # open the yaml file and read the data
-        with open(plugin_info_yml, "r") as plugin_info_fh:
-            plugin_info = yaml.load(plugin_info_fh, Loader=yaml.FullLoader)
+        # to the python path. need to extract the plugin info from info.yml,
+        # which is only parsed again when it changed.
+        from sgtk.util import LocalFileStorageManager
+        from .bootstrap_cache import BootstrapCache
 
-        base_config = plugin_info["base_configuration"]
-        plugin_id = plugin_info["plugin_id"]
+        bootstrap_cache = BootstrapCache(
+            os.path.join(
+                LocalFileStorageManager.get_global_root(LocalFileStorageManager.CACHE),
+                "tk-houdini",
+                "plugin_bootstrap",
+            ),
+            plugin_root_path,
+        )
+        plugin_id, base_config = bootstrap_cache.get_plugin_info(_parse_info_yml)
 
         # no bundle cache in in situ mode
         bundle_cache = None
@@ -90,15 +103,18 @@ def bootstrap(plugin_root_path):
     sgtk_logger = sgtk.LogManager.get_logger("plugin")
     sgtk_logger.debug("Booting up toolkit plugin.")
 
-    try:
-        # When the user is not yet authenticated, pop up the Shotgun login
-        # dialog to get the user's credentials, otherwise, get the cached user's
-        # credentials.
-        user = sgtk.authentication.ShotgunAuthenticator().get_user()
-    except sgtk.authentication.AuthenticationCancelled:
-        # TODO: show a "PTR > Login" menu in houdini
-        sgtk_logger.info("PTR login was cancelled by the user.")
-        return
+    # the toolkit daemon, when running, hands out the user it authenticated.
+    user = _get_toolkit_daemon_user(sgtk, plugin_root_path)
+    if user is None:
+        try:
+            # When the user is not yet authenticated, pop up the Shotgun login
+            # dialog to get the user's credentials, otherwise, get the cached
+            # user's credentials.
+            user = sgtk.authentication.ShotgunAuthenticator().get_user()
+        except sgtk.authentication.AuthenticationCancelled:
+            # TODO: show a "PTR > Login" menu in houdini
+            sgtk_logger.info("PTR login was cancelled by the user.")
+            return
 
     # Create a boostrap manager for the logged in user with the plug-in
     # configuration data.
@@ -110,22 +126,214 @@ def bootstrap(plugin_root_path):
     if bundle_cache:
         toolkit_mgr.bundle_cache_fallback_paths = [bundle_cache]
 
+    # reuse the configuration resolved by a previous launch for the same site
+    # and user as the base configuration, which skips the lookup of its latest
+    # version. The PipelineConfiguration entities of the site are still looked
+    # up, and take precedence over it.
+    resolved_config = None
+    if bootstrap_cache:
+        resolved_config = bootstrap_cache.get_resolved_configuration(
+            user.host, user.login
+        )
+    if resolved_config:
+        sgtk_logger.debug(
+            "Using the configuration resolved by a previous launch: %s"
+            % (resolved_config,)
+        )
+        toolkit_mgr.base_configuration = resolved_config
+
+    def _on_engine_started(engine):
+        if not bootstrap_cache:
+            return
+        if not resolved_config:
+            # only record configurations which were actually resolved, so the
+            # recorded one expires.
+            _record_resolved_configuration(bootstrap_cache, engine, user)
+        elif engine.sgtk.pipeline_configuration.get_shotgun_id() is not None:
+            # a PipelineConfiguration entity was added on the site
+            bootstrap_cache.set_resolved_configuration(None)
+        else:
+            # look the latest version up without delaying the startup
+            import threading
+
+            thread = threading.Thread(
+                target=_check_latest_configuration,
+                args=(bootstrap_cache, base_config, resolved_config, engine),
+                name="tk-houdini-latest-configuration",
+            )
+            thread.daemon = True
+            thread.start()
+
     # Retrieve the Shotgun entity type and id when they exist in the
     # environment. These are passed down through the app launcher when running
     # in zero config
     entity = toolkit_mgr.get_entity_from_environment()
     sgtk_logger.debug("Will launch the engine with entity: %s" % entity)
 
+    import hou
+
+    if os.environ.get(ASYNC_BOOTSTRAP_ENV) == "1" and hou.isUIAvailable():
+        # resolve the configuration in a background thread so Houdini stays
+        # interactive. The async bootstrap needs a running Qt event loop, so
+        # wait for the first event loop iteration to start it.
+        def _start_bootstrap():
+            hou.ui.removeEventLoopCallback(_start_bootstrap)
+            toolkit_mgr.progress_callback = status_bar_progress_callback
+            sgtk_logger.info(
+                "Bootstrapping the PTR engine for Houdini in the background..."
+            )
+            toolkit_mgr.bootstrap_engine_async(
+                "tk-houdini",
+                entity,
+                completed_callback=lambda engine: _on_async_bootstrap_completed(
+                    engine, _on_engine_started
+                ),
+                failed_callback=_on_async_bootstrap_failed,
+            )
+
+        hou.ui.addEventLoopCallback(_start_bootstrap)
+        return
+
     # set up a simple progress reporter
     toolkit_mgr.progress_callback = bootstrap_progress_callback
 
     # start engine
     sgtk_logger.info("Bootstrapping the PTR engine for Houdini...")
-    toolkit_mgr.bootstrap_engine("tk-houdini", entity)
+    engine = toolkit_mgr.bootstrap_engine("tk-houdini", entity)
+    _on_engine_started(engine)
 
     sgtk_logger.debug("Bootstrap complete.")
 
 
+def _parse_info_yml(info_yml_path):
+    """
+    Reads the plugin info.yml file.
+
+    :param str info_yml_path: Path to the info.yml file.
+    :returns: The content of the file as a dictionary.
+    """
+    # import the yaml parser
+    from tank_vendor import yaml
+
+    # open the yaml file and read the data
+    with open(info_yml_path, "r") as plugin_info_fh:
+        return yaml.load(plugin_info_fh, Loader=yaml.FullLoader)
+
+
+def _get_toolkit_daemon_user(sgtk, plugin_root_path):
+    """
+    Gets the authenticated user from the toolkit daemon started by the
+    launcher, with the client of the tk_houdini.toolkit_daemon module.
+
+    :param sgtk: The toolkit module.
+    :param str plugin_root_path: Path to the root folder of the plugin.
+    :returns: The user or None if the daemon isn't running or has no user.
+    """
+    socket_path = os.environ.get(TOOLKIT_DAEMON_ENV)
+    if not socket_path:
+        return None
+
+    logger = sgtk.LogManager.get_logger("plugin")
+
+    toolkit_daemon = _import_toolkit_daemon(plugin_root_path)
+    if toolkit_daemon is None:
+        logger.debug("Not using the toolkit daemon, its client isn't available.")
+        return None
+
+    response = toolkit_daemon.query(socket_path, {"request": "user"})
+    if response is None or not response.get("user"):
+        return None
+    logger.debug("Using the user authenticated by the toolkit daemon.")
+    user = sgtk.authentication.deserialize_user(response["user"])
+    sgtk.set_authenticated_user(user)
+    return user
+
+
+def _import_toolkit_daemon(plugin_root_path):
+    """
+    Imports the tk_houdini.toolkit_daemon module before the engine is
+    bootstrapped. It is in the zip archive of the engine python packages when
+    the plugin is started from it, or in the python folder of the engine when
+    the plugin is run from the engine's plugins folder.
+
+    :param str plugin_root_path: Path to the root folder of the plugin.
+    :returns: The module or None if the engine python packages aren't
+        available, e.g. for a built plugin.
+    """
+    engine_python_path = os.path.join(
+        os.path.dirname(os.path.dirname(plugin_root_path)), "python"
+    )
+    if os.path.isdir(os.path.join(engine_python_path, "tk_houdini")):
+        if engine_python_path not in sys.path:
+            sys.path.append(engine_python_path)
+
+    try:
+        from tk_houdini import toolkit_daemon
+    except ImportError:
+        return None
+    return toolkit_daemon
+
+
+def _record_resolved_configuration(bootstrap_cache, engine, user):
+    """
+    Records the configuration the engine was started with, so the next launch
+    can skip resolving it.
+
+    :param bootstrap_cache: The :class:`BootstrapCache` of the plugin.
+    :param engine: The started engine.
+    :param user: The user the engine was started for.
+    """
+    # configurations defined by a PipelineConfiguration entity can be changed
+    # on the site at any time, they are looked up on every launch.
+    if engine.sgtk.pipeline_configuration.get_shotgun_id() is not None:
+        bootstrap_cache.set_resolved_configuration(None)
+    else:
+        bootstrap_cache.set_resolved_configuration(
+            engine.sgtk.configuration_descriptor.get_uri(), user.host, user.login
+        )
+
+
+def _check_latest_configuration(bootstrap_cache, base_config, resolved_config, engine):
+    """
+    Clears the configuration recorded by a previous launch when a newer version
+    of the base configuration was released, so the next launch resolves it.
+
+    :param bootstrap_cache: The :class:`BootstrapCache` of the plugin.
+    :param base_config: The base configuration of the plugin, as a descriptor
+        uri or dictionary.
+    :param str resolved_config: The uri of the recorded configuration the
+        engine was started with.
+    :param engine: The started engine.
+    """
+    import sgtk
+
+    logger = sgtk.LogManager.get_logger("plugin")
+
+    if isinstance(base_config, str):
+        base_config = sgtk.descriptor.descriptor_uri_to_dict(base_config)
+    if base_config.get("version"):
+        # pinned to a version, there is no latest version to look for
+        return
+
+    try:
+        latest_descriptor = sgtk.descriptor.create_descriptor(
+            engine.shotgun,
+            sgtk.descriptor.Descriptor.CONFIG,
+            base_config,
+            resolve_latest=True,
+        )
+    except Exception as e:
+        logger.debug("Unable to look the latest configuration up: %s" % (e,))
+        return
+
+    if latest_descriptor.get_uri() != resolved_config:
+        logger.debug(
+            "The configuration %s was released, the next launch resolves it."
+            % (latest_descriptor.get_uri(),)
+        )
+        bootstrap_cache.set_resolved_configuration(None)
+
+
 def bootstrap_progress_callback(progress_value, message):
     """
     Called whenever toolkit reports progress.
@@ -135,3 +343,61 @@ def bootstrap_progress_callback(progress_value, message):
     :param str message: Progress message string
     """
     print("Bootstrap progress %s%%: %s" % (int(progress_value * 100), message))
+
+
+def status_bar_progress_callback(progress_value, message):
+    """
+    Reports the progress of the asynchronous bootstrap in the Houdini status
+    bar.
+
+    :param float progress_value: The current progress value. Values will be
+        reported in incremental order and always in the range 0.0 to 1.0
+    :param str message: Progress message string
+    """
+    import hou
+
+    hou.ui.setStatusMessage(
+        "Flow Production Tracking %s%%: %s" % (int(progress_value * 100), message),
+        severity=hou.severityType.Message,
+    )
+
+
+def _on_async_bootstrap_completed(engine, on_engine_started):
+    """
+    Called once the engine has been started by the asynchronous bootstrap.
+
+    :param engine: The started engine.
+    :param on_engine_started: Callable run with the started engine.
+    """
+    import hou
+    import sgtk
+
+    on_engine_started(engine)
+
+    sgtk.LogManager.get_logger("plugin").debug("Bootstrap complete.")
+    hou.ui.setStatusMessage("")
+
+    # the menu file was written after Houdini loaded its menus, reload them so
+    # the menu shows up.
+    hou.hscript("menurefresh")
+
+
+def _on_async_bootstrap_failed(phase, exception):
+    """
+    Called if the asynchronous bootstrap failed.
+
+    :param int phase: The bootstrap phase which failed, see
+        ``ToolkitManager.TOOLKIT_BOOTSTRAP_PHASE`` and
+        ``ToolkitManager.ENGINE_STARTUP_PHASE``.
+    :param exception: The exception raised by the bootstrap.
+    """
+    import hou
+    import sgtk
+
+    sgtk.LogManager.get_logger("plugin").error(
+        "Flow Production Tracking bootstrap failed: %s" % (exception,)
+    )
+    hou.ui.setStatusMessage(
+        "Flow Production Tracking Error: %s" % (exception,),
+        severity=hou.severityType.Error,
+    )
@@ -34,6 +34,15 @@ def plugin_startup():
     # the plugin python path will be just below the root level. add it to
     # sys.path
     plugin_python_path = os.path.join(plugin_root_path, "python")
+
+    # when the plugin is run from the engine's plugins folder, use the zip
+    # archive of the engine python packages instead if it has been built for
+    # this python version and validated, see tk_houdini/zip_bundle.py.
+    plugin_python_path = (
+        _get_bundle_path(os.path.dirname(os.path.dirname(plugin_root_path)))
+        or plugin_python_path
+    )
+
     sys.path.insert(0, plugin_python_path)
 
     # now that the path is there, we can import the plugin bootstrap logic
@@ -58,4 +67,36 @@ def plugin_startup():
             print(details)
 
 
+def _get_bundle_path(engine_root_path):
+    """
+    Returns the path to the zip archive of the engine python packages for this
+    python version if it was validated when the engine was deployed, None
+    otherwise.
+
+    The stamp written next to the archive by tk_houdini/zip_bundle.py holds the
+    size and modification time of the validated archive. Only the stamp and the
+    archive are looked at, the sources are checked when the engine is deployed.
+    """
+    if os.environ.get("TK_HOUDINI_ZIP_BUNDLE") == "0":
+        return None
+
+    bundle_path = os.path.join(
+        engine_root_path, "tk-houdini-py%d%d.zip" % sys.version_info[:2]
+    )
+    try:
+        with open(bundle_path + ".stamp") as stamp_file:
+            stamp = stamp_file.read().split()
+        bundle_stat = os.stat(bundle_path)
+    except (IOError, OSError):
+        return None
+
+    if stamp != [str(bundle_stat.st_size), str(bundle_stat.st_mtime_ns)]:
+        sys.stderr.write(
+            "Flow Production Tracking: not using %s, it changed since it was "
+            "validated.\n" % bundle_path
+        )
+        return None
+    return bundle_path
+
+
 plugin_startup()
@@ -10,20 +10,40 @@
 
 # flake8: noqa
 
+import importlib
+
 from tank import LogManager
 
 logger = LogManager.get_logger(__name__)
 
-from . import tk_houdini
 
-try:
-    from . import flowam
-except ImportError as exc:
-    logger.error(
-        "tk-houdini: There was an error importing the 'flowam' module.\n"
-        "This is likely due to Flow AM features being unavailable in the "
-        "current version of tk-core - i.e. it is missing the Flow Integration SDK "
-        "('tank_vendor.flow_integration_sdk' / 'tank.flowam').\n"
-        "This is safe to ignore if you are not working on a Flow AM project. "
-        f"Upgrade tk-core to enable Flow AM publishing.\n(ImportError: {exc})"
-    )
+def __getattr__(name):
+    """
+    Imports the tk_houdini and flowam packages on first access, so that the
+    Flow Integration SDK is only loaded when it is needed.
+    """
+    if name == "tk_houdini":
+        module = importlib.import_module(".tk_houdini", __name__)
+    elif name == "flowam":
+        try:
+            module = importlib.import_module(".flowam", __name__)
+            # the package is lazy as well, import the host module here so the
+            # error below is reported if the SDK is unavailable.
+            module.host
+        except ImportError as exc:
+            logger.error(
+                "tk-houdini: There was an error importing the 'flowam' module.\n"
+                "This is likely due to Flow AM features being unavailable in the "
+                "current version of tk-core - i.e. it is missing the Flow Integration SDK "
+                "('tank_vendor.flow_integration_sdk' / 'tank.flowam').\n"
+                "This is safe to ignore if you are not working on a Flow AM project. "
+                f"Upgrade tk-core to enable Flow AM publishing.\n(ImportError: {exc})"
+            )
+            raise AttributeError(
+                "module %r has no attribute %r" % (__name__, name)
+            ) from exc
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    globals()[name] = module
+    return module
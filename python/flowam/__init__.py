@@ -8,6 +8,18 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-# flake8: noqa
+# The host module pulls in the Flow Integration SDK. It is only imported when
+# first accessed, which only happens for contexts configured with Flow.
 
-from . import host
+import importlib
+
+
+def __getattr__(name):
+    """
+    Imports the host module on first access.
+    """
+    if name != "host":
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    host = importlib.import_module(".host", __name__)
+    globals()["host"] = host
+    return host
@@ -7,13 +7,66 @@
 # By accessing, using, copying or modifying this work you indicate your
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
-from . import bootstrap
-from .ui_generation import (
-    AppCommandsMenu,
-    AppCommandsShelf,
-    AppCommandsPanelHandler,
-    ensure_file_change_timer_running,
-    get_registered_commands,
-    get_registered_panels,
-    get_wrapped_panel_widget,
-)
+
+# The modules of this package are only imported when one of their attributes is
+# first accessed. This package is imported by the pythonrc.py startup files of
+# every Houdini session, including batch sessions which never build a menu,
+# so keep its import cheap.
+
+import importlib
+
+# sub modules available as attributes of the package
+_LAZY_MODULES = ("bootstrap", "entry_points", "ui_snapshot")
+
+# attributes of the package and the sub module they are defined in
+_LAZY_ATTRIBUTES = {
+    "StartupTimeline": "startup_timeline",
+    "AppCommandsMenu": "ui_generation",
+    "AppCommandsShelf": "ui_generation",
+    "AppCommandsPanelHandler": "ui_generation",
+    "CommandIndex": "ui_generation",
+    "get_command_index": "ui_generation",
+    "CommandIndexDiff": "ui_generation",
+    "diff_command_indexes": "ui_generation",
+    "ensure_file_change_timer_running": "ui_generation",
+    "get_registered_commands": "ui_generation",
+    "get_registered_panels": "ui_generation",
+    "get_wrapped_panel_widget": "ui_generation",
+    "get_menu_name": "ui_generation",
+    "write_menu_xml": "ui_generation",
+    "UICache": "ui_cache",
+    "UISnapshot": "ui_snapshot",
+    "UISnapshotCache": "ui_snapshot",
+    "get_ui_cache_key": "ui_cache",
+    "OtlManifest": "otl_manifest",
+    "OtlLibraryCache": "otl_library",
+    "ResourceMirror": "resource_mirror",
+    "Worker": "worker_pool",
+    "WorkerPool": "worker_pool",
+    "submit_job": "worker_pool",
+    "ToolkitDaemon": "toolkit_daemon",
+    "QtImportBlocker": "headless",
+}
+
+__all__ = list(_LAZY_MODULES) + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """
+    Imports the sub module providing the requested attribute.
+    """
+    if name in _LAZY_MODULES:
+        value = importlib.import_module("." + name, __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module("." + _LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    # cache the value so this is only called once per attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,10 +8,15 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+# This module is imported by the startup files of every Houdini session, only
+# the modules it needs in any case are imported at the top. The others are
+# imported by the functions using them, see tests/test_import_time.py.
+import errno
 import os
-import shutil
+import re
+import stat
 import sys
-import tempfile
+import time
 import traceback
 
 ################################################################################
@@ -29,6 +34,97 @@ g_sgtk_context_env = "TANK_CONTEXT"
 # classic toolkit bootstrap
 g_sgtk_engine_env = "TANK_ENGINE"
 
+# Name of the env variable that stores the folder the temp directories are
+# created in, when not the default system temp folder, e.g. /dev/shm.
+g_temp_root_env = "TK_HOUDINI_TMP_ROOT"
+
+# Name of the env variable which, when set to "1", makes the plugin bootstrap
+# the engine asynchronously so Houdini stays interactive. Read by the basic
+# plugin's plugin_bootstrap module.
+g_async_bootstrap_env = "TK_HOUDINI_ASYNC_BOOTSTRAP"
+
+# Name of the env variable selecting how the startup paths are added to the
+# Houdini search path, when not supplied by the launcher. See the
+# g_houdini_path_* modes below.
+g_houdini_path_mode_env = "TK_HOUDINI_PATH_MODE"
+
+# Name of the env variable which, when set to "1" or "0", turns the headless
+# mode of the engine on or off, overriding the headless_mode setting. In
+# headless mode, Qt is not imported in the sessions without a UI.
+g_headless_env = "TK_HOUDINI_HEADLESS"
+
+# Name of the env variable selecting the app profile of the sessions without a
+# UI, e.g. farm jobs, which usually need a couple of apps only. The apps of a
+# profile are the ones of the environment of the pipeline configuration named
+# after it. The pick_environment core hook of the configuration returns that
+# environment when the variable is set, e.g.:
+#
+#     app_profile = os.environ.get("TK_HOUDINI_APP_PROFILE")
+#     if app_profile:
+#         return app_profile
+g_app_profile_env = "TK_HOUDINI_APP_PROFILE"
+
+# Name of the env variable storing the path to the socket of the toolkit daemon
+# the sessions get the authenticated user and their context from, when it is
+# running. See the toolkit_daemon module.
+g_toolkit_daemon_env = "TK_HOUDINI_TOOLKIT_DAEMON"
+
+################################################################################
+# modes for adding the startup paths to the Houdini search path
+
+# The startup paths are prepended to HOUDINI_PATH, which is otherwise unchanged.
+g_houdini_path_default = ""
+
+# Same as the default mode, but the HOUDINI_PATH entries are normalized and
+# deduplicated and the entries which don't exist are removed, since Houdini
+# scans every entry for dozens of sub folders at startup.
+g_houdini_path_optimize = "optimize"
+
+# The startup paths are added with a Houdini package file, leaving HOUDINI_PATH
+# unchanged.
+g_houdini_path_package = "package"
+
+# Name of the package file written in package mode.
+g_houdini_package_file = "tk-houdini.json"
+
+################################################################################
+# constants defining the layout of the temp directories
+
+# Prefix of the per session temp directories created with tempfile.mkdtemp
+g_temp_dir_prefix = "tk-houdini"
+
+# Name of the file marking a stable temp directory, shared by all the sessions
+# of a user for a given configuration.
+g_stable_temp_marker = ".tk-houdini-stable"
+
+# Name of the file identifying the process owning a session directory. The
+# janitor removes session directories whose process is no longer running.
+g_session_marker = ".tk-houdini-session"
+
+# Session directories without an owner are removed once they are that old (in
+# seconds). They can be left behind by a launch which never started the engine.
+_UNOWNED_SESSION_DIR_MAX_AGE = 2 * 24 * 3600
+
+# Matches the names of the directories created by tempfile.mkdtemp with our
+# prefix.
+_SESSION_DIR_REGEX = re.compile(r"^%s[a-z0-9_]{8}$" % re.escape(g_temp_dir_prefix))
+
+# Matches the names of the per session sub directories of a stable directory.
+_STABLE_SESSION_DIR_REGEX = re.compile(r"^session-\d+$")
+
+
+def _get_logger():
+    """
+    Returns the logger of this module.
+
+    This module is imported before toolkit is, the logger has the name a toolkit
+    logger would have so the messages end up in the toolkit logs.
+    """
+    import logging
+
+    return logging.getLogger("sgtk.ext.tk-houdini.bootstrap")
+
+
 ################################################################################
 # methods for bootstrapping toolkit within houdini
 
@@ -72,6 +168,9 @@ def bootstrap_classic():
         # update the environment with the classic startup vars
         os.environ.update(env)
 
+    if os.environ.get(g_toolkit_daemon_env):
+        _attach_toolkit_daemon(sgtk, os.environ[g_toolkit_daemon_env])
+
     # ensure the engine name and context are defined in the environment
     for env_var in [g_sgtk_context_env, g_sgtk_engine_env]:
         if env_var not in os.environ:
@@ -106,6 +205,43 @@ def bootstrap_classic():
             del os.environ[env_var]
 
 
+def _attach_toolkit_daemon(sgtk, socket_path):
+    """
+    Gets the authenticated user from the toolkit daemon and, when the context
+    isn't supplied by the launcher, the context of the hip file Houdini was
+    started with, e.g. by a farm job.
+
+    Nothing is done if the daemon isn't running.
+
+    :param sgtk: The toolkit module.
+    :param str socket_path: Path to the socket of the daemon.
+    """
+    from . import toolkit_daemon
+
+    response = toolkit_daemon.query(socket_path, {"request": "user"})
+    if response is None:
+        return
+    if response["user"]:
+        sgtk.set_authenticated_user(
+            sgtk.authentication.deserialize_user(response["user"])
+        )
+
+    if g_sgtk_context_env in os.environ:
+        return
+    hip_files = [
+        arg
+        for arg in sys.argv[1:]
+        if os.path.splitext(arg)[1].lower() in (".hip", ".hiplc", ".hipnc")
+    ]
+    if hip_files:
+        response = toolkit_daemon.query(
+            socket_path,
+            {"request": "context_from_path", "path": os.path.abspath(hip_files[0])},
+        )
+        if response is not None:
+            os.environ[g_sgtk_context_env] = response["context"]
+
+
 def bootstrap_exception(error_msg):
     """
     Shows an error message if there is a problem during bootstrap.
@@ -131,10 +267,19 @@ def bootstrap_exception(error_msg):
 # utility methods for populating the environment prior to bootstrap
 
 
-def get_classic_startup_env():
+def get_classic_startup_env(
+    stable_temp_dir_id=None, temp_dir_root=None, houdini_path_mode=None
+):
     """
     Returns a dict of key/value pairs representing the environment variables
     needed to launch houdini and startup toolkit in classic mode.
+
+    :param str stable_temp_dir_id: If set, a stable temp directory identified
+        by this id is used instead of a new directory for each launch. See
+        :func:`_get_temp_dir`.
+    :param str temp_dir_root: Optional folder to create the temp directory in.
+    :param str houdini_path_mode: How the startup paths are added to the
+        Houdini search path, one of the g_houdini_path_* modes.
     """
 
     # Add the classic startup directory for the engine (2 levels up from this
@@ -147,13 +292,25 @@ def get_classic_startup_env():
     startup_path = os.path.normpath(startup_path)
 
     # update the houdini path with the engine startup path
-    return _get_env([startup_path])
+    return _get_env(
+        [startup_path], stable_temp_dir_id, temp_dir_root, houdini_path_mode
+    )
 
 
-def get_plugin_startup_env(plugin_names):
+def get_plugin_startup_env(
+    plugin_names, stable_temp_dir_id=None, temp_dir_root=None, houdini_path_mode=None
+):
     """
     Returns a dict of key/value pairs representing the environment variables
     needed to launch houdini with the supplied plugins.
+
+    :param list plugin_names: The names of the plugins to load.
+    :param str stable_temp_dir_id: If set, a stable temp directory identified
+        by this id is used instead of a new directory for each launch. See
+        :func:`_get_temp_dir`.
+    :param str temp_dir_root: Optional folder to create the temp directory in.
+    :param str houdini_path_mode: How the startup paths are added to the
+        Houdini search path, one of the g_houdini_path_* modes.
     """
 
     # for each plugin provided, construct a list of corresponding plugin startup
@@ -177,14 +334,93 @@ def get_plugin_startup_env(plugin_names):
         if os.path.exists(plugin_startup_path):
             startup_paths.append(plugin_startup_path)
 
-    return _get_env(startup_paths)
+    return _get_env(startup_paths, stable_temp_dir_id, temp_dir_root, houdini_path_mode)
+
+
+################################################################################
+# methods for managing the temp directories during a houdini session
+
+
+def get_session_dir():
+    """
+    Returns the folder where files private to the current Houdini session can
+    be written, e.g. the shelf definition.
+
+    This is the temp directory itself, unless it is a stable directory shared by
+    several sessions, in which case a sub directory owned by this process is
+    returned. The folder is created if needed.
+
+    :returns: The path to the folder or None if no temp directory is defined.
+    """
+    import json
+    import socket
+
+    temp_dir = os.environ.get(g_temp_env)
+    if not temp_dir:
+        return None
+
+    if os.path.exists(os.path.join(temp_dir, g_stable_temp_marker)):
+        session_dir = os.path.join(temp_dir, "session-%d" % os.getpid())
+    else:
+        session_dir = temp_dir
+
+    marker_path = os.path.join(session_dir, g_session_marker)
+    if not os.path.exists(marker_path):
+        if not os.path.exists(session_dir):
+            os.makedirs(session_dir)
+        with open(marker_path, "w") as marker_file:
+            json.dump({"pid": os.getpid(), "host": socket.gethostname()}, marker_file)
+
+    return session_dir
+
+
+def remove_session_dir_async():
+    """
+    Removes the folder returned by :func:`get_session_dir` in a background
+    thread, so that the engine teardown and Houdini's exit don't wait for it.
+
+    Anything left behind, e.g. if Houdini exits before the removal completes,
+    is removed by the janitor of a later session.
+    """
+    import shutil
+    import threading
+
+    session_dir = get_session_dir()
+    if not session_dir:
+        return
+
+    thread = threading.Thread(
+        target=shutil.rmtree,
+        args=(session_dir,),
+        kwargs={"ignore_errors": True},
+        name="tk-houdini-session-dir-removal",
+    )
+    thread.daemon = True
+    thread.start()
+
+
+def start_temp_dir_janitor():
+    """
+    Starts a background thread removing the session directories left behind by
+    sessions which are not running anymore, typically because they crashed.
+    """
+    import threading
+
+    thread = threading.Thread(
+        target=_remove_stale_session_dirs,
+        name="tk-houdini-temp-dir-janitor",
+    )
+    thread.daemon = True
+    thread.start()
 
 
 ################################################################################
 # helper methods for the methods above
 
 
-def _get_env(startup_paths):
+def _get_env(
+    startup_paths, stable_temp_dir_id=None, temp_dir_root=None, houdini_path_mode=None
+):
     """
     This method represents the common behavior for preparing an environment for
     houdini launch. It populates and returns a dictionary with all the necessary
@@ -194,8 +430,17 @@ def _get_env(startup_paths):
 
     env = {}
 
+    temp_dir_root = temp_dir_root or os.environ.get(g_temp_root_env)
+    if temp_dir_root and not os.path.isdir(temp_dir_root):
+        # e.g. /dev/shm on an OS which doesn't provide it. Use the default
+        # system temp folder instead.
+        temp_dir_root = None
+    if temp_dir_root:
+        # let the janitor know where to look for stale session directories.
+        env[g_temp_root_env] = temp_dir_root
+
     # setup a path for the engine to write out its menu file
-    tk_houdini_temp_dir = tempfile.mkdtemp(prefix="tk-houdini")
+    tk_houdini_temp_dir, stable = _get_temp_dir(stable_temp_dir_id, temp_dir_root)
 
     # set env var to point engine at temp path
     env[g_temp_env] = tk_houdini_temp_dir
@@ -203,6 +448,18 @@ def _get_env(startup_paths):
     # This allows Qt to load, but I think it makes Houdini unstable...
     env["OBJC_DISABLE_GC"] = "YES"
 
+    if houdini_path_mode is None:
+        houdini_path_mode = os.environ.get(g_houdini_path_mode_env, "")
+    if houdini_path_mode not in (
+        g_houdini_path_default,
+        g_houdini_path_optimize,
+        g_houdini_path_package,
+    ):
+        _get_logger().warning(
+            "Unknown HOUDINI_PATH mode %r, using the default mode." % houdini_path_mode
+        )
+        houdini_path_mode = g_houdini_path_default
+
     # construct the houdini path. this isn't as simple as prepending these paths
     # since we have to account for some legacy behavior and houdini weirdness
     # when it comes to the expected path separator. see the _build_houdini_path
@@ -210,31 +467,294 @@ def _get_env(startup_paths):
     try:
         # supply a single list of startup paths which is the temp directory plus
         # the supplied startup paths
-        env["HOUDINI_PATH"] = _build_houdini_path([tk_houdini_temp_dir] + startup_paths)
+        if houdini_path_mode == g_houdini_path_package:
+            env["HOUDINI_PACKAGE_DIR"] = _write_houdini_package(
+                tk_houdini_temp_dir, [tk_houdini_temp_dir] + startup_paths
+            )
+        else:
+            env["HOUDINI_PATH"] = _build_houdini_path(
+                [tk_houdini_temp_dir] + startup_paths,
+                optimize=houdini_path_mode == g_houdini_path_optimize,
+            )
     except:
         # had an error, clean up the tmp dir
-        shutil.rmtree(tk_houdini_temp_dir)
+        if not stable:
+            import shutil
+
+            shutil.rmtree(tk_houdini_temp_dir)
         raise
 
     return env
 
 
-def _build_houdini_path(startup_paths):
+def _get_temp_dir(stable_temp_dir_id=None, temp_dir_root=None):
+    """
+    Returns the temp directory the engine writes the menu, shelf and panel
+    definitions to, creating it if needed.
+
+    By default a new directory is created for each launch. If a stable temp
+    directory id is supplied, the same directory is used by all the launches of
+    the current user with this id, typically an id for the pipeline
+    configuration. Files written by a previous session, like the menu definition,
+    are then already on the HOUDINI_PATH when Houdini starts and Houdini's own
+    caching of the startup paths remains valid between launches.
+
+    :param str stable_temp_dir_id: Optional stable temp directory id.
+    :param str temp_dir_root: Optional folder to create the temp directory in.
+    :returns: A tuple with the path to the directory and whether it is stable.
+    """
+    import tempfile
+
+    if not stable_temp_dir_id:
+        return tempfile.mkdtemp(prefix=g_temp_dir_prefix, dir=temp_dir_root), False
+
+    import getpass
+    import hashlib
+
+    try:
+        user_name = getpass.getuser()
+    except Exception:
+        user_name = "user"
+
+    temp_dir_root = temp_dir_root or tempfile.gettempdir()
+    if not os.path.isdir(temp_dir_root):
+        os.makedirs(temp_dir_root)
+
+    user_dir = os.path.join(
+        temp_dir_root,
+        "%s-%s" % (g_temp_dir_prefix, re.sub(r"[^\w.-]", "_", user_name)),
+    )
+    temp_dir = os.path.join(
+        user_dir, hashlib.sha1(stable_temp_dir_id.encode("utf-8")).hexdigest()[:12]
+    )
+
+    # the name of the directory is predictable and the files written to it
+    # are run by Houdini, so it must not be writable by anyone else.
+    try:
+        ensure_private_dir(user_dir)
+        ensure_private_dir(temp_dir)
+    except OSError as e:
+        _get_logger().warning(
+            "Not using the stable temp directory %s: %s. Using a temp directory "
+            "for this launch instead." % (temp_dir, e)
+        )
+        return tempfile.mkdtemp(prefix=g_temp_dir_prefix, dir=temp_dir_root), False
+
+    marker_path = os.path.join(temp_dir, g_stable_temp_marker)
+    if not os.path.exists(marker_path):
+        with open(marker_path, "w") as marker_file:
+            marker_file.write(stable_temp_dir_id)
+
+    return temp_dir, True
+
+
+def ensure_private_dir(path):
+    """
+    Creates a directory only the current user can access, or checks that an
+    existing one is owned by the current user and restricts it to them.
+
+    The ownership isn't checked on Windows.
+
+    :param str path: The directory.
+    :raises OSError: If the directory exists and is owned by another user, or
+        it can't be created.
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    if not hasattr(os, "getuid"):
+        return
+
+    path_stat = os.lstat(path)
+    if not stat.S_ISDIR(path_stat.st_mode):
+        raise OSError(errno.ENOTDIR, "Not a directory", path)
+    if path_stat.st_uid != os.getuid():
+        raise OSError(errno.EPERM, "Owned by another user", path)
+    if path_stat.st_mode & 0o077:
+        # created by a previous version, or with a permissive umask. Only the
+        # current user could write to it since they own it.
+        os.chmod(path, 0o700)
+
+
+def _remove_stale_session_dirs():
+    """
+    Removes the session directories whose owning process is not running
+    anymore.
+
+    The per launch directories are looked for in the system temp folder and in
+    the configured temp directory root. The per session sub directories of the
+    current stable directory, if any, are checked as well.
+    """
+    import shutil
+    import tempfile
+
+    current_dir = os.environ.get(g_temp_env)
+
+    candidates = []
+    roots = set([tempfile.gettempdir()])
+    if os.environ.get(g_temp_root_env):
+        roots.add(os.environ[g_temp_root_env])
+    for root in roots:
+        try:
+            names = os.listdir(root)
+        except OSError:
+            continue
+        candidates.extend(
+            (os.path.join(root, name), True)
+            for name in names
+            if _SESSION_DIR_REGEX.match(name)
+        )
+
+    if current_dir and os.path.exists(os.path.join(current_dir, g_stable_temp_marker)):
+        try:
+            names = os.listdir(current_dir)
+        except OSError:
+            names = []
+        candidates.extend(
+            (os.path.join(current_dir, name), False)
+            for name in names
+            if _STABLE_SESSION_DIR_REGEX.match(name)
+        )
+
+    for path, removable_if_unowned in candidates:
+        if current_dir and os.path.normpath(path) == os.path.normpath(current_dir):
+            continue
+        try:
+            if _is_stale_session_dir(path, removable_if_unowned):
+                shutil.rmtree(path, ignore_errors=True)
+        except Exception:
+            # never let the janitor raise, it runs unattended.
+            pass
+
+
+def _is_stale_session_dir(path, removable_if_unowned):
+    """
+    Checks if the given session directory was left behind.
+
+    :param str path: Path to a session directory.
+    :param bool removable_if_unowned: Whether the directory can be removed if
+        it has no owner marker and is old enough.
+    :returns: True if the directory can be removed.
+    """
+    import json
+    import socket
+
+    path_stat = os.stat(path)
+    if hasattr(os, "getuid") and path_stat.st_uid != os.getuid():
+        # not ours
+        return False
+
+    try:
+        with open(os.path.join(path, g_session_marker), "r") as marker_file:
+            owner = json.load(marker_file)
+    except (IOError, OSError, ValueError):
+        owner = None
+
+    if not owner:
+        return (
+            removable_if_unowned
+            and time.time() - path_stat.st_mtime > _UNOWNED_SESSION_DIR_MAX_AGE
+        )
+
+    if owner.get("host") != socket.gethostname():
+        # the directory is on a shared folder, we can't tell if its owner is
+        # still running.
+        return False
+
+    return not _is_process_running(owner.get("pid"))
+
+
+def _is_process_running(pid):
+    """
+    Checks if a process is running.
+
+    :param int pid: The process id.
+    :returns: True if the process is running or if it can't be determined.
+    """
+    if not pid or pid == os.getpid():
+        return True
+
+    if sys.platform == "win32":
+        import ctypes
+
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not ctypes.windll.kernel32.GetExitCodeProcess(
+                handle, ctypes.byref(exit_code)
+            ):
+                return True
+            # STILL_ACTIVE
+            return exit_code.value == 259
+        finally:
+            ctypes.windll.kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        # EPERM means the process exists but belongs to someone else
+        return e.errno == errno.EPERM
+    return True
+
+
+def _build_houdini_path(startup_paths, optimize=False):
     """
     Given some paths, construct an updated houdini path.
 
     This method preserves the existing HOUDINI_PATH and prepends the supplied
     startup paths. It also appends the special `&` default path if it is not
     already included.
+
+    :param list startup_paths: The paths to prepend.
+    :param bool optimize: If True, the entries are cleaned up with
+        :func:`_optimize_houdini_paths`.
+    """
+
+    hou_paths, path_sep = _split_path_list(os.environ.get("HOUDINI_PATH"))
+
+    # paths to prepend that are not already in the houdini path. these paths
+    # include the temp directory which is typically where the engine will write
+    # .xml files for menu/shelf/panel definitions. in addition, startup paths
+    # are added depending on the startup mode. in classic mode, this will be the
+    # engine's root level startup directory which includes code to start the
+    # engine. in plugin mode, this will be a list of paths for each plugin's
+    # startup path.
+    prepend_paths = startup_paths
+    prepend_paths = [p for p in prepend_paths if not p in hou_paths]
+
+    new_paths = prepend_paths
+    new_paths.extend(hou_paths)
+
+    # append the ampersand if it's not already in the paths
+    if not "&" in hou_paths:
+        new_paths.append("&")
+
+    if optimize:
+        new_paths = _optimize_houdini_paths(new_paths)
+
+    return path_sep.join(new_paths)
+
+
+def _split_path_list(path_list_str):
     """
+    Splits the value of a Houdini path list env variable, e.g. HOUDINI_PATH.
 
-    hou_path_str = os.environ.get("HOUDINI_PATH")
+    :param str path_list_str: The value of the variable, can be None.
+    :returns: A tuple with the list of paths and the separator to use to join
+        them.
+    """
 
     # default to using the OS-specific path separator. windows should always use
     # semicolon since colon is the drive separator.
     path_sep = os.pathsep
 
-    if hou_path_str:
+    if path_list_str:
 
         # It turns out Houdini allows HOUDINI_PATH to be separated by semicolons
         # on any OS, so the tk engine has always supported and assumed
@@ -245,32 +765,97 @@ def _build_houdini_path(startup_paths):
 
         if sys.platform != "win32":
             # for non-windows OS, see if semicolon is in use
-            if ";" in hou_path_str:
+            if ";" in path_list_str:
                 # already using semi-colons, continue using semicolons. this
                 # will allow clients relying on the legacy engine behavior to
                 # continue without making any changes.
                 path_sep = ";"
 
-        hou_path_str = hou_path_str.rstrip(path_sep)
-        hou_paths = hou_path_str.split(path_sep)
+        path_list_str = path_list_str.rstrip(path_sep)
+        paths = path_list_str.split(path_sep)
     else:
-        hou_paths = []
+        paths = []
 
-    # paths to prepend that are not already in the houdini path. these paths
-    # include the temp directory which is typically where the engine will write
-    # .xml files for menu/shelf/panel definitions. in addition, startup paths
-    # are added depending on the startup mode. in classic mode, this will be the
-    # engine's root level startup directory which includes code to start the
-    # engine. in plugin mode, this will be a list of paths for each plugin's
-    # startup path.
-    prepend_paths = startup_paths
-    prepend_paths = [p for p in prepend_paths if not p in hou_paths]
+    return paths, path_sep
 
-    new_paths = prepend_paths
-    new_paths.extend(hou_paths)
 
-    # append the ampersand if it's not already in the paths
-    if not "&" in hou_paths:
-        new_paths.append("&")
+def _optimize_houdini_paths(paths):
+    """
+    Normalizes and deduplicates the given HOUDINI_PATH entries and removes the
+    entries which don't exist. The time it takes to list each entry is logged,
+    as an estimate of what it costs Houdini to scan it at startup.
 
-    return path_sep.join(new_paths)
+    The special `&` and `@` entries and the entries using variables, which are
+    expanded by Houdini, are kept as is.
+
+    :param list paths: The HOUDINI_PATH entries.
+    :returns: The list of entries to keep.
+    """
+    kept_paths = []
+    seen = set()
+    total_time = 0.0
+
+    for path in paths:
+        if not path:
+            continue
+
+        if path in ("&", "@") or "$" in path or path.startswith("~"):
+            if path not in seen:
+                seen.add(path)
+                kept_paths.append(path)
+            continue
+
+        normalized_path = os.path.normpath(path)
+        path_key = os.path.normcase(normalized_path)
+        if path_key in seen:
+            _get_logger().debug("Removing duplicate HOUDINI_PATH entry %s" % path)
+            continue
+        seen.add(path_key)
+
+        start = time.perf_counter()
+        try:
+            entry_count = len(os.listdir(normalized_path))
+        except OSError:
+            _get_logger().debug("Removing missing HOUDINI_PATH entry %s" % path)
+            continue
+        duration = time.perf_counter() - start
+        total_time += duration
+
+        _get_logger().debug(
+            "HOUDINI_PATH entry %s: %d items listed in %.1fms"
+            % (normalized_path, entry_count, duration * 1000)
+        )
+        kept_paths.append(normalized_path)
+
+    _get_logger().debug(
+        "Optimized HOUDINI_PATH has %d of %d entries, listed in %.1fms"
+        % (len(kept_paths), len(paths), total_time * 1000)
+    )
+    return kept_paths
+
+
+def _write_houdini_package(temp_dir, startup_paths):
+    """
+    Writes a Houdini package file adding the startup paths to the Houdini search
+    path, instead of adding them to HOUDINI_PATH.
+
+    :param str temp_dir: The temp directory to write the package file to.
+    :param list startup_paths: The paths to add to the Houdini search path.
+    :returns: The value of HOUDINI_PACKAGE_DIR, with the folder containing the
+        package file prepended.
+    """
+    import json
+
+    package_dir = os.path.join(temp_dir, "packages")
+    if not os.path.exists(package_dir):
+        os.makedirs(package_dir)
+
+    # houdini expects "/" separators in package files
+    package = {"hpath": [path.replace("\\", "/") for path in startup_paths]}
+    with open(os.path.join(package_dir, g_houdini_package_file), "w") as package_file:
+        json.dump(package, package_file, indent=4)
+
+    package_dirs, path_sep = _split_path_list(os.environ.get("HOUDINI_PACKAGE_DIR"))
+    if package_dir in package_dirs:
+        package_dirs.remove(package_dir)
+    return path_sep.join([package_dir] + package_dirs)
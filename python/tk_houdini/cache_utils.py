@@ -0,0 +1,201 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers shared by the on-disk caches of the engine. The caches can be shared by
+several Houdini sessions running on the same workstation, so writes are atomic
+and guarded by lock files.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+def get_cache_root(*parts):
+    """
+    Returns a folder in the per-user toolkit cache, creating it if needed.
+
+    :param parts: Sub folders of the tk-houdini cache folder.
+    :returns: The path to the folder.
+    :rtype: str
+    """
+    from sgtk.util import LocalFileStorageManager
+
+    cache_root = os.path.join(
+        LocalFileStorageManager.get_global_root(LocalFileStorageManager.CACHE),
+        "tk-houdini",
+        *parts
+    )
+    ensure_folder(cache_root)
+    return cache_root
+
+
+def ensure_folder(path):
+    """
+    Creates the given folder if it doesn't exist. Concurrent creation by
+    another process is not an error.
+
+    :param str path: The folder to create.
+    """
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+def hash_data(data):
+    """
+    Returns a stable digest for the given json serializable data.
+
+    :param data: Any json serializable object.
+    :returns: A hex digest.
+    :rtype: str
+    """
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def atomic_write(path, data):
+    """
+    Writes the data to the given path so that readers never see a partially
+    written file.
+
+    :param str path: The file to write.
+    :param data: The content to write, as str or bytes.
+    """
+    folder = os.path.dirname(path)
+    ensure_folder(folder)
+
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+
+    handle, tmp_path = tempfile.mkstemp(
+        dir=folder, prefix=".%s." % os.path.basename(path)
+    )
+    try:
+        with os.fdopen(handle, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path):
+    """
+    Reads a json file written with :func:`write_json`.
+
+    :param str path: The file to read.
+    :returns: The deserialized data or None if the file doesn't exist or is not
+        valid.
+    """
+    try:
+        with open(path, "r") as json_file:
+            return json.load(json_file)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """
+    Atomically writes the data to the given path as json.
+
+    :param str path: The file to write.
+    :param data: Json serializable data.
+    """
+    atomic_write(path, json.dumps(data, sort_keys=True, indent=1))
+
+
+class FileLock(object):
+    """
+    A lock file, usable as a context manager, which serializes the writers of a
+    cache shared by several processes.
+
+    The lock is best effort: if it can't be acquired before the timeout, the
+    ``acquired`` attribute is False and it is up to the caller to decide whether
+    to proceed. Locks left behind by a crashed process are broken once they are
+    older than ``stale_after`` seconds.
+    """
+
+    def __init__(self, path, timeout=10.0, stale_after=60.0):
+        """
+        :param str path: Path to the lock file.
+        :param float timeout: Seconds to wait for the lock.
+        :param float stale_after: Age in seconds after which an existing lock
+            file is considered abandoned.
+        """
+        self._path = path
+        self._timeout = timeout
+        self._stale_after = stale_after
+        self.acquired = False
+
+    def acquire(self):
+        """
+        Waits for the lock.
+
+        :returns: True if the lock was acquired.
+        """
+        ensure_folder(os.path.dirname(self._path))
+        deadline = time.time() + self._timeout
+        while True:
+            try:
+                handle = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except OSError as e:
+                if e.errno not in (errno.EEXIST, errno.EACCES):
+                    raise
+            else:
+                with os.fdopen(handle, "w") as lock_file:
+                    lock_file.write(str(os.getpid()))
+                self.acquired = True
+                return True
+
+            self._break_stale_lock()
+            if time.time() > deadline:
+                return False
+            time.sleep(0.05)
+
+    def release(self):
+        """
+        Releases the lock if it is held.
+        """
+        if not self.acquired:
+            return
+        self.acquired = False
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+    def _break_stale_lock(self):
+        """
+        Removes the lock file if it was abandoned.
+        """
+        try:
+            age = time.time() - os.path.getmtime(self._path)
+        except OSError:
+            return
+        if age > self._stale_after:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.release()
@@ -0,0 +1,326 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Functions called by the scripts of the generated menu, shelf and panels.
+
+Houdini compiles the scripts stored in the menu, shelf and panel definitions
+every time they run: each time the menu is opened, a tool is clicked or a
+panel is created. The scripts only import this module and call one of its
+functions, so the code they run is compiled once, with the engine.
+
+The engine python folder isn't on sys.path in every bootstrap scenario, so the
+engine registers this module in sys.modules as ``tk_houdini_entry_points``, the
+name the scripts import.
+"""
+
+import sys
+
+# name the module is registered as, imported by the generated scripts
+MODULE_NAME = "tk_houdini_entry_points"
+
+# names of the dynamic menus, see AppCommandsMenu.get_menu_items
+CONTEXT_MENU = "context"
+APPS_MENU = "apps"
+
+# special menu ids, when the engine isn't running or the menu can't be built
+NO_ENGINE_MENU_ID = "tk.houdini.menu.no.shotgun"
+ERROR_MENU_ID = "tk.houdini.menu.error"
+
+# shown when a generated script runs without an engine
+NOT_LOADED_MESSAGE = "Flow Production Tracking: Houdini engine is not loaded."
+
+# the code run by the dynamic menus to list their items. It is the body of a
+# function returning a list of the form [menu_id1, menu_label1, ...].
+# For additional information, see the houdini docs for the dynamic menus:
+# http://www.sidefx.com/docs/houdini15.0/basics/config_menus
+_g_menu_items_script = """try:
+    from tk_houdini_entry_points import menu_items
+except ImportError:
+    return [%r, "Toolkit is disabled - Click for details"]
+return menu_items(%r)"""
+
+# the code run when an item of a dynamic menu is clicked. kwargs holds the id
+# of the item.
+_g_menu_command_script = """try:
+    from tk_houdini_entry_points import run_menu_command
+except ImportError:
+    print(%r)
+else:
+    run_menu_command(kwargs["selectedtoken"])"""
+
+# the code run when a shelf tool is clicked
+_g_launch_script = """try:
+    from tk_houdini_entry_points import launch_command
+except ImportError:
+    print(%r)
+else:
+    launch_command(%r)"""
+
+# the code of the python panel interfaces. A panel can be restored by a desktop
+# in a session without toolkit, a label is shown then, with the Qt shipped with
+# Houdini.
+_g_panel_script = """def createInterface():
+    try:
+        from tk_houdini_entry_points import create_panel_interface
+    except ImportError:
+        from hutil.Qt import QtWidgets
+        return QtWidgets.QLabel(%r)
+    return create_panel_interface(%r, %r, kwargs)"""
+
+
+def get_menu_items_script(menu_name):
+    """
+    Returns the script listing the items of a dynamic menu.
+
+    :param str menu_name: CONTEXT_MENU or APPS_MENU.
+    """
+    return _g_menu_items_script % (NO_ENGINE_MENU_ID, menu_name)
+
+
+def get_menu_command_script():
+    """
+    Returns the script running the command of the item clicked in a dynamic
+    menu.
+    """
+    return _g_menu_command_script % (NOT_LOADED_MESSAGE,)
+
+
+def get_launch_script(command_id):
+    """
+    Returns the script of the shelf tool of a command.
+
+    :param str command_id: The id of the command.
+    """
+    return _g_launch_script % (NOT_LOADED_MESSAGE, command_id)
+
+
+def get_panel_script(panel_name, title, icon_path):
+    """
+    Returns the script of a python panel interface.
+
+    :param str panel_name: The name the panel is registered with.
+    :param str title: The title of the panel.
+    :param str icon_path: The icon shown when the panel can't be created.
+    """
+    return _g_panel_script % (
+        _get_no_context_message(title),
+        panel_name,
+        icon_path,
+    )
+
+
+def register():
+    """
+    Registers this module as ``tk_houdini_entry_points`` in sys.modules.
+    """
+    sys.modules[MODULE_NAME] = sys.modules[__name__]
+
+
+def menu_items(menu_name):
+    """
+    Returns the ids and labels of the items of a dynamic menu.
+
+    The items are built the first time and cached by the menu of the engine,
+    this is called every time the menu is opened.
+
+    :param str menu_name: CONTEXT_MENU or APPS_MENU.
+    :returns: A list of the form [menu_id1, menu_label1, ...].
+    """
+    engine = _get_engine()
+    menu = getattr(engine, "_menu", None)
+    if menu is None:
+        return [NO_ENGINE_MENU_ID, "Toolkit is disabled - Click for details"]
+    return menu.get_menu_items(menu_name)
+
+
+def run_menu_command(command_id):
+    """
+    Runs the command of the item clicked in a dynamic menu.
+
+    :param str command_id: The id of the item.
+    """
+    import hou
+
+    engine = _get_engine()
+    try:
+        # special id if there is no shotgun context/engine
+        if command_id == NO_ENGINE_MENU_ID:
+            msg = (
+                "It appears as though you are not currently working in a PTR "
+                "context. There is no PTR for Houdini Engine running so no "
+                "menu or shelf items are available. In order to restart the PTR "
+                "integration, please close and reopen Houdini or choose a file "
+                "from your PTR project in the 'Recent Files' menu. If you "
+                "believe this to be an error, please contact your support team."
+            )
+            hou.ui.displayMessage(msg, severity=hou.severityType.Warning)
+            return
+
+        # special id if errors occurred and they clicked for more info
+        if command_id == ERROR_MENU_ID:
+            # try to locate the exception on the menu object and raise it
+            if engine._menu._menu_error:
+                raise engine._menu._menu_error
+            # no stored exception, tell the user to look in the shell
+            raise Exception("The error message should show up in your shell.")
+
+        # the special context item. launch the context in browser
+        if command_id == engine._menu._context_menu_item_id:
+            from sgtk.platform.qt import QtCore, QtGui
+
+            QtGui.QDesktopServices.openUrl(QtCore.QUrl(engine.context.shotgun_url))
+        # should be a registered command. launch it
+        else:
+            engine.launch_command(command_id)
+    except Exception as e:
+        # handle any exceptions raised during menu building
+        msg = "An error occurred building the PTR menu...\n\n%s" % (e,)
+        if engine:
+            hou.ui.displayMessage(msg, severity=hou.severityType.Error)
+        else:
+            print(msg)
+
+
+def launch_command(command_id):
+    """
+    Runs the command of a shelf tool.
+
+    :param str command_id: The id of the command.
+    """
+    engine = _get_engine()
+    if engine is None or not hasattr(engine, "launch_command"):
+        import hou
+
+        if hou.isUIAvailable():
+            hou.ui.displayMessage(NOT_LOADED_MESSAGE)
+        else:
+            print(NOT_LOADED_MESSAGE)
+    else:
+        engine.launch_command(command_id)
+
+
+def create_panel_interface(panel_name, icon_path, kwargs):
+    """
+    Returns the widget of a python panel interface.
+
+    :param str panel_name: The name the panel is registered with.
+    :param str icon_path: The icon shown when the panel can't be created.
+    :param dict kwargs: The kwargs of the interface script, holding the pane
+        tab the panel is created in.
+    :returns: A Qt widget.
+    """
+    engine = _get_engine()
+    if engine is None:
+        return _create_no_panel_widget(icon_path, _get_no_context_message(panel_name))
+
+    try:
+        panel_info = engine.get_panel_info(panel_name)
+        panel_widget = engine.get_wrapped_panel_widget(
+            engine,
+            panel_info["widget_class"],
+            panel_info["bundle"],
+            panel_info["title"],
+        )
+        panel_widget.apply_stylesheet()
+    except Exception:
+        import traceback
+
+        return _create_no_panel_widget(
+            icon_path,
+            "There was a problem loading this panel! The error message "
+            "is provided below.",
+            error=traceback.format_exc(),
+        )
+
+    pane_tab = kwargs.get("paneTab")
+
+    # it appears that sometimes the pane_tab available here is not the one
+    # we're interested in. sometimes it is not set and sometimes it is a
+    # different tab all together. so just check to make sure it is set and
+    # make sure it has the 'setLabel' method available. that at least implies
+    # that it is a python panel
+    if pane_tab and hasattr(pane_tab, "setLabel"):
+        title = panel_info.get("title")
+        if title:
+            pane_tab.setLabel(title)
+
+            # We're caching here based on title, because it's the
+            # bit of information we have that's reliably available
+            # from all of the various methods of showing this
+            # pane tab. We cache the pane tab's name so that if a
+            # second invokation of showing this particular panel is
+            # triggered, we just show that panel rather than opening
+            # a second instance.
+            engine._pane_cache[title] = pane_tab.name()
+
+    return panel_widget
+
+
+def _get_engine():
+    """
+    Returns the current engine or None if toolkit isn't running.
+    """
+    try:
+        import sgtk
+    except ImportError:
+        return None
+    return sgtk.platform.current_engine()
+
+
+def _get_no_context_message(title):
+    """
+    Returns the message shown in place of a panel outside of a PTR context.
+    """
+    return (
+        "It looks like you're running Houdini outside of a PTR context. Next "
+        "time you launch Houdini from within a PTR context, you will see the "
+        "'%s' panel here." % (title,)
+    )
+
+
+def _create_no_panel_widget(icon_path, msg, error=None):
+    """
+    Returns a widget displaying a message in place of a panel.
+    """
+    from sgtk.platform.qt import QtCore, QtGui
+
+    widget = QtGui.QWidget()
+
+    sg_icon = QtGui.QLabel()
+    try:
+        sg_pixmap = QtGui.QPixmap(icon_path).scaledToWidth(
+            64, QtCore.Qt.SmoothTransformation
+        )
+        sg_icon.setPixmap(sg_pixmap)
+    except Exception:
+        pass
+
+    msg_lbl = QtGui.QLabel(msg)
+    msg_lbl.setWordWrap(True)
+
+    h_layout = QtGui.QHBoxLayout()
+    h_layout.setSpacing(5)
+    h_layout.addWidget(sg_icon)
+    h_layout.addWidget(msg_lbl)
+    h_layout.setStretchFactor(msg_lbl, 10)
+
+    v_layout = QtGui.QVBoxLayout(widget)
+    v_layout.setContentsMargins(10, 10, 10, 10)
+    v_layout.setSpacing(15)
+    v_layout.addStretch()
+    v_layout.addLayout(h_layout)
+    if error:
+        error_txt = QtGui.QTextEdit(error)
+        error_txt.setReadOnly(True)
+        v_layout.addWidget(error_txt)
+    v_layout.addStretch()
+
+    return widget
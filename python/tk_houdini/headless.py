@@ -0,0 +1,96 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Blocks the Qt imports of the engine start in headless mode.
+
+Returning an empty Qt base from the engine is not enough to keep Qt out of the
+session: tk-core also looks Qt up for its Qt5 and Qt6 modules and for the
+authentication UI, and apps may import it when they are initialized. While the
+blocker is installed, importing one of the Qt bindings raises an ImportError,
+which tk-core handles as Qt not being available.
+"""
+
+import sys
+
+# Top level names of the Qt bindings and of their support modules.
+QT_MODULE_NAMES = frozenset(
+    [
+        "PySide",
+        "PySide2",
+        "PySide6",
+        "PyQt4",
+        "PyQt5",
+        "PyQt6",
+        "Qt",
+        "shiboken",
+        "shiboken2",
+        "shiboken6",
+        "sip",
+    ]
+)
+
+
+def is_qt_module(name):
+    """
+    Whether the module is one of the Qt bindings or one of their sub modules.
+
+    :param str name: The full name of the module.
+    :rtype: bool
+    """
+    return name.split(".", 1)[0] in QT_MODULE_NAMES
+
+
+def get_loaded_qt_modules():
+    """
+    Returns the names of the Qt modules which are imported, sorted.
+
+    :rtype: list(str)
+    """
+    return sorted(name for name in list(sys.modules) if is_qt_module(name))
+
+
+class QtImportBlocker(object):
+    """
+    Import hook making the imports of the Qt bindings fail.
+
+    Modules which are already imported are not affected, the import system
+    returns them from sys.modules without looking them up.
+    """
+
+    def __init__(self):
+        # names of the modules whose import was blocked, in order
+        self.blocked = []
+
+    def find_spec(self, fullname, path=None, target=None):
+        """
+        Called by the import system for each module which is not imported yet.
+        """
+        if is_qt_module(fullname):
+            self.blocked.append(fullname)
+            raise ImportError(
+                "%s can't be imported, Qt is disabled in headless mode." % fullname,
+                name=fullname,
+            )
+        return None
+
+    def install(self):
+        """
+        Makes the imports of the Qt bindings fail until `uninstall` is called.
+        """
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """
+        Lets the Qt bindings be imported again.
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
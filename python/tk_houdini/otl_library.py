@@ -0,0 +1,179 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Merges the otl files of the apps into a single cached library file, so they
+can be installed with a single call to ``hou.hda.installFile``.
+"""
+
+import hashlib
+import os
+import time
+
+import hou
+
+from . import cache_utils
+
+# Libraries not used for this many seconds are removed.
+_MAX_LIBRARY_AGE = 30 * 24 * 3600
+
+# Name of the file storing the content hashes of the input files.
+_HASHES_FILE_NAME = "hashes.json"
+
+
+class OtlLibraryCache(object):
+    """
+    Builds and stores the consolidated otl libraries.
+
+    A library is named after a hash of the content of its input files and of the
+    Houdini version, so it is only rebuilt when an input changes. Hashing the
+    content of the inputs on every launch would be as slow as installing them,
+    so the hashes are stored along with the size and modification time of the
+    files they were computed from and only computed again when those change.
+    """
+
+    def __init__(self, logger, houdini_version, root=None):
+        """
+        :param logger: Logger used to report the library builds.
+        :param houdini_version: The Houdini version as a tuple of three ints.
+        :param str root: The cache folder. Defaults to a folder in the per-user
+            toolkit cache.
+        """
+        self._logger = logger
+        self._houdini_version = tuple(houdini_version)
+        self._root = root or cache_utils.get_cache_root("otl_libraries")
+
+    def get_library(self, otl_files):
+        """
+        Returns the library merging the given otl files, building it if needed.
+
+        :param list otl_files: The otl files to merge. When several files define
+            the same node type, the definition of the last one is used.
+        :returns: The path to the library or None if it couldn't be built.
+        """
+        content_hashes = self._get_content_hashes(otl_files)
+        key = cache_utils.hash_data(
+            {
+                "houdini": self._houdini_version,
+                "inputs": [content_hashes[path] for path in otl_files],
+            }
+        )
+        library_path = os.path.join(self._root, "library-%s.hda" % (key,))
+
+        if os.path.isfile(library_path):
+            self._logger.debug("Using consolidated otl library %s" % library_path)
+            # keep track of the last time the library was used for the pruning
+            try:
+                os.utime(library_path, None)
+            except OSError:
+                pass
+            return library_path
+
+        with cache_utils.FileLock(library_path + ".lock", stale_after=300) as lock:
+            if not lock.acquired:
+                self._logger.debug("Unable to lock %s" % library_path)
+                return None
+            # another session may have built the library while we were waiting
+            if not os.path.isfile(library_path):
+                if not self._build(library_path, otl_files):
+                    return None
+        self._prune()
+        return library_path
+
+    def _build(self, library_path, otl_files):
+        """
+        Copies the definitions of the otl files into a new library.
+
+        :param str library_path: The library to write.
+        :param list otl_files: The otl files to merge.
+        :returns: True if the library was written.
+        """
+        self._logger.debug(
+            "Building consolidated otl library %s from %d files"
+            % (library_path, len(otl_files))
+        )
+        start = time.time()
+        tmp_path = "%s.%d.tmp.hda" % (library_path, os.getpid())
+        try:
+            for otl_file in otl_files:
+                for definition in hou.hda.definitionsInFile(otl_file):
+                    definition.copyToHDAFile(tmp_path)
+            os.replace(tmp_path, library_path)
+        except (hou.OperationFailed, IOError, OSError) as e:
+            self._logger.warning("Unable to build the otl library: %s" % (e,))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        self._logger.debug("Built otl library in %.2fs" % (time.time() - start))
+        return True
+
+    def _get_content_hashes(self, otl_files):
+        """
+        Returns the content hashes of the given files, reusing the stored hashes
+        of the unchanged files.
+
+        :param list otl_files: Paths to the files.
+        :returns: A dictionary of file paths to hashes.
+        """
+        hashes_path = os.path.join(self._root, _HASHES_FILE_NAME)
+        stored_hashes = cache_utils.read_json(hashes_path)
+        if not isinstance(stored_hashes, dict):
+            stored_hashes = {}
+
+        content_hashes = {}
+        changed = False
+        for path in otl_files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                content_hashes[path] = None
+                continue
+            stored = stored_hashes.get(path)
+            if stored and stored[:2] == [stat.st_size, stat.st_mtime]:
+                content_hashes[path] = stored[2]
+                continue
+
+            content_hashes[path] = _hash_file(path)
+            stored_hashes[path] = [stat.st_size, stat.st_mtime, content_hashes[path]]
+            changed = True
+
+        if changed:
+            try:
+                cache_utils.write_json(hashes_path, stored_hashes)
+            except (IOError, OSError) as e:
+                self._logger.debug("Unable to write %s: %s" % (hashes_path, e))
+        return content_hashes
+
+    def _prune(self):
+        """
+        Removes the libraries which haven't been used for a while.
+        """
+        now = time.time()
+        for name in os.listdir(self._root):
+            if not (name.startswith("library-") and name.endswith(".hda")):
+                continue
+            path = os.path.join(self._root, name)
+            try:
+                if now - os.path.getmtime(path) > _MAX_LIBRARY_AGE:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def _hash_file(path):
+    """
+    Returns the sha1 digest of the content of a file.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as input_file:
+        for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,153 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+On-disk index of the otl files provided by the apps, so that a warm start
+doesn't have to walk the otls folders of every app.
+"""
+
+import os
+
+from . import cache_utils
+
+# Bump when the format of the manifest changes.
+_MANIFEST_VERSION = 1
+
+
+class OtlManifest(object):
+    """
+    Maps each app to the otl files it provides for a given Houdini version.
+
+    An entry records the modification time of each folder the otl files were
+    gathered from. Adding or removing a file or a version folder changes the
+    modification time of its parent folder, so an entry is valid as long as the
+    folders still have the recorded modification times. Validating an entry
+    only costs one ``stat`` per folder.
+
+    There is one manifest file per Houdini version, shared by all the sessions
+    of that version. Concurrent sessions may overwrite each other's changes,
+    which only means the lost entries are gathered again on the next launch.
+    """
+
+    def __init__(self, logger, houdini_version, root=None):
+        """
+        :param logger: Logger used to report cache hits and misses.
+        :param houdini_version: The Houdini version as a tuple of three ints.
+        :param str root: The cache folder. Defaults to a folder in the per-user
+            toolkit cache.
+        """
+        self._logger = logger
+        self._path = os.path.join(
+            root or cache_utils.get_cache_root("otls"),
+            "manifest-v%s.json" % ".".join(str(v) for v in houdini_version),
+        )
+        self._entries = None
+        self._dirty = False
+
+    @property
+    def path(self):
+        """
+        Path to the manifest file.
+        """
+        return self._path
+
+    def get_otl_files(self, key, otl_path, resolver):
+        """
+        Returns the otl files of an app, from the manifest if its entry is still
+        valid, otherwise from the given resolver.
+
+        :param str key: Identifies the app, e.g. the uri of its descriptor.
+        :param str otl_path: The otls folder of the app.
+        :param resolver: Callable accepting the otls folder and returning a
+            tuple with the list of folders the files were gathered from and the
+            list of otl files.
+        :returns: The list of otl file paths.
+        """
+        entries = self._load()
+        entry = entries.get(key)
+        if entry and entry["otl_path"] == otl_path and self._is_valid(entry):
+            self._logger.debug("Using otl manifest entry for %s" % (key,))
+            return list(entry["files"])
+
+        self._logger.debug("Gathering otl files for %s" % (key,))
+        # stat the folders before listing them, so a change made while they are
+        # listed invalidates the entry on the next launch.
+        folders = {otl_path: _get_mtime(otl_path)}
+        otl_folders, otl_files = resolver(otl_path)
+        for folder in otl_folders:
+            if folder not in folders:
+                folders[folder] = _get_mtime(folder)
+
+        entries[key] = {"otl_path": otl_path, "folders": folders, "files": otl_files}
+        self._dirty = True
+        return list(otl_files)
+
+    def save(self):
+        """
+        Writes the manifest if any entry changed.
+        """
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        # drop the entries of the apps which have been removed from disk, this
+        # only happens when the manifest changed to keep warm starts cheap.
+        entries = dict(
+            (key, entry)
+            for (key, entry) in self._entries.items()
+            if os.path.isdir(os.path.dirname(entry["otl_path"]))
+        )
+        try:
+            cache_utils.write_json(
+                self._path, {"version": _MANIFEST_VERSION, "entries": entries}
+            )
+        except (IOError, OSError) as e:
+            # the manifest is an optimization, never fail because of it
+            self._logger.debug("Unable to write otl manifest %s: %s" % (self._path, e))
+
+    def _load(self):
+        """
+        Reads the manifest file the first time it is needed.
+
+        :returns: The dictionary of entries.
+        """
+        if self._entries is None:
+            data = cache_utils.read_json(self._path)
+            if (
+                isinstance(data, dict)
+                and data.get("version") == _MANIFEST_VERSION
+                and isinstance(data.get("entries"), dict)
+            ):
+                self._entries = data["entries"]
+            else:
+                self._entries = {}
+        return self._entries
+
+    def _is_valid(self, entry):
+        """
+        Checks whether the folders of an entry are unchanged.
+
+        :param dict entry: A manifest entry.
+        :returns: True if the entry can be used.
+        """
+        for folder, mtime in entry["folders"].items():
+            if _get_mtime(folder) != mtime:
+                return False
+        return True
+
+
+def _get_mtime(path):
+    """
+    Returns the modification time of a path, or None if it doesn't exist.
+    """
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
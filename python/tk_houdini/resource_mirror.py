@@ -0,0 +1,165 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Local mirror of the resource files read from the bundle cache, which can be on
+a slow network file system.
+"""
+
+import hashlib
+import os
+import queue
+import shutil
+import threading
+
+from . import cache_utils
+
+
+class ResourceMirror(object):
+    """
+    Copies resource files, e.g. otls, icons and stylesheets, to a local folder.
+
+    :meth:`get_path` returns the path to the local copy of a file once it has
+    been mirrored and the source path otherwise, in which case the file is
+    queued to be copied by a background thread. The copies keep the size and
+    modification time of their source, which is how they are verified: a copy
+    is only used when it has the same size and modification time as the source.
+    Each file is verified once per session.
+    """
+
+    def __init__(self, logger, root=None):
+        """
+        :param logger: Logger used to report the copies.
+        :param str root: The local folder. Defaults to a folder in the per-user
+            toolkit cache.
+        """
+        self._logger = logger
+        self._root = root or cache_utils.get_cache_root("mirror")
+        # source paths to True once verified, False while they are waiting to
+        # be copied.
+        self._verified = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @property
+    def root(self):
+        """
+        The local folder.
+        """
+        return self._root
+
+    def get_path(self, path):
+        """
+        Returns the path to use to read the given file.
+
+        :param str path: Path to a resource file.
+        :returns: The path to the local copy if it is up to date, the given path
+            otherwise.
+        """
+        local_path = self.get_local_path(path)
+        with self._lock:
+            verified = self._verified.get(path)
+        if verified is None:
+            verified = _is_same_file(path, local_path)
+            with self._lock:
+                self._verified[path] = verified
+            if not verified:
+                self._enqueue(path)
+
+        if verified:
+            # keep the separator style of the given path, e.g. Houdini needs
+            # "/" in UNC paths.
+            if "\\" not in path:
+                local_path = local_path.replace("\\", "/")
+            return local_path
+        return path
+
+    def get_local_path(self, path):
+        """
+        Returns where the local copy of a file is stored. The name of the file
+        is kept, so the type of the copy can still be told by its extension.
+
+        :param str path: Path to a resource file.
+        :returns: The path to the local copy.
+        """
+        source_folder, file_name = os.path.split(os.path.normpath(path))
+        folder_hash = hashlib.sha1(source_folder.encode("utf-8")).hexdigest()
+        return os.path.join(self._root, folder_hash[:16], file_name)
+
+    def wait(self):
+        """
+        Waits for the queued files to be copied.
+        """
+        self._queue.join()
+
+    def _enqueue(self, path):
+        """
+        Queues a file to be copied, starting the background thread if needed.
+        """
+        self._queue.put(path)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tk-houdini resource mirror"
+                )
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        """
+        Copies the queued files.
+        """
+        while True:
+            path = self._queue.get()
+            try:
+                self._copy(path)
+            except Exception as e:
+                # the mirror is an optimization, the source keeps being used
+                self._logger.debug("Unable to mirror %s: %s" % (path, e))
+            finally:
+                self._queue.task_done()
+
+    def _copy(self, path):
+        """
+        Copies a file to the mirror.
+        """
+        local_path = self.get_local_path(path)
+        if not _is_same_file(path, local_path):
+            cache_utils.ensure_folder(os.path.dirname(local_path))
+            tmp_path = "%s.%d.tmp" % (local_path, os.getpid())
+            try:
+                # copy2 keeps the modification time, which is used to verify
+                # the copy.
+                shutil.copy2(path, tmp_path)
+                os.replace(tmp_path, local_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._logger.debug("Mirrored %s to %s" % (path, local_path))
+
+        with self._lock:
+            self._verified[path] = True
+
+
+def _is_same_file(source_path, local_path):
+    """
+    Checks whether the local copy has the size and modification time of its
+    source.
+    """
+    try:
+        source_stat = os.stat(source_path)
+        local_stat = os.stat(local_path)
+    except OSError:
+        return False
+    return (
+        source_stat.st_size == local_stat.st_size
+        and source_stat.st_mtime == local_stat.st_mtime
+    )
@@ -0,0 +1,315 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Records the critical path of the engine startup and exports it as a Chrome
+trace file which can be inspected in chrome://tracing or https://ui.perfetto.dev
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+# Name of the file the startup trace is written to. The file is written to the
+# session temp directory (TK_HOUDINI_TMP).
+TRACE_FILE_NAME = "tk-houdini-startup-trace.json"
+
+
+class StartupTimeline(object):
+    """
+    Collects timestamped phases during engine startup.
+
+    Phases are recorded as complete ("X") events of the Chrome trace event
+    format. Recording stops once the timeline is finished and all the deferred
+    phases have been released, at which point the trace is written to disk and
+    a one line summary is logged.
+    """
+
+    def __init__(self, logger):
+        """
+        :param logger: The logger the summary is written to.
+        """
+        self._logger = logger
+        self._events = []
+        self._lock = threading.Lock()
+        self._open_phases = {}
+        self._holds = 0
+        self._finished = False
+        self._output_dir = None
+        self._closed = False
+
+        # wall clock reference for the high resolution counter used for the
+        # event timestamps.
+        self._epoch = time.time()
+        self._counter_origin = time.perf_counter()
+
+    @property
+    def closed(self):
+        """
+        True once the trace has been written. Phases recorded afterwards are
+        ignored.
+        """
+        return self._closed
+
+    @contextlib.contextmanager
+    def phase(self, name, **args):
+        """
+        Context manager timing the wrapped block as a phase named ``name``.
+
+        :param str name: The name of the phase, e.g. ``HoudiniEngine.init_engine``.
+        :param args: Additional information stored with the event.
+        """
+        if self._closed:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_event(name, start, time.perf_counter(), args)
+
+    def begin(self, name, **args):
+        """
+        Starts a phase which is ended with :meth:`end`. Use :meth:`phase`
+        whenever the phase can be expressed as a block of code.
+
+        :param str name: The name of the phase.
+        :param args: Additional information stored with the event.
+        """
+        if not self._closed:
+            self._open_phases[name] = (time.perf_counter(), args)
+
+    def end(self, name):
+        """
+        Ends a phase started with :meth:`begin`.
+
+        :param str name: The name of the phase.
+        """
+        started = self._open_phases.pop(name, None)
+        if started and not self._closed:
+            self._add_event(name, started[0], time.perf_counter(), started[1])
+
+    def hold(self):
+        """
+        Notifies the timeline that a startup phase was deferred, e.g. with a
+        ``QTimer``. The trace won't be written until :meth:`release` is called.
+        """
+        with self._lock:
+            self._holds += 1
+
+    def release(self):
+        """
+        Notifies the timeline that a deferred phase completed.
+        """
+        with self._lock:
+            self._holds = max(0, self._holds - 1)
+        self._flush()
+
+    def finish(self, output_dir):
+        """
+        Marks the end of the startup. The trace is written to the given folder
+        as soon as all the deferred phases have been released.
+
+        :param str output_dir: Folder to write the trace to. If None, only the
+            summary is logged.
+        """
+        self._output_dir = output_dir
+        self._finished = True
+        self._flush()
+
+    def summary(self):
+        """
+        :returns: A one line summary of the top level phases.
+        :rtype: str
+        """
+        with self._lock:
+            events = list(self._events)
+
+        if not events:
+            return "no phases recorded"
+
+        # top level phases are the ones not contained in another phase
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        top_level = []
+        for event in events:
+            if top_level and event["ts"] + event["dur"] <= (
+                top_level[-1]["ts"] + top_level[-1]["dur"]
+            ):
+                continue
+            top_level.append(event)
+
+        start = min(e["ts"] for e in events)
+        end = max(e["ts"] + e["dur"] for e in events)
+        details = ", ".join("%s %.2fs" % (e["name"], e["dur"] / 1e6) for e in top_level)
+        summary = "toolkit %.2fs (%s)" % ((end - start) / 1e6, details)
+
+        process_start = _get_process_start_time()
+        if process_start is not None:
+            summary += ", Houdini before toolkit %.2fs" % (
+                max(0.0, start / 1e6 - process_start),
+            )
+        return summary
+
+    def to_chrome_trace(self):
+        """
+        :returns: The recorded phases as a Chrome trace dictionary.
+        :rtype: dict
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+
+        trace_events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "Houdini (tk-houdini startup)"},
+            }
+        ]
+
+        # show the time spent by Houdini before the engine was started. This
+        # helps telling whether toolkit or Houdini is responsible for a slow
+        # launch.
+        process_start = _get_process_start_time()
+        if events and process_start is not None:
+            first_ts = min(e["ts"] for e in events)
+            process_start_ts = process_start * 1e6
+            if process_start_ts < first_ts:
+                trace_events.append(
+                    {
+                        "name": "Houdini startup (before toolkit)",
+                        "cat": "houdini",
+                        "ph": "X",
+                        "ts": process_start_ts,
+                        "dur": first_ts - process_start_ts,
+                        "pid": pid,
+                        "tid": 0,
+                    }
+                )
+
+        for event in events:
+            trace_event = dict(event)
+            trace_event["pid"] = pid
+            trace_events.append(trace_event)
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """
+        Writes the trace to the given path.
+
+        :param str path: Path to the .json file to write.
+        """
+        with open(path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file, indent=1)
+
+    def _add_event(self, name, start, end, args):
+        """
+        Records a complete event.
+        """
+        event = {
+            "name": name,
+            "cat": "tk-houdini",
+            "ph": "X",
+            "ts": self._to_timestamp(start),
+            "dur": (end - start) * 1e6,
+            "tid": threading.current_thread().ident or 0,
+        }
+        if args:
+            event["args"] = dict((k, str(v)) for k, v in args.items())
+
+        with self._lock:
+            self._events.append(event)
+
+    def _to_timestamp(self, counter_value):
+        """
+        Converts a perf_counter value into a Chrome trace timestamp in
+        microseconds since the epoch.
+        """
+        return (self._epoch + counter_value - self._counter_origin) * 1e6
+
+    def _flush(self):
+        """
+        Writes the trace and logs the summary if the startup completed.
+        """
+        with self._lock:
+            if self._closed or not self._finished or self._holds:
+                return
+            self._closed = True
+
+        trace_path = None
+        if self._output_dir and os.path.isdir(self._output_dir):
+            trace_path = os.path.join(self._output_dir, TRACE_FILE_NAME)
+            try:
+                self.write(trace_path)
+            except (IOError, OSError) as e:
+                self._logger.debug("Unable to write startup trace: %s" % (e,))
+                trace_path = None
+
+        self._logger.info(
+            "Startup timeline: %s%s"
+            % (
+                self.summary(),
+                "; trace written to %s" % (trace_path,) if trace_path else "",
+            )
+        )
+
+
+def _get_process_start_time():
+    """
+    Returns the start time of the current process in seconds since the epoch,
+    or None if it can't be determined on this platform.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/stat") as stat_file:
+                # the process name can contain spaces, the fields of interest
+                # are after the closing parenthesis.
+                fields = stat_file.read().rsplit(")", 1)[1].split()
+            # starttime is the 22nd field, the first two fields are before the
+            # closing parenthesis.
+            start_ticks = int(fields[19])
+            with open("/proc/stat") as stat_file:
+                for line in stat_file:
+                    if line.startswith("btime"):
+                        boot_time = int(line.split()[1])
+                        break
+                else:
+                    return None
+            return boot_time + start_ticks / float(os.sysconf("SC_CLK_TCK"))
+
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            creation = wintypes.FILETIME()
+            exit_time = wintypes.FILETIME()
+            kernel = wintypes.FILETIME()
+            user = wintypes.FILETIME()
+            if not ctypes.windll.kernel32.GetProcessTimes(
+                ctypes.windll.kernel32.GetCurrentProcess(),
+                ctypes.byref(creation),
+                ctypes.byref(exit_time),
+                ctypes.byref(kernel),
+                ctypes.byref(user),
+            ):
+                return None
+            # FILETIME is expressed in 100ns intervals since January 1, 1601
+            filetime = (creation.dwHighDateTime << 32) + creation.dwLowDateTime
+            return filetime / 1e7 - 11644473600
+    except Exception:
+        return None
+
+    return None
@@ -0,0 +1,459 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Local daemon keeping toolkit state warm for the Houdini sessions of a user.
+
+Each Houdini session otherwise authenticates, looks up its pipeline
+configuration and resolves its context on its own. The daemon is started by the
+launcher when the toolkit_daemon setting is on and keeps, for as long as it
+runs:
+
+- the authenticated user,
+- the toolkit instances of the pipeline configurations, with their descriptors
+  and templates loaded, and the contexts resolved from paths and entities, for
+  a few minutes.
+
+The launcher restarts the daemon when it runs for another site or user.
+
+The sessions get their user from it, and resolve the context of the files
+they open with its toolkit instances, see :func:`resolve_context_from_path`.
+
+The sessions query it over a Unix socket, with the same newline-delimited json
+messages as the worker pool, so it is only available where Unix sockets are,
+see :func:`is_supported`. The daemon is optional: the queries return None when
+it isn't running, and the sessions then bootstrap as usual.
+
+Toolkit is only imported by the daemon itself, so the client functions of this
+module can be used before toolkit is bootstrapped.
+"""
+
+import getpass
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from .bootstrap import ensure_private_dir
+from .worker_pool import send_message, submit_job
+
+logger = logging.getLogger("sgtk.ext.tk-houdini.toolkit_daemon")
+
+# The daemon exits when it hasn't received a request for this many seconds.
+DEFAULT_IDLE_TIMEOUT = 8 * 3600
+
+# How long a toolkit instance or a resolved context is reused, in seconds. The
+# pipeline configuration can be updated and entities can be renamed on the site
+# in the meantime.
+DEFAULT_CONTEXT_TTL = 300
+
+# How long the launcher waits for a daemon it asked to shut down, in seconds.
+_SHUTDOWN_TIMEOUT = 2.0
+
+# How long a session waits for the daemon, in seconds, before bootstrapping on
+# its own.
+_QUERY_TIMEOUT = 5.0
+
+# Code run to start the daemon. The paths to the python folder of the engine and
+# of toolkit are inserted in it.
+_DAEMON_CODE = (
+    "import sys; sys.path[:0] = %r; "
+    "from tk_houdini import toolkit_daemon; "
+    "sys.exit(toolkit_daemon.main(sys.argv[1:]))"
+)
+
+
+class ToolkitDaemon(object):
+    """
+    Serves the toolkit state of a user, one request per connection.
+
+    The requests are dictionaries with a ``request`` key, see
+    :meth:`handle_request`. They are handled one at a time, so toolkit is only
+    used from a single thread.
+    """
+
+    def __init__(
+        self,
+        socket_path,
+        user=None,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT,
+        context_ttl=DEFAULT_CONTEXT_TTL,
+    ):
+        """
+        :param str socket_path: Path to the Unix socket to listen on.
+        :param user: The authenticated toolkit user handed to the sessions, or
+            None if the sessions must authenticate on their own.
+        :param float idle_timeout: How long to wait for a request before
+            exiting, in seconds.
+        :param float context_ttl: How long a toolkit instance or a resolved
+            context is reused, in seconds.
+        """
+        self._socket_path = socket_path
+        self._user = user
+        self._idle_timeout = idle_timeout
+        self._context_ttl = context_ttl
+        # paths to the time the toolkit instance of their pipeline
+        # configuration was created and the instance.
+        self._tanks = {}
+        # keys to the time a context was resolved and the serialized context.
+        self._contexts = {}
+        self._running = False
+
+    def serve(self):
+        """
+        Handles the requests until the daemon is idle for too long or it is
+        asked to shut down.
+
+        :returns: False if another daemon is already listening on the socket.
+        """
+        if os.path.exists(self._socket_path):
+            if query(self._socket_path, {"request": "ping"}) is not None:
+                logger.debug("A daemon is already listening on %s" % self._socket_path)
+                return False
+            # left over by a daemon which didn't exit cleanly
+            os.remove(self._socket_path)
+
+        # raises if another user owns the folder, they could replace the socket
+        ensure_private_dir(os.path.dirname(self._socket_path))
+        listening_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listening_socket.bind(self._socket_path)
+            os.chmod(self._socket_path, 0o600)
+            listening_socket.listen(16)
+            listening_socket.settimeout(self._idle_timeout)
+            logger.info("Toolkit daemon listening on %s" % self._socket_path)
+
+            self._running = True
+            while self._running:
+                try:
+                    connection, _ = listening_socket.accept()
+                except socket.timeout:
+                    logger.info("Toolkit daemon idle, exiting.")
+                    break
+                with connection:
+                    self._handle_connection(connection)
+        finally:
+            listening_socket.close()
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+        return True
+
+    def handle_request(self, request):
+        """
+        Handles a request.
+
+        The supported requests are:
+
+        - ``ping``: Returns the pid of the daemon, and the site and login of
+          its user.
+        - ``user``: Returns the serialized authenticated user.
+        - ``tank_from_path``: Returns the path to the pipeline configuration of
+          the ``path`` of the request, and the names of its templates.
+        - ``context_from_path``: Returns the serialized context of the ``path``
+          of the request, and the path to its pipeline configuration.
+        - ``context_from_entity``: Returns the serialized context of the
+          ``entity_type`` and ``entity_id`` of the request, in the pipeline
+          configuration of its ``path``.
+        - ``invalidate``: Forgets the toolkit instances and contexts.
+        - ``shutdown``: Stops the daemon.
+
+        :param dict request: The request.
+        :returns: The response, a dictionary with a ``success`` key and an
+            ``error`` key when it failed.
+        """
+        import sgtk
+
+        request_type = request.get("request")
+        response = {"success": True}
+        if request_type == "ping":
+            response["pid"] = os.getpid()
+            response["site"], response["login"] = _get_user_identity(self._user)
+        elif request_type == "user":
+            response["user"] = (
+                sgtk.authentication.serialize_user(self._user) if self._user else None
+            )
+        elif request_type == "tank_from_path":
+            tk = self._get_tank(request["path"])
+            response["pipeline_configuration"] = tk.pipeline_configuration.get_path()
+            response["templates"] = sorted(tk.templates)
+        elif request_type == "context_from_path":
+            response["context"] = self._get_context(
+                ("path", request["path"]),
+                lambda tk: tk.context_from_path(request["path"]),
+                request["path"],
+            )
+            tk = self._get_tank(request["path"])
+            response["pipeline_configuration"] = tk.pipeline_configuration.get_path()
+        elif request_type == "context_from_entity":
+            response["context"] = self._get_context(
+                ("entity", request["entity_type"], request["entity_id"]),
+                lambda tk: tk.context_from_entity(
+                    request["entity_type"], request["entity_id"]
+                ),
+                request["path"],
+            )
+        elif request_type == "invalidate":
+            self._tanks.clear()
+            self._contexts.clear()
+        elif request_type == "shutdown":
+            self._running = False
+        else:
+            response = {
+                "success": False,
+                "error": "Unknown request %r" % (request_type,),
+            }
+        return response
+
+    def _handle_connection(self, connection):
+        """
+        Reads a request from a connection and sends its response.
+        """
+        connection.settimeout(_QUERY_TIMEOUT)
+        try:
+            with connection.makefile("rb") as request_file:
+                request = json.loads(request_file.readline().decode("utf-8"))
+            response = self.handle_request(request)
+        except Exception as e:
+            logger.debug("Request failed: %s" % (e,), exc_info=True)
+            response = {"success": False, "error": str(e)}
+        try:
+            send_message(connection, response)
+        except OSError as e:
+            logger.debug("Unable to send the response: %s" % (e,))
+
+    def _get_tank(self, path):
+        """
+        Returns the toolkit instance of the pipeline configuration of a path,
+        creating it if it isn't cached or it expired.
+        """
+        now = time.time()
+        cached = self._tanks.get(path)
+        if cached and now - cached[0] < self._context_ttl:
+            return cached[1]
+
+        import sgtk
+
+        tk = sgtk.sgtk_from_path(path)
+        # share the instance between the paths of the same configuration
+        config_path = tk.pipeline_configuration.get_path()
+        cached = self._tanks.get(config_path)
+        if not cached or now - cached[0] >= self._context_ttl:
+            cached = (now, tk)
+            self._tanks[config_path] = cached
+        self._tanks[path] = cached
+        return cached[1]
+
+    def _get_context(self, key, resolve, path):
+        """
+        Returns a serialized context, resolving it if it isn't cached or it
+        expired.
+
+        :param tuple key: Identifies the context.
+        :param resolve: Callable returning the context for a toolkit instance.
+        :param str path: A path in the pipeline configuration of the context.
+        """
+        tk = self._get_tank(path)
+        key = (tk.pipeline_configuration.get_path(),) + key
+        cached = self._contexts.get(key)
+        if cached and time.time() - cached[0] < self._context_ttl:
+            return cached[1]
+
+        # the sessions get the user with a separate request
+        serialized_context = resolve(tk).serialize(with_user_credentials=False)
+        self._contexts[key] = (time.time(), serialized_context)
+        return serialized_context
+
+
+def is_supported():
+    """
+    Whether the daemon can run on this platform. It listens on a Unix socket,
+    which the Python builds for Windows don't support.
+
+    :rtype: bool
+    """
+    return sys.platform != "win32" and hasattr(socket, "AF_UNIX")
+
+
+def get_default_socket_path():
+    """
+    Returns the path to the socket of the daemon of the current user. It is in
+    the system temp folder, since the length of a socket path is limited.
+    """
+    return os.path.join(
+        tempfile.gettempdir(),
+        "tk-houdini-%s" % getpass.getuser(),
+        "toolkit-daemon.sock",
+    )
+
+
+def query(socket_path, request, timeout=_QUERY_TIMEOUT):
+    """
+    Sends a request to the daemon.
+
+    :param str socket_path: Path to the socket of the daemon.
+    :param dict request: The request, see :meth:`ToolkitDaemon.handle_request`.
+    :param float timeout: How long to wait for the daemon, in seconds.
+    :returns: The response or None if the daemon isn't running or the request
+        failed.
+    """
+    if not is_supported():
+        return None
+
+    try:
+        # a socket in a folder of another user could be served by anyone
+        ensure_private_dir(os.path.dirname(socket_path))
+        response = submit_job(socket_path, request, timeout=timeout)
+    except (OSError, RuntimeError, ValueError) as e:
+        logger.debug("Unable to query the toolkit daemon: %s" % (e,))
+        return None
+    if not response.get("success"):
+        logger.debug("The toolkit daemon request failed: %s" % response.get("error"))
+        return None
+    return response
+
+
+def ensure_daemon(user, interpreter, socket_path=None):
+    """
+    Starts the daemon of the current user if it isn't running. A daemon running
+    for another site or login is shut down and started again with the user, so
+    the sessions don't get its credentials. Doesn't wait for the daemon to be
+    ready, the sessions bootstrap on their own until it is.
+
+    :param user: The authenticated toolkit user handed to the sessions.
+    :param str interpreter: Path to the Python interpreter running the daemon.
+        The launcher can run in an application embedding Python, whose
+        sys.executable can't run scripts.
+    :param str socket_path: Path to the socket of the daemon. Defaults to
+        :func:`get_default_socket_path`.
+    :returns: The path to the socket of the daemon, or None if the daemon isn't
+        supported on this platform or the interpreter doesn't exist.
+    """
+    if not is_supported():
+        logger.debug("The toolkit daemon isn't supported on %s." % sys.platform)
+        return None
+    if not interpreter or not os.path.isfile(interpreter):
+        logger.debug("Not starting the toolkit daemon, no interpreter %r" % interpreter)
+        return None
+
+    import sgtk
+
+    socket_path = socket_path or get_default_socket_path()
+    response = query(socket_path, {"request": "ping"}, timeout=1.0)
+    if response is not None:
+        identity = _get_user_identity(user)
+        if (response.get("site"), response.get("login")) == identity:
+            return socket_path
+
+        logger.debug(
+            "Restarting the toolkit daemon %s of %s on %s for %s"
+            % (
+                response.get("pid"),
+                response.get("login"),
+                response.get("site"),
+                identity,
+            )
+        )
+        query(socket_path, {"request": "shutdown"}, timeout=1.0)
+        # the new daemon exits if the socket is still served
+        deadline = time.time() + _SHUTDOWN_TIMEOUT
+        while os.path.exists(socket_path) and time.time() < deadline:
+            time.sleep(0.05)
+
+    python_paths = [
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        os.path.dirname(os.path.dirname(os.path.abspath(sgtk.__file__))),
+    ]
+    process = subprocess.Popen(
+        [interpreter, "-c", _DAEMON_CODE % python_paths, "--socket", socket_path],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # keep running once the launcher exits
+        start_new_session=True,
+    )
+    # the user is sent through stdin so it doesn't show in the environment or
+    # the command line of the daemon.
+    serialized_user = sgtk.authentication.serialize_user(user) if user else ""
+    process.stdin.write(serialized_user.encode("utf-8") + b"\n")
+    process.stdin.close()
+    logger.debug("Started toolkit daemon %d on %s" % (process.pid, socket_path))
+    return socket_path
+
+
+def resolve_context_from_path(socket_path, path, engine):
+    """
+    Resolves the context of a file opened in a session with the toolkit
+    instance and the templates of the daemon.
+
+    The session reuses the toolkit instance of its engine when the file is in
+    the same pipeline configuration, rather than creating one for the path, and
+    keeps its context when the daemon resolves the same one.
+
+    :param str socket_path: Path to the socket of the daemon.
+    :param str path: Path to the file.
+    :param engine: The running engine.
+    :returns: The toolkit instance and the context of the file, or None if the
+        daemon can't resolve it, in which case the session resolves it on its
+        own.
+    """
+    response = query(socket_path, {"request": "context_from_path", "path": path})
+    if response is None:
+        return None
+
+    tk = engine.sgtk
+    if response["pipeline_configuration"] != tk.pipeline_configuration.get_path():
+        return None
+
+    if response["context"] == engine.context.serialize(with_user_credentials=False):
+        return tk, engine.context
+
+    # the context of the previous file is used to resolve the entities which
+    # can't be extracted from the path, which the daemon doesn't know about.
+    return tk, tk.context_from_path(path, engine.context)
+
+
+def _get_user_identity(user):
+    """
+    Returns the site and login of a toolkit user, or None for both if there is
+    no user.
+    """
+    if user is None:
+        return None, None
+    return user.host, user.login
+
+
+def main(argv=None):
+    """
+    Command line entry point running the daemon. The serialized user is read
+    from the first line of stdin.
+    """
+    import argparse
+
+    import sgtk
+
+    parser = argparse.ArgumentParser(description="Run the toolkit daemon.")
+    parser.add_argument("--socket", default=get_default_socket_path())
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    sgtk.LogManager().initialize_base_file_handler("tk-houdini-daemon")
+
+    user = None
+    serialized_user = sys.stdin.readline().strip()
+    if serialized_user:
+        user = sgtk.authentication.deserialize_user(serialized_user)
+        sgtk.set_authenticated_user(user)
+
+    ToolkitDaemon(args.socket, user, args.idle_timeout).serve()
+    return 0
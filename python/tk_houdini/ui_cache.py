@@ -0,0 +1,273 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Persistent, content addressed cache for the generated panel and shelf
+definition files.
+
+The menu definition isn't cached: it only depends on the menu name and is
+written by the launcher, see ui_generation.write_menu_xml.
+"""
+
+import filecmp
+import os
+import shutil
+import time
+
+from . import cache_utils
+
+# Cache entries not used for this many seconds are removed.
+_MAX_ENTRY_AGE = 30 * 24 * 3600
+
+
+class UICache(object):
+    """
+    Stores the generated panel and shelf definition files in a per-user cache
+    folder, keyed by a hash of everything the files are generated from.
+
+    Each entry is a folder named after its key which holds the definition files.
+    The entries are shared by all the Houdini sessions running on the
+    workstation. Files are written atomically under a lock, so a reader always
+    sees either a complete file or no file at all.
+    """
+
+    def __init__(self, logger, root=None):
+        """
+        :param logger: Logger used to report cache hits and misses.
+        :param str root: The cache folder. Defaults to a folder in the per-user
+            toolkit cache.
+        """
+        self._logger = logger
+        self._root = root or cache_utils.get_cache_root("ui")
+
+    @property
+    def root(self):
+        """
+        The cache folder.
+        """
+        return self._root
+
+    def restore(self, key, file_name, dest_path):
+        """
+        Restores a cached file to the given destination.
+
+        :param str key: The cache key, see :func:`get_ui_cache_key`.
+        :param str file_name: The name of the cached file.
+        :param str dest_path: Where the file should be restored to.
+        :returns: None on a cache miss. Otherwise, True if the destination was
+            written and False if it already had the cached content.
+        """
+        cached_path = self._get_cached_path(key, file_name)
+        if cached_path is None:
+            return None
+
+        if os.path.isfile(dest_path) and filecmp.cmp(
+            cached_path, dest_path, shallow=False
+        ):
+            self._logger.debug("%s is already up to date." % (dest_path,))
+            return False
+
+        # the destination can be read by other Houdini sessions when the temp
+        # directory is shared, write it atomically.
+        with open(cached_path, "rb") as cached_file:
+            cache_utils.atomic_write(dest_path, cached_file.read())
+        self._logger.debug("Restored %s from the UI cache (%s)" % (file_name, key))
+        return True
+
+    def read(self, key, file_name):
+        """
+        Returns the content of a cached file.
+
+        :param str key: The cache key, see :func:`get_ui_cache_key`.
+        :param str file_name: The name of the cached file.
+        :returns: The content as bytes, or None on a cache miss.
+        """
+        cached_path = self._get_cached_path(key, file_name)
+        if cached_path is None:
+            return None
+
+        try:
+            with open(cached_path, "rb") as cached_file:
+                data = cached_file.read()
+        except (IOError, OSError) as e:
+            self._logger.debug("Unable to read %s: %s" % (cached_path, e))
+            return None
+        self._logger.debug("Read %s from the UI cache (%s)" % (file_name, key))
+        return data
+
+    def store(self, key, file_name, src_path):
+        """
+        Stores a generated file in the cache.
+
+        :param str key: The cache key, see :func:`get_ui_cache_key`.
+        :param str file_name: The name of the cached file.
+        :param str src_path: The generated file.
+        """
+        try:
+            with open(src_path, "rb") as src_file:
+                data = src_file.read()
+        except (IOError, OSError) as e:
+            self._logger.debug("Unable to store %s in the UI cache: %s" % (src_path, e))
+            return
+        self.write(key, file_name, data)
+
+    def write(self, key, file_name, data):
+        """
+        Stores the content of a generated file in the cache.
+
+        :param str key: The cache key, see :func:`get_ui_cache_key`.
+        :param str file_name: The name of the cached file.
+        :param bytes data: The content of the file.
+        """
+        entry_path = os.path.join(self._root, key)
+        try:
+            with cache_utils.FileLock(entry_path + ".lock") as lock:
+                if not lock.acquired:
+                    self._logger.debug("Unable to lock UI cache entry %s" % key)
+                    return
+                cache_utils.atomic_write(os.path.join(entry_path, file_name), data)
+            self._prune()
+        except (IOError, OSError) as e:
+            # the cache is an optimization, never fail the startup because of it
+            self._logger.debug(
+                "Unable to store %s in the UI cache: %s" % (file_name, e)
+            )
+
+    def _get_cached_path(self, key, file_name):
+        """
+        Returns the path to a cached file and marks its entry as used, or
+        returns None on a cache miss.
+        """
+        cached_path = os.path.join(self._root, key, file_name)
+        if not os.path.isfile(cached_path):
+            self._logger.debug("UI cache miss for %s (%s)" % (file_name, key))
+            return None
+
+        # keep track of the last time the entry was used for the pruning
+        try:
+            os.utime(os.path.join(self._root, key), None)
+        except OSError:
+            pass
+        return cached_path
+
+    def _prune(self):
+        """
+        Removes the entries which haven't been used for a while.
+        """
+        now = time.time()
+        with cache_utils.FileLock(
+            os.path.join(self._root, ".prune.lock"), timeout=0
+        ) as lock:
+            if not lock.acquired:
+                # another session is already pruning
+                return
+            for name in os.listdir(self._root):
+                entry_path = os.path.join(self._root, name)
+                if not os.path.isdir(entry_path):
+                    continue
+                try:
+                    if now - os.path.getmtime(entry_path) < _MAX_ENTRY_AGE:
+                        continue
+                except OSError:
+                    continue
+                with cache_utils.FileLock(
+                    entry_path + ".lock", timeout=0
+                ) as entry_lock:
+                    if entry_lock.acquired:
+                        shutil.rmtree(entry_path, ignore_errors=True)
+
+
+def get_ui_cache_key(engine, commands, panel_commands):
+    """
+    Returns the cache key for the panel and shelf definition files of the given
+    engine.
+
+    The key covers everything the files are generated from: the registered
+    panels and their titles, the registered commands the shelf tools and the
+    panel titles can come from, the favourite commands, which come first on the
+    shelf, and the engine version, which the panel and tool scripts depend on.
+    The app versions are included since the panel titles are provided by the
+    apps.
+
+    :param engine: The running engine.
+    :param commands: The registered commands as `AppCommand` objects.
+    :param panel_commands: The registered panels as `AppCommand` objects.
+    :returns: The key.
+    :rtype: str
+    """
+    return cache_utils.hash_data(
+        {
+            "engine": [engine.name, _get_bundle_version(engine)],
+            "apps": sorted(
+                (name, _get_bundle_version(app)) for (name, app) in engine.apps.items()
+            ),
+            "commands": [_get_command_data(cmd) for cmd in commands],
+            "panels": [_get_command_data(cmd) for cmd in panel_commands],
+            "favourites": engine.get_setting("menu_favourites"),
+        }
+    )
+
+
+def _get_bundle_version(bundle):
+    """
+    Returns the version of an engine or an app.
+
+    Bundles using a dev or path descriptor don't have a version: their code is
+    edited in place. Their version is then a digest of the modification times
+    and sizes of their files, so the key changes when one of them is edited.
+
+    :param bundle: The engine or the app.
+    :rtype: str
+    """
+    version = bundle.version
+    if version and version != "Undefined":
+        return version
+
+    files = []
+    for folder, folder_names, file_names in os.walk(bundle.disk_location):
+        folder_names[:] = [
+            name
+            for name in folder_names
+            if not name.startswith(".") and name != "__pycache__"
+        ]
+        for file_name in file_names:
+            path = os.path.join(folder, file_name)
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                continue
+            files.append(
+                [
+                    os.path.relpath(path, bundle.disk_location),
+                    file_stat.st_mtime_ns,
+                    file_stat.st_size,
+                ]
+            )
+    return "dev:%s" % cache_utils.hash_data(sorted(files))
+
+
+def _get_command_data(cmd):
+    """
+    Returns the data of a command which affects the generated ui files.
+
+    :param cmd: An `AppCommand`.
+    :returns: A list of values.
+    """
+    return [
+        cmd.name,
+        cmd.get_id(),
+        cmd.get_type(),
+        cmd.get_icon(),
+        cmd.get_description(),
+        cmd.get_documentation_url_str(),
+        cmd.get_app_name(),
+        cmd.get_app_instance_name(),
+        cmd.properties.get("title"),
+    ]
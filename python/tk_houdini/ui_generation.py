@@ -10,8 +10,11 @@
 
 import os
 import sys
+import traceback
 import xml.etree.ElementTree as ET
 
+from . import bootstrap, cache_utils, entry_points, ui_snapshot
+
 # global used to indicate that the file change time has been initialized and
 # started
 g_file_change_timer = None
@@ -19,6 +22,12 @@ g_file_change_timer = None
 # stores the path of the current file for use by the file change timeout callback
 g_current_file = None
 
+# translation table replacing the characters of a command name which aren't
+# letters with underscores, used to build the command ids.
+_g_command_id_translation = "".join(
+    chr(c) if chr(c).isupper() or chr(c).islower() else "_" for c in range(256)
+)
+
 
 class AppCommandsUI(object):
     """Base class for interface elements that trigger command actions."""
@@ -27,7 +36,7 @@ class AppCommandsUI(object):
         self._engine = engine
         self._commands = commands
 
-    def refresh(self, commands):
+    def refresh(self, commands, diff=None, snapshot=None):
         """
         Refresh the UI with new commands after a context change.
 
@@ -36,6 +45,9 @@ class AppCommandsUI(object):
         do a full restart on context switch.
 
         :param commands: The new list of commands for the updated context.
+        :param diff: The `CommandIndexDiff` of the context change, if known.
+        :param snapshot: The `UISnapshot` of the new context, if any. Its
+            grouped commands are reused.
         """
         self._commands = commands
 
@@ -49,6 +61,18 @@ class AppCommandsUI(object):
         if hasattr(self, "_commands_by_app"):
             del self._commands_by_app
 
+        if snapshot is not None and snapshot.grouped_commands is not None:
+            self._grouped_commands = snapshot.grouped_commands
+
+    def capture_snapshot(self, snapshot):
+        """
+        Stores the state prepared for the current context in a snapshot.
+
+        :param snapshot: A `UISnapshot`.
+        """
+        if hasattr(self, "_grouped_commands"):
+            snapshot.grouped_commands = self._grouped_commands
+
     def _get_context_name(self):
         """Returns a display name for the current context"""
 
@@ -81,18 +105,17 @@ class AppCommandsUI(object):
             context_cmds = []
             cmds_by_app = {}
 
-            # favourites
-            for fav in self._engine.get_setting("menu_favourites"):
-                app_instance_name = fav["app_instance"]
-                menu_name = fav["name"]
+            # favourites, looked up by app instance and command name
+            cmds_by_key = {}
+            for cmd in self._commands:
+                cmds_by_key.setdefault(
+                    (cmd.get_app_instance_name(), cmd.name), []
+                ).append(cmd)
 
-                for cmd in self._commands:
-                    if (
-                        cmd.get_app_instance_name() == app_instance_name
-                        and cmd.name == menu_name
-                    ):
-                        cmd.favourite = True
-                        favourite_cmds.append(cmd)
+            for fav in self._engine.get_setting("menu_favourites"):
+                for cmd in cmds_by_key.get((fav["app_instance"], fav["name"]), []):
+                    cmd.favourite = True
+                    favourite_cmds.append(cmd)
 
             # this is how the original, static menu logic worked for grouping
             # commands in the Shotgun menu in houdini. it was moved here so
@@ -130,11 +153,85 @@ class AppCommandsMenu(AppCommandsUI):
         # _get_context_commands method.
         self._context_menu_item_id = None
 
+        # the ids and labels of the items of the dynamic menus, by menu name.
+        self._menu_items = {}
+
+    def refresh(self, commands, diff=None, snapshot=None):
+        """
+        Refresh the menu with new commands after a context change.
+
+        :param commands: The new list of commands for the updated context.
+        :param diff: The `CommandIndexDiff` of the context change, if known.
+            The app commands entries are kept when no command changed.
+        :param snapshot: The `UISnapshot` of the new context, if any. Its menu
+            items are reused.
+        """
+        super().refresh(commands, diff, snapshot)
+
+        if snapshot is not None and snapshot.menu_items is not None:
+            self._engine.logger.debug("Using the menu of the UI snapshot.")
+            self._menu_items = dict(snapshot.menu_items)
+            self._context_menu_item_id = snapshot.context_menu_item_id
+            return
+
+        # the context entries show the name of the context
+        self._menu_items.pop(entry_points.CONTEXT_MENU, None)
+        if diff is None or diff:
+            self._menu_items.clear()
+        else:
+            self._engine.logger.debug("App commands unchanged, keeping the menu.")
+
+    def capture_snapshot(self, snapshot):
+        """
+        Stores the menu items built for the current context in a snapshot.
+
+        :param snapshot: A `UISnapshot`.
+        """
+        super().capture_snapshot(snapshot)
+        snapshot.menu_items = dict(self._menu_items)
+        snapshot.context_menu_item_id = self._context_menu_item_id
+
     def create_menu(self, xml_path):
-        """Create the PTR Menu"""
+        """Create the PTR Menu
+
+        :returns: True if the file was written, False if it was up to date.
+        """
 
         self._engine.logger.debug("Constructing dynamic PTR menu.")
-        self._create_dynamic_menu(xml_path)
+        return self._create_dynamic_menu(xml_path)
+
+    def get_menu_items(self, menu_name):
+        """Returns the items of a dynamic menu, built the first time.
+
+        This is called each time houdini builds a dynamic menu, when the user
+        clicks on the top-level Shotgun menu.
+
+        :param str menu_name: The name of the menu, `entry_points.CONTEXT_MENU`
+            or `entry_points.APPS_MENU`.
+        :returns: The list houdini expects, of the form
+            [menu_id1, menu_label1, menu_id2, menu_label2, ...].
+        """
+        menu_items = self._menu_items.get(menu_name)
+        if menu_items is not None:
+            return menu_items
+
+        try:
+            if menu_name == entry_points.CONTEXT_MENU:
+                cmds = self._get_context_commands()
+            else:
+                cmds = self._get_commands_by_app()
+            menu_items = []
+            for cmd in cmds:
+                menu_items.extend([cmd.get_id(), cmd.name])
+        except Exception as e:
+            # store the exception for display when the error item is clicked
+            self._menu_error = Exception(str(e) + ". " + traceback.format_exc())
+            # just give houdini a special error item for the menu
+            return [entry_points.ERROR_MENU_ID, "Menu Error. Click for Details..."]
+
+        self._menu_error = None
+        self._menu_items[menu_name] = menu_items
+        return menu_items
 
     def _get_context_commands(self):
         """This method returns a modified list of context commands.
@@ -200,7 +297,7 @@ class AppCommandsMenu(AppCommandsUI):
 
             context_cmds, cmds_by_app, favourite_cmds = self._group_commands()
 
-            cmds = favourite_cmds
+            cmds = list(favourite_cmds)
 
             # get the grouped commands, then flatten it out into a list
             for app_name in cmds_by_app.keys():
@@ -213,108 +310,16 @@ class AppCommandsMenu(AppCommandsUI):
 
         return self._commands_by_app
 
-    def _build_shotgun_menu_item(self):
-        """Constructs a top-level "Flow Production Tracking" menu.
-
-        Same logic for both the static and dynamic menu.
-
-        :returns: tuple containing the root element and the shotgun menu item
-
-        """
-
-        root = ET.Element("mainMenu")
-        menubar = ET.SubElement(root, "menuBar")
-        shotgun_menu = self._menuNode(
-            menubar,
-            self._engine._menu_name,
-            "tk.shotgun",
-        )
-
-        insert_before = ET.SubElement(shotgun_menu, "insertBefore")
-        insert_before.text = "help_menu"
-
-        # make sure the Help menu still comes last
-        modify_item = ET.SubElement(menubar, "modifyItem")
-        modify_item.set("id", "help_menu")
-        ET.SubElement(modify_item, "insertAfter")
-
-        return (root, shotgun_menu)
-
     def _create_dynamic_menu(self, xml_path):
         """Construct the dynamic Shotgun menu for toolkit in Houdini 15+.
 
         :param xml_path: The path to the xml file to store the menu definitions
+        :returns: True if the file was written, False if it was up to date.
 
         """
-        # documentation on the dynamic menu xml tags can be found here:
-        # http://www.sidefx.com/docs/houdini15.0/basics/config_menus
-
-        # build the Shotgun menu
-        root, shotgun_menu = self._build_shotgun_menu_item()
-
-        # add the context menu
-        context_menu = self._menuNode(
-            shotgun_menu, "Current Context", "tk.context.menu"
-        )
-        ET.SubElement(shotgun_menu, "separatorItem")
-
-        context_dynamic_menu = ET.SubElement(context_menu, "scriptMenuStripDynamic")
-        context_dynamic_menu.set("id", "tk.context_dynamic_menu")
-
-        # here we build an element that stores a python script for returning
-        # the ids and names of context menu items. the code is executed each
-        # time the menu is built.
-        context_dynamic_menu_contents = ET.SubElement(
-            context_dynamic_menu, "contentsScriptCode"
-        )
-        context_dynamic_menu_contents.text = (
-            "CDATA_START"
-            + _g_dynamic_menu_names % ("_get_context_commands",)
-            + "CDATA_END"
-        )
-
-        # this element defines a python script that has access to the id of the
-        # menu selected by the user (as defined in the previous element).  this
-        # script uses the id to determine the command and callback execute.
-        context_dynamic_menu_script = ET.SubElement(context_dynamic_menu, "scriptCode")
-        context_dynamic_menu_script.text = (
-            "CDATA_START" + _g_dynamic_menu_script + "CDATA_END"
-        )
-
-        main_dynamic_menu = ET.SubElement(shotgun_menu, "scriptMenuStripDynamic")
-        main_dynamic_menu.set("id", "tk.main_dynamic_menu")
-
-        # similar to the dynamic context menu. this time we format the python
-        # script to call the method to return the app specific commands.
-        main_dynamic_menu_contents = ET.SubElement(
-            main_dynamic_menu, "contentsScriptCode"
-        )
-        main_dynamic_menu_contents.text = (
-            "CDATA_START"
-            + _g_dynamic_menu_names % ("_get_commands_by_app",)
-            + "CDATA_END"
-        )
-
-        # same script as the context menu for mapping ids to callbacks for
-        # execution
-        main_dynamic_menu_script = ET.SubElement(main_dynamic_menu, "scriptCode")
-        main_dynamic_menu_script.text = (
-            "CDATA_START" + _g_dynamic_menu_script + "CDATA_END"
-        )
-
-        # format the xml and write it to disk
-        xml = _format_xml(ET.tostring(root).decode("utf-8"))
-        _write_xml(xml, xml_path)
+        changed = write_menu_xml(xml_path, self._engine._menu_name)
         self._engine.logger.debug("Dynamic menu written to: %s" % (xml_path,))
-
-    def _menuNode(self, parent, label, id):
-        """Constructs a submenu for the supplied parent."""
-
-        menu = ET.SubElement(parent, "subMenu")
-        menu.set("id", id)
-        node = ET.SubElement(menu, "label")
-        node.text = label
-        return menu
+        return changed
 
 
 class AppCommandsPanelHandler(AppCommandsUI):
@@ -341,8 +346,6 @@ class AppCommandsPanelHandler(AppCommandsUI):
     def create_panels(self, panels_file):
         """Create the registered panels."""
 
-        import hou
-
         # this code builds an xml file that defines panel interfaces to be
         # read by houdini. The xml should look something like this:
         #
@@ -370,12 +373,18 @@ class AppCommandsPanelHandler(AppCommandsUI):
 
         root = ET.Element("pythonPanelDocument")
 
+        # the widget classes are only resolved when a panel is created, see
+        # entry_points.create_panel_interface. The panels file is restored
+        # from the UI cache on later startups, so the panel callbacks run by
+        # _get_panel_titles only run when the panels change.
+        titles = self._get_panel_titles()
+
         for panel_cmd in self._panel_commands:
-            panel_info = self._engine.get_panel_info(panel_cmd.name)
+            title = titles[panel_cmd.name]
 
             interface = ET.SubElement(root, "interface")
             interface.set("name", panel_cmd.name)
-            interface.set("label", panel_info["title"])
+            interface.set("label", title)
 
             icon = panel_cmd.get_icon()
             if icon:
@@ -387,7 +396,7 @@ class AppCommandsPanelHandler(AppCommandsUI):
             interface.set("help_url", doc_url)
 
             script = ET.SubElement(interface, "script")
-            script_code = _g_panel_script % (icon, panel_info["title"], panel_cmd.name)
+            script_code = entry_points.get_panel_script(panel_cmd.name, title, icon)
             script.text = "CDATA_START" + script_code + "CDATA_END"
 
             desc = panel_cmd.get_description()
@@ -411,6 +420,41 @@ class AppCommandsPanelHandler(AppCommandsUI):
         _write_xml(xml, panels_file)
         self._engine.logger.debug("Panels written to: %s" % panels_file)
 
+        self.install_panels(panels_file)
+
+    def _get_panel_titles(self):
+        """Returns the titles of the panels, by panel name.
+
+        The title is the "title" property the panel was registered with, if
+        any. Otherwise it is the title the panel is shown with, retrieved from
+        `show_panel` with `get_panel_info`, then the name of the app of the
+        panel.
+        """
+
+        titles = {}
+        for panel_cmd in self._panel_commands:
+            title = panel_cmd.properties.get("title")
+            if not title:
+                try:
+                    panel_info = self._engine.get_panel_info(panel_cmd.name)
+                except Exception as e:
+                    self._engine.logger.warning(
+                        "Unable to get the title of panel %s: %s" % (panel_cmd.name, e)
+                    )
+                    panel_info = None
+                if panel_info:
+                    title = panel_info.get("title")
+            titles[panel_cmd.name] = title or panel_cmd.get_app_name() or panel_cmd.name
+        return titles
+
+    def install_panels(self, panels_file):
+        """Install the panels defined in the supplied file.
+
+        :param panels_file: A .pypanel file written by `create_panels`.
+        """
+
+        import hou
+
         # install the panels
         hou.pypanel.installFile(panels_file)
 
@@ -452,15 +496,127 @@ class AppCommandsShelf(AppCommandsUI):
         self._name = name
         self._label = label
 
-    def create_shelf(self, shelf_file):
+        # whether the shelf and its tools are written in one pass and loaded
+        # with a single call, rather than created one tool at a time.
+        self._bulk_load = engine.get_setting("bulk_shelf_load", True)
+
+        # the file the tools are written to, once the shelf is created
+        self._shelf_file = None
+
+        # the shelf document loaded last, if the shelf was loaded in bulk
+        self._shelf_xml = None
+
+    def refresh(self, commands, diff=None, snapshot=None):
+        """
+        Refresh the shelf with new commands after a context change.
+
+        :param commands: The new list of commands for the updated context.
+        :param diff: The `CommandIndexDiff` of the context change, if known.
+            Only the tools of the commands in it are updated.
+        :param snapshot: The `UISnapshot` of the new context, if any. Its
+            shelf document is loaded when commands changed.
+        """
+        super().refresh(commands, diff, snapshot)
+        if diff is None:
+            return
+
+        if diff and snapshot is not None and snapshot.shelf_xml and self._shelf_file:
+            self._engine.logger.debug("Loading the shelf of the UI snapshot.")
+            self._load_shelf(self._shelf_file, snapshot.shelf_xml)
+        else:
+            self.update_tools(diff)
+
+    def capture_snapshot(self, snapshot):
+        """
+        Stores the shelf document of the current context in a snapshot.
+
+        :param snapshot: A `UISnapshot`.
+        """
+        super().capture_snapshot(snapshot)
+        snapshot.shelf_xml = self._shelf_xml
+
+    def update_tools(self, diff):
+        """Adds, removes and updates the tools of the changed commands.
+
+        The tools of the other commands are left alone, so a context change
+        which doesn't change the commands doesn't touch the shelf.
+
+        :param diff: A `CommandIndexDiff`.
+        """
+
+        import hou
+
+        shelf = hou.shelves.shelves().get(self._name, None)
+        if not shelf or not self._shelf_file:
+            return
+
+        # the tools no longer match the document loaded last
+        self._shelf_xml = None
+
+        cmds = self._get_shelf_commands()
+        tool_names = [cmd.name.replace(" ", "_") for cmd in cmds]
+        shelf_tools = shelf.tools()
+        if not diff and [tool.name() for tool in shelf_tools] == tool_names:
+            self._engine.logger.debug("Shelf is up to date.")
+            return
+
+        added_ids = set(cmd.get_id() for cmd in diff.added)
+        changed_ids = set(cmd.get_id() for cmd in diff.changed)
+        tools = hou.shelves.tools()
+
+        new_tools = []
+        for cmd, tool_name in zip(cmds, tool_names):
+            tool = tools.get(tool_name)
+            if tool is None or cmd.get_id() in added_ids:
+                tool = self.create_tool(self._shelf_file, cmd)
+            elif cmd.get_id() in changed_ids:
+                self._engine.logger.debug("Updating tool: %s" % cmd.name)
+                tool.setData(
+                    script=entry_points.get_launch_script(cmd.get_id()),
+                    label=cmd.name,
+                    icon=cmd.get_icon() or "",
+                )
+            new_tools.append(tool)
+
+        new_tool_names = set(tool_names)
+        for cmd in diff.removed:
+            tool = tools.get(cmd.name.replace(" ", "_"))
+            if tool is not None and tool.name() not in new_tool_names:
+                self._engine.logger.debug("Destroying tool: %s" % tool.name())
+                tool.destroy()
+
+        self._engine.logger.debug("Assigning tools to shelf %r..." % shelf)
+        shelf.setTools(new_tools)
+
+    def create_shelf(self, shelf_file, ui_cache=None, ui_cache_key=None):
         """Creates a Shotgun shelf with a tool button for each command.
 
         shelf_file:
             The xml file where the shelf definition will be written
+
+        ui_cache:
+            Optional `UICache` the shelf document is read from, or stored in
+            when it is generated, when the shelf is loaded in bulk
+
+        ui_cache_key:
+            The key of the shelf document in the cache, see `get_ui_cache_key`
         """
 
         import hou
 
+        self._shelf_file = shelf_file
+
+        if self._bulk_load and hasattr(hou.shelves, "loadFile"):
+            shelf_xml = None
+            if ui_cache is not None:
+                shelf_xml = ui_cache.read(ui_cache_key, "sg_shelf.xml")
+            if shelf_xml is None:
+                shelf_xml = self.get_shelf_xml()
+                if ui_cache is not None:
+                    ui_cache.write(ui_cache_key, "sg_shelf.xml", shelf_xml)
+            self._load_shelf(shelf_file, shelf_xml)
+            return
+
         # On windows it is necessary to create a blank the xml file before
         # creating the shelf.
         shelf_dir = os.path.dirname(shelf_file)
@@ -485,30 +641,10 @@ class AppCommandsShelf(AppCommandsUI):
             )
 
         shelf_tools = []
-        cmds_by_app = {}
-
-        context_cmds, cmds_by_app, favourite_cmds = self._group_commands()
-
-        # add the context menu tools first
-        self._engine.logger.debug("Creating context menu...")
-        for cmd in context_cmds:
+        for cmd in self._get_shelf_commands():
             tool = self.create_tool(shelf_file, cmd)
             shelf_tools.append(tool)
 
-        # now add the favourites
-        self._engine.logger.debug("Creating favourites...")
-        for cmd in favourite_cmds:
-            tool = self.create_tool(shelf_file, cmd)
-            shelf_tools.append(tool)
-
-        # create tools for the remaining commands
-        self._engine.logger.debug("Creating app menu items...")
-        for app_name in sorted(cmds_by_app.keys()):
-            for cmd in cmds_by_app[app_name]:
-                if not cmd.favourite:
-                    tool = self.create_tool(shelf_file, cmd)
-                    shelf_tools.append(tool)
-
         self._engine.logger.debug("Assigning tools to shelf %r..." % shelf)
         shelf.setTools(shelf_tools)
         self._engine.logger.debug("...done!")
@@ -518,6 +654,96 @@ class AppCommandsShelf(AppCommandsUI):
         # sesi to see what they recommend. If there is a way, this is probably
         # where the shelf would need to be added.
 
+    def get_shelf_xml(self, cmds=None):
+        """Returns the shelf and all of its tools as a shelf document.
+
+        The document looks something like this:
+
+        <?xml version='1.0' encoding='UTF-8'?>
+        <shelfDocument>
+          <toolshelf name="Flow Production Tracking" label="...">
+            <memberTool name="My_Command" />
+          </toolshelf>
+          <tool name="My_Command" label="My Command" icon="/path/to/icon.png">
+            <script scriptType="python">PYTHON CODE HERE</script>
+          </tool>
+        </shelfDocument>
+
+        :param cmds: The commands of the tools, in order. Defaults to the
+            commands of the shelf, see `_get_shelf_commands`.
+        :returns: The utf-8 encoded xml.
+        """
+
+        if cmds is None:
+            cmds = self._get_shelf_commands()
+
+        root = ET.Element("shelfDocument")
+        toolshelf = ET.SubElement(root, "toolshelf")
+        toolshelf.set("name", self._name)
+        toolshelf.set("label", self._label)
+
+        for cmd in cmds:
+            tool_name = cmd.name.replace(" ", "_")
+            ET.SubElement(toolshelf, "memberTool").set("name", tool_name)
+
+            tool = ET.SubElement(root, "tool")
+            tool.set("name", tool_name)
+            tool.set("label", cmd.name)
+            icon = cmd.get_icon()
+            if icon:
+                tool.set("icon", icon)
+            # see create_tool for why the help isn't set
+            script = ET.SubElement(tool, "script")
+            script.set("scriptType", "python")
+            script.text = entry_points.get_launch_script(cmd.get_id())
+
+        return ET.tostring(root, encoding="UTF-8", xml_declaration=True)
+
+    def _load_shelf(self, shelf_file, shelf_xml=None):
+        """Writes the shelf document and loads it with a single houdini call.
+
+        An existing shelf with the same name is redefined by the document, so
+        it now points to the new shelf file for this session.
+
+        :param str shelf_file: The file to write the document to.
+        :param bytes shelf_xml: The document, see `get_shelf_xml`. Generated
+            from the current commands if not supplied.
+        """
+
+        import hou
+
+        if shelf_xml is None:
+            shelf_xml = self.get_shelf_xml()
+
+        self._engine.logger.debug("Writing shelf: %s" % shelf_file)
+        shelf_dir = os.path.dirname(shelf_file)
+        if not os.path.exists(shelf_dir):
+            os.makedirs(shelf_dir)
+        with open(shelf_file, "wb") as shelf_file_handle:
+            shelf_file_handle.write(shelf_xml)
+
+        self._engine.logger.debug("Loading shelf file: %s" % shelf_file)
+        hou.shelves.loadFile(shelf_file)
+        self._shelf_xml = shelf_xml
+        self._engine.logger.debug("...done!")
+
+    def _get_shelf_commands(self):
+        """Returns the commands of the shelf tools, in order.
+
+        The context commands come first, then the favourites and then the
+        commands of each app.
+        """
+
+        context_cmds, cmds_by_app, favourite_cmds = self._group_commands()
+
+        cmds = list(context_cmds)
+        cmds.extend(favourite_cmds)
+        for app_name in sorted(cmds_by_app.keys()):
+            for cmd in cmds_by_app[app_name]:
+                if not cmd.favourite:
+                    cmds.append(cmd)
+        return cmds
+
     def create_tool(self, shelf_file, cmd):
         """Create a new shelf tool.
 
@@ -535,7 +761,7 @@ class AppCommandsShelf(AppCommandsUI):
             file_path=shelf_file,
             name=cmd.name.replace(" ", "_"),
             label=cmd.name,
-            script=_g_launch_script % cmd.get_id(),
+            script=entry_points.get_launch_script(cmd.get_id()),
             # help=cmd.get_description(),
             # help_url=cmd.get_documentation_url_str(),
             icon=cmd.get_icon(),
@@ -579,20 +805,67 @@ class AppCommandsShelf(AppCommandsUI):
         if not shelf:
             return
 
-        # destroy all the tools on the shelf to be safe
-        for tool in shelf.tools():
+        tools = shelf.tools()
+
+        if self._bulk_load and hasattr(hou.shelves, "loadFile"):
+            # swap the shelf file for an empty shelf document, which empties
+            # the shelf with a single houdini call, rather than updating it
+            # for each tool destroyed.
+            shelf_file = self._shelf_file or shelf.filePath()
+            if shelf_file:
+                self._engine.logger.debug("Clearing shelf: %s" % self._name)
+                self._load_shelf(shelf_file, self.get_shelf_xml([]))
+                self._shelf_xml = None
+
+        # destroy all the tools on the shelf to be safe. Once the shelf is
+        # cleared, they are no longer on it.
+        for tool in tools:
             self._engine.logger.debug("Destroying tool: %s" % tool.name())
             tool.destroy()
 
 
 class AppCommand(object):
-    """Wraps around a single command that you get from engine.commands"""
+    """Wraps around a single command that you get from engine.commands
+
+    The values the menu, the shelf and the panels are built from are computed
+    once, when the command is created.
+    """
+
+    __slots__ = (
+        "name",
+        "properties",
+        "callback",
+        "favourite",
+        "_engine",
+        "_id",
+        "_app_instance_name",
+        "_icon",
+        "_type",
+    )
 
-    def __init__(self, name, command_dict):
+    def __init__(self, name, command_dict, engine=None, app_instance_names=None):
+        """
+        :param str name: The name of the command.
+        :param dict command_dict: The properties and the callback of the
+            command.
+        :param engine: The engine, used to resolve the local copy of the icon,
+            if any.
+        :param dict app_instance_names: The instance names of the apps of the
+            engine, by app object id. Looked up in the apps of the engine of
+            the app of the command when not supplied.
+        """
         self.name = name
         self.properties = command_dict["properties"]
         self.callback = command_dict["callback"]
         self.favourite = False
+        self._engine = engine
+        self._app_instance_name = self._find_app_instance_name(app_instance_names)
+        self._id = "tk.app.%s.%s" % (
+            self._app_instance_name,
+            name.translate(_g_command_id_translation).lower(),
+        )
+        self._icon = self._find_icon()
+        self._type = self.properties.get("type", "default")
 
     def get_app_name(self):
         if "app" in self.properties:
@@ -600,25 +873,61 @@ class AppCommand(object):
         return None
 
     def get_app_instance_name(self):
+        return self._app_instance_name
+
+    def get_description(self):
+        if "description" in self.properties:
+            return self.properties["description"]
+        return None
+
+    def get_icon(self):
+        return self._icon
+
+    def get_id(self):
+        return self._id
+
+    def get_documentation_url_str(self):
+        if "app" in self.properties:
+            app = self.properties["app"]
+            doc_url = app.documentation_url
+            return str(doc_url)
+
+        return None
+
+    def get_type(self):
+        return self._type
+
+    def get_signature(self):
+        """Returns the values the menu entry and the shelf tool of the command
+        are built from, to tell whether they need to be updated.
+        """
+        return (
+            self.name,
+            self._app_instance_name,
+            self.get_app_name(),
+            self.get_description(),
+            self._icon,
+            self._type,
+        )
+
+    def _find_app_instance_name(self, app_instance_names):
+        """Returns the instance name of the app of the command, if any."""
         if "app" not in self.properties:
             return None
 
         app_instance = self.properties["app"]
-        engine = app_instance.engine
+        if app_instance_names is not None:
+            return app_instance_names.get(id(app_instance))
 
+        engine = app_instance.engine
         for app_instance_name, app_instance_obj in engine.apps.items():
             if app_instance_obj == app_instance:
                 return app_instance_name
 
         return None
 
-    def get_description(self):
-        if "description" in self.properties:
-            return self.properties["description"]
-        return None
-
-    def get_icon(self):
-
+    def _find_icon(self):
+        """Returns the path to the icon of the command, if any."""
         icon_path = None
 
         if "icon" in self.properties:
@@ -627,30 +936,138 @@ class AppCommand(object):
             icon_path = self.properties["app"].descriptor.get_icon_256()
 
         if icon_path:
+            if self._engine:
+                icon_path = self._engine._get_resource_path(icon_path)
             # houdini required "/" for UNC paths instead of "\\".
             icon_path = icon_path.replace("\\", "/")
 
         return icon_path
 
-    def get_id(self):
-        title_trans = "".join(
-            chr(c) if chr(c).isupper() or chr(c).islower() else "_" for c in range(256)
+
+class CommandIndex(object):
+    """The registered commands and panels of an engine as `AppCommand` objects.
+
+    The index is built once per context, see `get_command_index`.
+    """
+
+    def __init__(self, engine):
+        """
+        :param engine: The engine to index the registered commands of.
+        """
+        self.context = engine.context
+        self._counts = (len(engine.commands), len(engine.panels))
+
+        app_instance_names = dict(
+            (id(app), app_instance_name)
+            for (app_instance_name, app) in engine.apps.items()
         )
-        return "tk.app.%s.%s" % (
-            self.get_app_instance_name(),
-            self.name.translate(title_trans).lower(),
+
+        self.commands = _get_builtin_commands(engine)
+        for cmd_name, cmd_details in engine.commands.items():
+            self.commands.append(
+                AppCommand(cmd_name, cmd_details, engine, app_instance_names)
+            )
+
+        self.panels = [
+            AppCommand(panel_name, panel_details, engine, app_instance_names)
+            for (panel_name, panel_details) in engine.panels.items()
+        ]
+
+        # tells whether a snapshot of the index is stale, see ui_snapshot
+        self.command_set_hash = ui_snapshot.get_command_set_hash(engine)
+
+        # used to run the commands clicked in the menu and the shelf
+        self.callbacks = dict((cmd.get_id(), cmd.callback) for cmd in self.commands)
+        self.commands_by_id = dict((cmd.get_id(), cmd) for cmd in self.commands)
+
+    def update_callbacks(self, engine):
+        """Binds the commands and panels to the callbacks currently registered
+        with the engine.
+
+        The index is current as long as the names and properties of the
+        registrations are the same, but a command registered again, e.g. by an
+        app restarted by a context change, has a new callback.
+        """
+        for cmd in self.commands:
+            details = engine.commands.get(cmd.name)
+            if details is not None:
+                cmd.callback = details["callback"]
+        for cmd in self.panels:
+            details = engine.panels.get(cmd.name)
+            if details is not None:
+                cmd.callback = details["callback"]
+        self.callbacks = dict((cmd.get_id(), cmd.callback) for cmd in self.commands)
+
+    def is_current(self, engine):
+        """Whether the index matches the context and registrations of the
+        engine.
+
+        The numbers of commands and panels are compared first, they are cheaper
+        to check than the hash of the registrations.
+        """
+        return (
+            self.context == engine.context
+            and self._counts == (len(engine.commands), len(engine.panels))
+            and self.command_set_hash == ui_snapshot.get_command_set_hash(engine)
         )
 
-    def get_documentation_url_str(self):
-        if "app" in self.properties:
-            app = self.properties["app"]
-            doc_url = app.documentation_url
-            return str(doc_url)
 
-        return None
+class CommandIndexDiff(object):
+    """The commands added, removed and changed between two command indexes."""
+
+    def __init__(self, added, removed, changed):
+        """
+        :param list added: The new `AppCommand` objects.
+        :param list removed: The `AppCommand` objects which are gone.
+        :param list changed: The `AppCommand` objects of the new index whose
+            menu entry or shelf tool changed.
+        """
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
 
-    def get_type(self):
-        return self.properties.get("type", "default")
+
+def diff_command_indexes(old_index, new_index):
+    """Compares the commands of two command indexes.
+
+    :param old_index: The `CommandIndex` before a context change, or None.
+    :param new_index: The `CommandIndex` after the context change.
+    :returns: A `CommandIndexDiff`. Every command is added when there is no
+        old index.
+    """
+    old_commands = old_index.commands_by_id if old_index else {}
+    new_commands = new_index.commands_by_id
+
+    added = []
+    changed = []
+    for cmd_id, cmd in new_commands.items():
+        old_cmd = old_commands.get(cmd_id)
+        if old_cmd is None:
+            added.append(cmd)
+        elif old_cmd.get_signature() != cmd.get_signature():
+            changed.append(cmd)
+    removed = [
+        cmd for (cmd_id, cmd) in old_commands.items() if cmd_id not in new_commands
+    ]
+    return CommandIndexDiff(added, removed, changed)
+
+
+def get_command_index(engine):
+    """Returns the `CommandIndex` of the engine, building it if the context
+    changed or commands were registered since it was built.
+
+    :param engine: The engine to return the command index for.
+    """
+    index = getattr(engine, "_command_index", None)
+    if index is None or not index.is_current(engine):
+        index = CommandIndex(engine)
+        engine._command_index = index
+    else:
+        index.update_callbacks(engine)
+    return index
 
 
 def get_registered_commands(engine):
@@ -665,8 +1082,14 @@ def get_registered_commands(engine):
         "Jump to Flow Production Tracking"
         "Jump to File System"
     """
+    return list(get_command_index(engine).commands)
+
 
-    # ---- build a couple of "always present" commands
+def _get_builtin_commands(engine):
+    """Returns the "always present" commands as AppCommands.
+
+    :param engine: The engine to build the commands for.
+    """
 
     commands = []
 
@@ -684,6 +1107,7 @@ def get_registered_commands(engine):
             },
             "callback": lambda: _jump_to_sg(engine),
         },
+        engine=engine,
     )
 
     commands.append(jump_to_sg_cmd)
@@ -705,12 +1129,11 @@ def get_registered_commands(engine):
                 },
                 "callback": lambda: _jump_to_fs(engine),
             },
+            engine=engine,
         )
 
         commands.append(jump_to_fs_cmd)
 
-    for cmd_name, cmd_details in engine.commands.items():
-        commands.append(AppCommand(cmd_name, cmd_details))
     return commands
 
 
@@ -744,10 +1167,7 @@ def get_registered_panels(engine):
     :param engine: The engine to return registered panel commands for
     """
 
-    panels = []
-    for panel_name, panel_details in engine.panels.items():
-        panels.append(AppCommand(panel_name, panel_details))
-    return panels
+    return list(get_command_index(engine).panels)
 
 
 def get_wrapped_panel_widget(engine, widget_class, bundle, title):
@@ -879,6 +1299,130 @@ def _format_xml(xml):
     return formatted_xml
 
 
+def get_menu_name(use_short_menu_name):
+    """Returns the label of the top-level menu.
+
+    :param bool use_short_menu_name: The value of the use_short_menu_name
+        setting.
+    """
+    if use_short_menu_name:
+        return "FPTR"
+    return "Flow Production Tracking"
+
+
+def write_menu_xml(xml_path, menu_name):
+    """Writes the definition of the dynamic Shotgun menu.
+
+    The items of the menu are built by Houdini when the menu is opened, by
+    calling the running engine, so the definition only depends on the label of
+    the menu. This allows the launcher to write it before Houdini starts.
+
+    :param xml_path: The path to the xml file to store the menu definitions
+    :param menu_name: The label of the top-level menu.
+    :returns: True if the file was written, False if it was up to date.
+
+    """
+    # documentation on the dynamic menu xml tags can be found here:
+    # http://www.sidefx.com/docs/houdini15.0/basics/config_menus
+
+    # build the Shotgun menu
+    root, shotgun_menu = _build_shotgun_menu_item(menu_name)
+
+    # add the context menu
+    context_menu = _menu_node(shotgun_menu, "Current Context", "tk.context.menu")
+    ET.SubElement(shotgun_menu, "separatorItem")
+
+    context_dynamic_menu = ET.SubElement(context_menu, "scriptMenuStripDynamic")
+    context_dynamic_menu.set("id", "tk.context_dynamic_menu")
+
+    # here we build an element that stores a python script for returning
+    # the ids and names of context menu items. the code is executed each
+    # time the menu is built.
+    context_dynamic_menu_contents = ET.SubElement(
+        context_dynamic_menu, "contentsScriptCode"
+    )
+    context_dynamic_menu_contents.text = (
+        "CDATA_START"
+        + entry_points.get_menu_items_script(entry_points.CONTEXT_MENU)
+        + "CDATA_END"
+    )
+
+    # this element defines a python script that has access to the id of the
+    # menu selected by the user (as defined in the previous element).  this
+    # script uses the id to determine the command and callback execute.
+    context_dynamic_menu_script = ET.SubElement(context_dynamic_menu, "scriptCode")
+    context_dynamic_menu_script.text = (
+        "CDATA_START" + entry_points.get_menu_command_script() + "CDATA_END"
+    )
+
+    main_dynamic_menu = ET.SubElement(shotgun_menu, "scriptMenuStripDynamic")
+    main_dynamic_menu.set("id", "tk.main_dynamic_menu")
+
+    # similar to the dynamic context menu. this time we format the python
+    # script to call the method to return the app specific commands.
+    main_dynamic_menu_contents = ET.SubElement(main_dynamic_menu, "contentsScriptCode")
+    main_dynamic_menu_contents.text = (
+        "CDATA_START"
+        + entry_points.get_menu_items_script(entry_points.APPS_MENU)
+        + "CDATA_END"
+    )
+
+    # same script as the context menu for mapping ids to callbacks for
+    # execution
+    main_dynamic_menu_script = ET.SubElement(main_dynamic_menu, "scriptCode")
+    main_dynamic_menu_script.text = (
+        "CDATA_START" + entry_points.get_menu_command_script() + "CDATA_END"
+    )
+
+    # format the xml and write it to disk. Houdini may be reading the file
+    # already, e.g. when the launcher wrote it, so leave it alone when it is
+    # up to date.
+    xml = _format_xml(ET.tostring(root).decode("utf-8"))
+    if os.path.isfile(xml_path):
+        with open(xml_path, "r", encoding="utf-8") as xml_file_handle:
+            if xml_file_handle.read() == xml:
+                return False
+    _write_xml(xml, xml_path)
+    return True
+
+
+def _build_shotgun_menu_item(menu_name):
+    """Constructs a top-level "Flow Production Tracking" menu.
+
+    :param menu_name: The label of the menu.
+    :returns: tuple containing the root element and the shotgun menu item
+
+    """
+
+    root = ET.Element("mainMenu")
+    menubar = ET.SubElement(root, "menuBar")
+    shotgun_menu = _menu_node(
+        menubar,
+        menu_name,
+        "tk.shotgun",
+    )
+
+    insert_before = ET.SubElement(shotgun_menu, "insertBefore")
+    insert_before.text = "help_menu"
+
+    # make sure the Help menu still comes last
+    modify_item = ET.SubElement(menubar, "modifyItem")
+    modify_item.set("id", "help_menu")
+    ET.SubElement(modify_item, "insertAfter")
+
+    return (root, shotgun_menu)
+
+
+def _menu_node(parent, label, id):
+    """Constructs a submenu for the supplied parent."""
+
+    menu = ET.SubElement(parent, "subMenu")
+    menu.set("id", id)
+    node = ET.SubElement(menu, "label")
+    node.text = label
+    return menu
+
+
 def _on_file_change_timeout():
     """
     Checks to see if the current file has changed. If it has, try to set the
@@ -918,17 +1462,31 @@ def _on_file_change_timeout():
         engine_name = "tk-houdini"
         cur_context = None
 
-    try:
-        tk = sgtk.tank_from_path(cur_file)
-    except sgtk.TankError:
-        # Unable to get tk api instance from the path. won't be able to get a
-        # new context. if there is an engine running, destroy it.
-        if cur_engine:
-            cur_engine.destroy()
-        return
+    # the toolkit daemon started by the launcher keeps the toolkit instances
+    # and the templates of the pipeline configurations loaded.
+    resolved = None
+    socket_path = os.environ.get(bootstrap.g_toolkit_daemon_env)
+    if cur_engine and socket_path:
+        from . import toolkit_daemon
+
+        resolved = toolkit_daemon.resolve_context_from_path(
+            socket_path, cur_file, cur_engine
+        )
 
-    # get the new context from the file
-    new_context = tk.context_from_path(cur_file, cur_context)
+    if resolved:
+        tk, new_context = resolved
+    else:
+        try:
+            tk = sgtk.tank_from_path(cur_file)
+        except sgtk.TankError:
+            # Unable to get tk api instance from the path. won't be able to get a
+            # new context. if there is an engine running, destroy it.
+            if cur_engine:
+                cur_engine.destroy()
+            return
+
+        # get the new context from the file
+        new_context = tk.context_from_path(cur_file, cur_context)
 
     # if the contexts are the same, either the user has not changed context or
     # the context change has already been handled, for example by workfiles2
@@ -957,218 +1515,11 @@ def _write_xml(xml, xml_path):
     :param string xml: The xml to write to disk
     :param string xml_path: The path to write the xml.
 
-    Also ensures the directory exists before writing the file.
+    Also ensures the directory exists before writing the file. The file is
+    written to a temp file in the same directory which then replaces it: the
+    menu file of a stable temp directory is shared by the sessions of the
+    user, which must never read a partially written file.
 
     """
 
-    # ensure the directory exists
-    xml_dir = os.path.dirname(xml_path)
-    if not os.path.exists(xml_dir):
-        os.makedirs(xml_dir)
-
-    # write the xml file
-    with open(xml_path, "w") as xml_file_handle:
-        xml_file_handle.write(xml)
-
-
-# -----------------------------------------------------------------------------
-# template strings used to populate menu, shelf, and panel scripts
-
-# The code that executes when a shelf button is clicked.  This is pulled from
-# menu_action.py. Maybe there's a good way to share this rather than
-# duplicating the logic? TODO!!!
-_g_launch_script = """
-import hou
-import tank.platform.engine
-
-engine = tank.platform.engine.current_engine()
-if engine is None or not hasattr(engine, 'launch_command'):
-    msg = "Flow Production Tracking: Houdini engine is not loaded."
-    if hou.isUIAvailable():
-        hou.ui.displayMessage(msg)
-    else:
-        print(msg)
-else:
-    engine.launch_command('%s')
-"""
-
-# The code that is stored in the python panel interfaces.
-_g_panel_script = """
-from sgtk.platform.qt import QtCore, QtGui
-
-class NoPanelWidget(QtGui.QWidget):
-
-    def __init__(self, msg, error=None):
-
-        super().__init__()
-
-        sg_icon_path = '%s'
-        sg_icon = QtGui.QLabel()
-
-        try:
-            sg_pixmap = QtGui.QPixmap(sg_icon_path).scaledToWidth(64, QtCore.Qt.SmoothTransformation)
-            sg_icon.setPixmap(sg_pixmap)
-        except:
-            pass
-
-        msg_lbl = QtGui.QLabel(msg)
-        msg_lbl.setWordWrap(True)
-
-        if error:
-            error_txt = QtGui.QTextEdit(error)
-            error_txt.setReadOnly(True)
-
-        h_layout = QtGui.QHBoxLayout()
-        h_layout.setSpacing(5)
-        h_layout.addWidget(sg_icon)
-        h_layout.addWidget(msg_lbl)
-        h_layout.setStretchFactor(msg_lbl, 10)
-
-        v_layout = QtGui.QVBoxLayout(self)
-        v_layout.setContentsMargins(10, 10, 10, 10)
-        v_layout.setSpacing(15)
-        v_layout.addStretch()
-        v_layout.addLayout(h_layout)
-        if error:
-            v_layout.addWidget(error_txt)
-        v_layout.addStretch()
-
-def createInterface():
-
-    try:
-        import tank.platform.engine
-    except ImportError:
-        return NoPanelWidget(
-            "It looks like you're running Houdini outside of a PTR "
-            "context. Next time you launch Houdini from within a PTR "
-            "context, you will see the '%s' panel here."
-        )
-
-    try:
-        engine = tank.platform.engine.current_engine()
-        panel_info = engine.get_panel_info('%s')
-        panel_widget = engine.get_wrapped_panel_widget(
-            engine,
-            panel_info['widget_class'],
-            panel_info['bundle'],
-            panel_info['title'],
-        )
-        panel_widget.apply_stylesheet()
-    except Exception:
-        import traceback
-        return NoPanelWidget(
-            "There was a problem loading this panel! The error message "
-            "is provided below.",
-            error=traceback.format_exc()
-        )
-
-    pane_tab = kwargs["paneTab"]
-
-    # it appears that sometimes the pane_tab available here is not the one
-    # we're interested in. sometimes it is not set and sometimes it is a
-    # different tab all together. so just check to make sure it is set and
-    # make sure it has the 'setLabel' method available. that at least implies
-    # that it is a python panel
-    if pane_tab and hasattr(pane_tab, 'setLabel'):
-        title = panel_info.get('title')
-        if title:
-            pane_tab.setLabel(title)
-
-            # We're caching here based on title, because it's the
-            # bit of information we have that's reliably available
-            # from all of the various methods of showing this
-            # pane tab. We cache the pane tab's name so that if a
-            # second invokation of showing this particular panel is
-            # triggered, we just show that panel rather than opening
-            # a second instance.
-            engine._pane_cache[title] = pane_tab.name()
-
-    return panel_widget
-
-"""
-
-# this template is used when building the dynamic menu. it has one placeholder
-# for a method to return a list of commands. when executed, this code uses that
-# list of commands to populate the Shotgun menu in houdini. houdini expects a
-# list of the form [menu_id1, menu_label1, menu_id2, menu_label2, ...]. some
-# effort is made to recover gracefully from errors encountered when building
-# the dynamic menu. For additional information, see the houdini docs for the
-# dynamic menus: http://www.sidefx.com/docs/houdini15.0/basics/config_menus
-_g_dynamic_menu_names = """
-engine = None
-menu_items = []
-try:
-    import tank.platform.engine
-    engine = tank.platform.engine.current_engine()
-    if engine:
-        # the commands to display in this menu
-        cmds = engine._menu.%s()
-        # build the list that houdini expects
-        for cmd in cmds:
-            menu_items.extend([cmd.get_id(), cmd.name])
-    else:
-        menu_items.extend(["tk.houdini.menu.no.shotgun", "Toolkit is disabled - Click for details"])
-except Exception as e:
-    import traceback
-    error = traceback.format_exc()
-    if engine:
-        # store the exception on the menu object for display in the callback
-        engine._menu._menu_error = Exception(str(e) + ". " + error)
-    # just give houdini a special error item for the menu
-    menu_items.extend(
-        ["tk.houdini.menu.error", "Menu Error. Click for Details..."])
-else:
-    if engine:
-        engine._menu._menu_error = None
-finally:
-    return menu_items
-"""
-
-# this template is used when executing items in the dynamic menu. kwargs are
-# available when this runs to access the id selected by the user. the id is
-# used to map back to a callback for the associated command. For additional
-# information, see the houdini docs for the dynamic menus:
-# http://www.sidefx.com/docs/houdini15.0/basics/config_menus
-_g_dynamic_menu_script = """
-import hou
-engine = None
-try:
-    import tank.platform.engine
-    # get the selected menu id
-    command_id = kwargs["selectedtoken"]
-    engine = tank.platform.engine.current_engine()
-    # special id if there is no shotgun context/engine
-    if command_id == "tk.houdini.menu.no.shotgun":
-        msg = (
-            "It appears as though you are not currently working in a PTR "
-            "context. There is no PTR for Houdini Engine running so no "
-            "menu or shelf items are available. In order to restart the PTR "
-            "integration, please close and reopen Houdini or choose a file "
-            "from your PTR project in the 'Recent Files' menu. If you "
-            "believe this to be an error, please contact your support team."
-        )
-        hou.ui.displayMessage(msg, severity=hou.severityType.Warning)
-    # special id if errors occurred and they clicked for more info
-    if command_id == "tk.houdini.menu.error":
-        # try to locate the exception on the menu object and raise it
-        if engine._menu._menu_error:
-            raise engine._menu._menu_error
-        # no stored exception, tell the user to look in the shell
-        else:
-            raise Exception("The error message should show up in your shell.")
-    # the special context item. launch the context in browser
-    if command_id == engine._menu._context_menu_item_id:
-        from tank.platform.qt import QtCore, QtGui
-        url = engine.context.shotgun_url
-        QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
-    # should be a registered command. launch it
-    else:
-        engine.launch_command(command_id)
-except Exception as e:
-    # handle any exceptions raised during menu building
-    msg = "An error occurred building the PTR menu...\\n\\n%s" % (e,)
-    if engine:
-        hou.ui.displayMessage(msg, severity=hou.severityType.Error)
-    else:
-        print(msg)
-"""
+    cache_utils.atomic_write(xml_path, xml)
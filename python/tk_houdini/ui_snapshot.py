@@ -0,0 +1,194 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+In memory cache of the UI state prepared for the contexts of a session.
+
+Artists switch back and forth between a few tasks. When the engine switches
+context, the state the menu and shelf were built from for the previous context
+is kept, so switching back to it swaps the state in rather than computing it
+again.
+"""
+
+import collections
+import time
+
+from . import cache_utils
+
+# Number of contexts whose UI state is kept.
+DEFAULT_MAX_COUNT = 8
+
+# How long the UI state of a context is kept, in seconds.
+DEFAULT_MAX_AGE = 3600
+
+
+class UISnapshot(object):
+    """
+    The UI state prepared for a context.
+    """
+
+    def __init__(self, index):
+        """
+        :param index: The `CommandIndex` of the context, holding the commands
+            and the callback map.
+        """
+        self.index = index
+        self.created = time.time()
+        # (context commands, commands by app, favourite commands), see
+        # AppCommandsUI._group_commands
+        self.grouped_commands = None
+        # the items of the dynamic menus by menu name, and the id of the
+        # context item
+        self.menu_items = None
+        self.context_menu_item_id = None
+        # the shelf document, as utf-8 encoded xml
+        self.shelf_xml = None
+
+
+class UISnapshotCache(object):
+    """
+    The snapshots of the contexts used most recently.
+
+    A snapshot is dropped once it is older than the maximum age, or when the
+    apps or the registered commands of the engine changed since it was taken.
+    """
+
+    def __init__(self, max_count=DEFAULT_MAX_COUNT, max_age=DEFAULT_MAX_AGE):
+        """
+        :param int max_count: Number of snapshots kept. 0 disables the cache.
+        :param float max_age: How long a snapshot is kept, in seconds.
+        """
+        self._max_count = max_count
+        self._max_age = max_age
+        # context keys to snapshots, the most recently used last
+        self._snapshots = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def get(self, context, command_set_hash):
+        """
+        Returns the snapshot of a context.
+
+        :param context: The context.
+        :param str command_set_hash: The hash of the current apps and
+            commands of the engine, see `get_command_set_hash`.
+        :returns: A `UISnapshot` or None if there is no valid snapshot.
+        """
+        key = get_context_key(context)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+
+        if (
+            self._is_expired(snapshot, time.time())
+            or snapshot.index.command_set_hash != command_set_hash
+        ):
+            del self._snapshots[key]
+            return None
+
+        self._snapshots.move_to_end(key)
+        return snapshot
+
+    def put(self, context, snapshot):
+        """
+        Stores the snapshot of a context, evicting the expired snapshots and
+        the least recently used ones.
+
+        :param context: The context.
+        :param snapshot: A `UISnapshot`.
+        """
+        if not self._max_count:
+            return
+
+        key = get_context_key(context)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+
+        now = time.time()
+        for expired_key in [
+            key
+            for (key, snapshot) in self._snapshots.items()
+            if self._is_expired(snapshot, now)
+        ]:
+            del self._snapshots[expired_key]
+        while len(self._snapshots) > self._max_count:
+            self._snapshots.popitem(last=False)
+
+    def clear(self):
+        """
+        Drops all the snapshots.
+        """
+        self._snapshots.clear()
+
+    def _is_expired(self, snapshot, now):
+        """
+        Whether a snapshot is older than the maximum age.
+        """
+        return now - snapshot.created > self._max_age
+
+
+def get_context_key(context):
+    """
+    Returns the key of a context in the cache.
+
+    :param context: A context.
+    :returns: A hex digest.
+    :rtype: str
+    """
+    return cache_utils.hash_data(context.to_dict())
+
+
+def get_command_set_hash(engine):
+    """
+    Returns a hash of the apps and of the registered commands and panels of an
+    engine.
+
+    The commands and panels are identified by their names and properties, which
+    is what the UI is built from. Their callbacks are left out: a command
+    registered again by an app has a new callback, which is bound to the
+    command index again, see `CommandIndex.update_callbacks`.
+
+    :param engine: The engine.
+    :returns: A hex digest.
+    :rtype: str
+    """
+    return cache_utils.hash_data(
+        {
+            "apps": sorted((name, app.version) for (name, app) in engine.apps.items()),
+            "commands": sorted(
+                (name, _get_properties_data(details["properties"]))
+                for (name, details) in engine.commands.items()
+            ),
+            "panels": sorted(
+                (name, _get_properties_data(details.get("properties", {})))
+                for (name, details) in engine.panels.items()
+            ),
+        }
+    )
+
+
+def _get_properties_data(properties):
+    """
+    Returns the properties of a command as json serializable data. The app of
+    the command is identified by its instance name, and the values which can't
+    be serialized, e.g. callables, by their type.
+
+    :param dict properties: The properties of a registered command.
+    :rtype: dict
+    """
+    data = {}
+    for key, value in properties.items():
+        if key == "app":
+            value = value.instance_name
+        elif not isinstance(value, (str, int, float, bool, list, tuple, dict)):
+            value = None if value is None else type(value).__name__
+        data[key] = value
+    return data
@@ -0,0 +1,464 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Pool of hython processes with the engine already started, running the jobs
+sent to a local Unix socket. Farm and automation tasks then skip the engine
+bootstrap.
+
+The pool is started from an environment prepared by the launcher, e.g. with the
+env of :func:`bootstrap.get_classic_startup_env`, so each hython process starts
+the engine when it is launched::
+
+    python worker_pool.py serve --socket /tmp/tk-houdini.sock --workers 4
+
+Jobs are sent with :func:`submit_job`. A job is a dictionary with the optional
+keys:
+
+- ``id``: Returned as is in the response.
+- ``context``: A serialized toolkit context the engine switches to.
+- ``hip_file``: The hip file to open.
+- ``hook``: A hook expression, e.g. ``{config}/farm/export.py``, executed with
+  the engine.
+- ``method``: The hook method to execute. Defaults to ``execute``.
+- ``kwargs``: The keyword arguments of the hook method.
+- ``save_as``: Where to save the hip file once the hook has been executed.
+
+The response is a dictionary with the keys ``id``, ``success``, ``result``,
+``error``, ``hip_file`` and ``worker``, the pid of the process which ran the
+job. The scene is cleared before each job.
+
+This module only imports the standard library at the top, so the pool can be
+served by any python interpreter.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+logger = logging.getLogger("sgtk.ext.tk-houdini.worker_pool")
+
+# Number of jobs a worker runs before it is replaced by a new process, which
+# bounds the memory leaked by the jobs. 0 means no limit.
+DEFAULT_MAX_JOBS = 100
+
+# How long a worker waits for the job sent by a client, in seconds.
+_REQUEST_TIMEOUT = 60.0
+
+# Code run by hython to start a worker. The path to the python folder of the
+# engine is inserted in it.
+_WORKER_CODE = (
+    "import sys; sys.path.insert(0, %r); "
+    "from tk_houdini import worker_pool; "
+    "sys.exit(worker_pool.main(sys.argv[1:]))"
+)
+
+
+class Worker(object):
+    """
+    Runs the jobs accepted on a listening socket, one connection per job.
+
+    Several workers can accept on the same socket, the jobs are then spread
+    between them by the operating system.
+    """
+
+    def __init__(self, max_jobs=DEFAULT_MAX_JOBS):
+        """
+        :param int max_jobs: Number of jobs to run before returning from
+            :meth:`serve`. 0 means no limit.
+        """
+        self._max_jobs = max_jobs
+        self._engine = None
+
+    def start_engine(self):
+        """
+        Returns the current engine, starting it with the classic bootstrap if
+        the environment describes one and it isn't started yet.
+
+        :returns: The engine or None if toolkit isn't available.
+        """
+        if self._engine is not None:
+            return self._engine
+
+        try:
+            import sgtk
+        except ImportError:
+            logger.debug("Toolkit is not available, jobs can't use the engine.")
+            return None
+
+        if sgtk.platform.current_engine() is None:
+            from . import bootstrap
+
+            if bootstrap.g_sgtk_engine_env in os.environ:
+                bootstrap.bootstrap_classic()
+        self._engine = sgtk.platform.current_engine()
+        return self._engine
+
+    def serve(self, listening_socket):
+        """
+        Runs the jobs sent to a socket.
+
+        :param listening_socket: A listening Unix socket.
+        :returns: The number of jobs run.
+        """
+        job_count = 0
+        while not self._max_jobs or job_count < self._max_jobs:
+            try:
+                connection, _ = listening_socket.accept()
+            except OSError:
+                # the socket was closed
+                break
+            with connection:
+                job_count += self._handle_connection(connection)
+        return job_count
+
+    def run_job(self, job):
+        """
+        Runs a job in a cleared scene.
+
+        :param dict job: The job, see the module documentation.
+        :returns: The response.
+        """
+        import hou
+
+        response = {
+            "id": job.get("id"),
+            "success": False,
+            "result": None,
+            "error": None,
+            "hip_file": None,
+            "worker": os.getpid(),
+        }
+        start = time.time()
+        try:
+            hou.hipFile.clear(suppress_save_prompt=True)
+
+            engine = None
+            if job.get("context") or job.get("hook"):
+                engine = self.start_engine()
+                if engine is None:
+                    raise RuntimeError("The engine is not started in this worker.")
+
+            if job.get("context"):
+                context = self._deserialize_context(job["context"])
+                if context != engine.context:
+                    self._change_context(context)
+                    engine = self._engine = self._get_current_engine()
+
+            if job.get("hip_file"):
+                hou.hipFile.load(
+                    job["hip_file"],
+                    suppress_save_prompt=True,
+                    ignore_load_warnings=True,
+                )
+
+            if job.get("hook"):
+                response["result"] = engine.execute_hook_expression(
+                    job["hook"], job.get("method", "execute"), **job.get("kwargs", {})
+                )
+
+            if job.get("save_as"):
+                hou.hipFile.save(job["save_as"], save_to_recent_files=False)
+
+            response["hip_file"] = hou.hipFile.path()
+            response["success"] = True
+        except Exception as e:
+            response["error"] = "%s\n%s" % (e, traceback.format_exc())
+            logger.error("Job %s failed: %s" % (job.get("id"), e))
+
+        logger.debug("Job %s ran in %.2fs" % (job.get("id"), time.time() - start))
+        return response
+
+    def _handle_connection(self, connection):
+        """
+        Reads a job from a connection, runs it and sends the response.
+
+        :returns: 1 if a job was run, 0 otherwise.
+        """
+        connection.settimeout(_REQUEST_TIMEOUT)
+        try:
+            with connection.makefile("rb") as request_file:
+                job = json.loads(request_file.readline().decode("utf-8"))
+            if not isinstance(job, dict):
+                raise ValueError("A job must be a dictionary.")
+        except (OSError, ValueError) as e:
+            logger.debug("Invalid job request: %s" % (e,))
+            try:
+                send_message(connection, {"success": False, "error": str(e)})
+            except OSError:
+                pass
+            return 0
+
+        response = self.run_job(job)
+        try:
+            send_message(connection, response)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug("Unable to send the response of job %s: %s" % (job, e))
+        return 1
+
+    def _deserialize_context(self, serialized_context):
+        """
+        Returns the context of a job.
+        """
+        import sgtk
+
+        return sgtk.context.deserialize(serialized_context)
+
+    def _change_context(self, context):
+        """
+        Switches the engine to the context of a job.
+        """
+        import sgtk
+
+        sgtk.platform.change_context(context)
+
+    def _get_current_engine(self):
+        """
+        Returns the engine once the context changed, which may have restarted
+        it.
+        """
+        import sgtk
+
+        return sgtk.platform.current_engine()
+
+
+class WorkerPool(object):
+    """
+    Keeps a number of worker processes alive, all accepting the jobs sent to
+    the same socket.
+    """
+
+    def __init__(
+        self, socket_path, size, command=None, max_jobs=DEFAULT_MAX_JOBS, env=None
+    ):
+        """
+        :param str socket_path: Path to the Unix socket to listen on.
+        :param int size: Number of worker processes.
+        :param list command: Command starting a worker, the options of the
+            worker are appended to it. Defaults to running hython from PATH.
+        :param int max_jobs: Number of jobs a worker runs before it is replaced.
+        :param dict env: Environment of the worker processes. Defaults to the
+            current environment.
+        """
+        self._socket_path = socket_path
+        self._size = size
+        self._command = command or get_worker_command("hython")
+        self._max_jobs = max_jobs
+        self._env = env
+        self._socket = None
+        self._processes = []
+        self._stopped = threading.Event()
+
+    @property
+    def socket_path(self):
+        """
+        Path to the Unix socket the jobs are sent to.
+        """
+        return self._socket_path
+
+    def start(self):
+        """
+        Listens on the socket and starts the worker processes.
+
+        The jobs run hooks with the credentials of the current user, so only
+        the current user can connect to the socket: it is bound in a private
+        folder and restricted to the current user before it is moved to its
+        path.
+
+        :raises RuntimeError: If another pool is listening on the socket.
+        """
+        if os.path.exists(self._socket_path):
+            if _is_listening(self._socket_path):
+                raise RuntimeError(
+                    "A worker pool is already listening on %s" % self._socket_path
+                )
+            # left over by a pool which didn't stop cleanly
+            os.remove(self._socket_path)
+
+        private_folder = tempfile.mkdtemp(
+            prefix=".tk-houdini-pool-", dir=os.path.dirname(self._socket_path) or None
+        )
+        try:
+            private_path = os.path.join(private_folder, "pool.sock")
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.bind(private_path)
+            os.chmod(private_path, 0o600)
+            os.rename(private_path, self._socket_path)
+        finally:
+            os.rmdir(private_folder)
+        self._socket.listen(self._size * 4)
+        self._socket.set_inheritable(True)
+
+        self._processes = [self._start_worker() for _ in range(self._size)]
+        logger.info(
+            "Started %d workers listening on %s" % (self._size, self._socket_path)
+        )
+
+    def run(self, poll_interval=1.0):
+        """
+        Replaces the workers which exit until :meth:`stop` is called.
+
+        :param float poll_interval: How often the workers are checked, in
+            seconds.
+        """
+        while not self._stopped.wait(poll_interval):
+            for i, process in enumerate(self._processes):
+                if process.poll() is not None:
+                    logger.debug(
+                        "Worker %d exited with code %s, replacing it."
+                        % (process.pid, process.returncode)
+                    )
+                    self._processes[i] = self._start_worker()
+
+    def stop(self):
+        """
+        Stops the workers and closes the socket.
+        """
+        self._stopped.set()
+        for process in self._processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes = []
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+    def _start_worker(self):
+        """
+        Starts a worker process sharing the listening socket.
+        """
+        fd = self._socket.fileno()
+        return subprocess.Popen(
+            self._command
+            + ["worker", "--fd", str(fd), "--max-jobs", str(self._max_jobs)],
+            pass_fds=(fd,),
+            env=self._env,
+        )
+
+
+def get_worker_command(hython_path):
+    """
+    Returns the command starting a worker with hython.
+
+    :param str hython_path: Path to the hython executable.
+    :returns: A list of arguments.
+    """
+    python_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return [hython_path, "-c", _WORKER_CODE % python_path]
+
+
+def submit_job(socket_path, job, timeout=None):
+    """
+    Sends a job to a worker pool and waits for its response.
+
+    :param str socket_path: Path to the socket of the pool.
+    :param dict job: The job, see the module documentation.
+    :param float timeout: How long to wait for the response, in seconds. Waits
+        indefinitely by default.
+    :returns: The response dictionary.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        send_message(client, job)
+        with client.makefile("rb") as response_file:
+            response = response_file.readline()
+    if not response:
+        raise RuntimeError("The worker closed the connection without a response.")
+    return json.loads(response.decode("utf-8"))
+
+
+def _is_listening(socket_path):
+    """
+    Checks whether a process accepts connections on a Unix socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(1.0)
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def send_message(connection, message):
+    """
+    Sends a dictionary as a line of json. Values which can't be serialized,
+    e.g. the objects returned by a hook, are sent as their representation.
+    """
+    data = json.dumps(message, default=repr) + "\n"
+    connection.sendall(data.encode("utf-8"))
+
+
+def main(argv=None):
+    """
+    Command line entry point, serving a pool or running a worker.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve a worker pool.")
+    serve_parser.add_argument("--socket", required=True, help="Path to the socket.")
+    serve_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    serve_parser.add_argument("--hython", default="hython", help="hython to run.")
+    serve_parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS)
+
+    worker_parser = subparsers.add_parser("worker", help="Run a worker.")
+    worker_parser.add_argument("--fd", type=int, required=True)
+    worker_parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.mode == "worker":
+        listening_socket = socket.socket(fileno=args.fd)
+        worker = Worker(args.max_jobs)
+        worker.start_engine()
+        worker.serve(listening_socket)
+        return 0
+
+    pool = WorkerPool(
+        args.socket,
+        args.workers,
+        command=get_worker_command(args.hython),
+        max_jobs=args.max_jobs,
+    )
+    try:
+        pool.start()
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+    try:
+        pool.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Packs the python packages of the engine into a zip archive imported with
+zipimport.
+
+When the engine is installed on a network file system, every import made in a
+Houdini session first looks up the engine python folders, which costs a few
+network round trips each. The startup pythonrc.py files put the archive on
+sys.path instead of the folders when it was validated, so the bootstrap
+packages are read from a single file opened once. The engine itself is
+imported by toolkit from the folders once it starts, the archive only covers
+the code run before.
+
+The archive holds precompiled bytecode, so it must be built by the python of
+the Houdini version it is used with, e.g. when deploying the engine::
+
+    hython python/tk_houdini/zip_bundle.py --benchmark
+
+An archive is specific to a python version and is written in the engine root
+folder. It is a snapshot of the packages and records a signature of the sources
+it was built from, their paths, sizes and modification times.
+
+The archive is validated when the engine is deployed, not at startup: building
+it, or checking it against the current sources with::
+
+    hython python/tk_houdini/zip_bundle.py --check
+
+writes a stamp file next to it, holding the size and modification time of the
+validated archive. The startup files only use an archive whose stamp matches,
+which costs them a read and a stat. The check must run again when the packages
+are updated in place, it removes the stamp of an archive which is out of date.
+Setting TK_HOUDINI_ZIP_BUNDLE to 0 disables the archive.
+
+This module only depends on the standard library so it can be run as a script.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import py_compile
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+import zipimport
+
+logger = logging.getLogger("sgtk.ext.tk-houdini.zip_bundle")
+
+# Name of the env variable which, when set to "0", makes the startup files
+# ignore the archive. Matches the name used by the pythonrc.py files.
+BUNDLE_ENV = "TK_HOUDINI_ZIP_BUNDLE"
+
+# Name of the archive in the engine root folder, for a python major and minor
+# version. Matches the name used by the pythonrc.py files.
+BUNDLE_NAME_FORMAT = "tk-houdini-py%d%d.zip"
+
+# Entry of the archive holding the signature of the sources it was built from.
+SIGNATURE_NAME = "tk-houdini-sources.sha1"
+
+# Extension of the stamp file of a validated archive, appended to its path.
+# Matches the name used by the pythonrc.py files.
+STAMP_EXTENSION = ".stamp"
+
+# Folders containing the packages to pack, relative to the engine root, and the
+# names of the packages.
+BUNDLED_PACKAGES = [
+    ("python", "tk_houdini"),
+    ("python", "flowam"),
+    (os.path.join("plugins", "basic", "python"), "tk_houdini_basic"),
+]
+
+# Modules imported by the benchmark. They don't need hou nor toolkit.
+BENCHMARK_MODULES = [
+    "tk_houdini",
+    "tk_houdini.bootstrap",
+    "tk_houdini.startup_timeline",
+    "tk_houdini_basic.bootstrap_cache",
+    "flowam",
+]
+
+# Code timing the imports of the benchmark in a new interpreter.
+_BENCHMARK_CODE = """
+import sys, time
+sys.path[:0] = %r
+start = time.perf_counter()
+for name in %r:
+    __import__(name)
+print(time.perf_counter() - start)
+"""
+
+# Timestamp of the archive entries, fixed so a build is reproducible.
+_ENTRY_DATE_TIME = (2020, 1, 1, 0, 0, 0)
+
+
+def get_engine_root_path():
+    """
+    Returns the path to the engine root folder, two levels up from this file.
+    """
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def get_bundle_path(engine_root_path, version_info=None):
+    """
+    Returns the path to the archive of the engine for a python version.
+
+    :param str engine_root_path: Path to the engine root folder.
+    :param version_info: The python version, defaults to the running one.
+    :returns: The path to the archive.
+    """
+    version_info = version_info or sys.version_info
+    return os.path.join(
+        engine_root_path, BUNDLE_NAME_FORMAT % (version_info[0], version_info[1])
+    )
+
+
+def build_bundle(engine_root_path, bundle_path=None, optimize=-1):
+    """
+    Writes the archive of the engine packages for the running python.
+
+    Each module is stored with its source, so tracebacks can show it, and with
+    its bytecode. The bytecode is not checked against the source by python, the
+    archive records the signature of the sources instead, see
+    :func:`get_source_signature`.
+
+    :param str engine_root_path: Path to the engine root folder.
+    :param str bundle_path: Path to the archive. Defaults to
+        :func:`get_bundle_path`.
+    :param int optimize: The optimization level of the bytecode, see
+        :func:`compile`.
+    :returns: The path to the archive.
+    """
+    bundle_path = bundle_path or get_bundle_path(engine_root_path)
+    tmp_path = "%s.%d.tmp" % (bundle_path, os.getpid())
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir, zipfile.ZipFile(
+            tmp_path, "w", zipfile.ZIP_STORED
+        ) as bundle:
+            cfile = os.path.join(tmp_dir, "module.pyc")
+            for source_path, arcname in _iter_sources(engine_root_path):
+                py_compile.compile(
+                    source_path,
+                    cfile=cfile,
+                    dfile=os.path.join(bundle_path, arcname),
+                    doraise=True,
+                    optimize=optimize,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+                with open(source_path, "rb") as source_file:
+                    _write_entry(bundle, arcname, source_file.read())
+                with open(cfile, "rb") as bytecode_file:
+                    _write_entry(bundle, arcname + "c", bytecode_file.read())
+            _write_entry(
+                bundle,
+                SIGNATURE_NAME,
+                get_source_signature(engine_root_path).encode("ascii"),
+            )
+        os.replace(tmp_path, bundle_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    write_stamp(bundle_path)
+    return bundle_path
+
+
+def check_bundle(engine_root_path, bundle_path=None):
+    """
+    Validates an archive against the current sources of the packages, writing
+    its stamp if it is up to date and removing it otherwise.
+
+    :param str engine_root_path: Path to the engine root folder.
+    :param str bundle_path: Path to the archive. Defaults to
+        :func:`get_bundle_path`.
+    :returns: True if the archive can be used.
+    """
+    bundle_path = bundle_path or get_bundle_path(engine_root_path)
+    if is_bundle_current(engine_root_path, bundle_path):
+        write_stamp(bundle_path)
+        return True
+
+    stamp_path = bundle_path + STAMP_EXTENSION
+    if os.path.exists(stamp_path):
+        os.remove(stamp_path)
+    return False
+
+
+def write_stamp(bundle_path):
+    """
+    Writes the stamp of a validated archive, checked by the startup files.
+
+    :param str bundle_path: Path to the archive.
+    """
+    bundle_stat = os.stat(bundle_path)
+    with open(bundle_path + STAMP_EXTENSION, "w") as stamp_file:
+        stamp_file.write("%d %d\n" % (bundle_stat.st_size, bundle_stat.st_mtime_ns))
+
+
+def get_source_signature(engine_root_path):
+    """
+    Returns a hash of the paths, sizes and modification times of the python
+    files of the bundled packages.
+
+    :param str engine_root_path: Path to the engine root folder.
+    :returns: A hex digest.
+    :rtype: str
+    """
+    signature = hashlib.sha1()
+    for source_path, arcname in _iter_sources(engine_root_path):
+        source_stat = os.stat(source_path)
+        signature.update(
+            (
+                "%s:%d:%d\n" % (arcname, source_stat.st_size, source_stat.st_mtime_ns)
+            ).encode("utf-8")
+        )
+    return signature.hexdigest()
+
+
+def is_bundle_current(engine_root_path, bundle_path):
+    """
+    Checks whether an archive was built from the current sources of the
+    packages.
+
+    :param str engine_root_path: Path to the engine root folder.
+    :param str bundle_path: Path to the archive.
+    :returns: True if the archive can be used.
+    """
+    try:
+        bundle_signature = (
+            zipimport.zipimporter(bundle_path).get_data(SIGNATURE_NAME).decode("ascii")
+        )
+    except (OSError, zipimport.ZipImportError) as e:
+        logger.warning(
+            "Not using %s, it has no signature of its sources: %s" % (bundle_path, e)
+        )
+        return False
+
+    if bundle_signature != get_source_signature(engine_root_path):
+        logger.warning(
+            "Not using %s, the python packages changed since it was built. "
+            "Build it again or remove it." % bundle_path
+        )
+        return False
+
+    return True
+
+
+def benchmark(engine_root_path, bundle_path, modules=None, repeat=5, env=None):
+    """
+    Compares the time taken to import modules from the engine folders and from
+    the archive, each in a new interpreter.
+
+    :param str engine_root_path: Path to the engine root folder.
+    :param str bundle_path: Path to the archive.
+    :param list modules: The modules to import. Defaults to modules which don't
+        need hou nor toolkit.
+    :param int repeat: Number of runs of each import, the fastest is kept.
+    :param dict env: Environment of the interpreters.
+    :returns: A dictionary with the fastest import times, in seconds, for the
+        "folders" and "bundle" keys.
+    """
+    modules = modules or BENCHMARK_MODULES
+    folders = [
+        os.path.join(engine_root_path, folder)
+        for folder in sorted(set(folder for folder, _ in BUNDLED_PACKAGES))
+    ]
+    times = {}
+    for name, paths in (("folders", folders), ("bundle", [bundle_path])):
+        code = _BENCHMARK_CODE % (paths, modules)
+        times[name] = min(
+            float(
+                subprocess.check_output(
+                    # -B and -I: no bytecode written, no user site packages
+                    [sys.executable, "-B", "-I", "-c", code],
+                    env=env,
+                )
+            )
+            for _ in range(repeat)
+        )
+    return times
+
+
+def _iter_sources(engine_root_path):
+    """
+    Yields the paths to the python files of the bundled packages and their
+    paths in the archive.
+    """
+    for folder, package in BUNDLED_PACKAGES:
+        folder_path = os.path.join(engine_root_path, folder)
+        for dir_path, dir_names, file_names in os.walk(
+            os.path.join(folder_path, package)
+        ):
+            dir_names[:] = sorted(d for d in dir_names if d != "__pycache__")
+            for file_name in sorted(file_names):
+                if file_name.endswith(".py"):
+                    source_path = os.path.join(dir_path, file_name)
+                    arcname = os.path.relpath(source_path, folder_path)
+                    yield source_path, arcname.replace(os.sep, "/")
+
+
+def _write_entry(bundle, arcname, data):
+    """
+    Writes a file to the archive with a fixed timestamp.
+    """
+    bundle.writestr(zipfile.ZipInfo(arcname, _ENTRY_DATE_TIME), data)
+
+
+def main(argv=None):
+    """
+    Command line entry point building or checking the archive.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--output", help="Path to the archive to write.")
+    parser.add_argument(
+        "--optimize", type=int, default=-1, help="Bytecode optimization level."
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Compare the import times from the folders and from the archive.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check the archive against the sources instead of building it.",
+    )
+    args = parser.parse_args(argv)
+
+    engine_root_path = get_engine_root_path()
+    if args.check:
+        logging.basicConfig(level=logging.INFO)
+        bundle_path = args.output or get_bundle_path(engine_root_path)
+        if not check_bundle(engine_root_path, bundle_path):
+            return 1
+        print("%s is up to date" % bundle_path)
+        return 0
+
+    start = time.perf_counter()
+    bundle_path = build_bundle(engine_root_path, args.output, args.optimize)
+    print("Built %s in %.2fs" % (bundle_path, time.perf_counter() - start))
+
+    if args.benchmark:
+        times = benchmark(engine_root_path, bundle_path)
+        print(
+            "Import time from the folders: %.1fms, from the archive: %.1fms"
+            % (times["folders"] * 1000, times["bundle"] * 1000)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
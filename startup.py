@@ -8,8 +8,12 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import json
 import os
+import socket
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import sgtk
 from sgtk.platform import SoftwareLauncher, SoftwareVersion, LaunchInformation
@@ -100,6 +104,21 @@ class HoudiniLauncher(SoftwareLauncher):
 
         from tk_houdini import bootstrap
 
+        # By default, a new temp directory is created for each launch. When a
+        # stable temp directory is requested, use one per pipeline
+        # configuration and engine instance.
+        stable_temp_dir_id = None
+        if self.get_setting("stable_temp_dir"):
+            stable_temp_dir_id = "%s:%s" % (
+                self.sgtk.pipeline_configuration.get_path(),
+                self.engine_name,
+            )
+        temp_dir_root = self.get_setting("temp_dir_root") or None
+
+        # How the startup paths are added to the Houdini search path. When not
+        # set, the TK_HOUDINI_PATH_MODE env variable is used.
+        houdini_path_mode = self.get_setting("houdini_path_mode") or None
+
         # Check the engine settings to see whether any plugins have been
         # specified to load.
         launch_plugins = self.get_setting("launch_builtin_plugins")
@@ -108,11 +127,17 @@ class HoudiniLauncher(SoftwareLauncher):
             # Prepare the launch environment with variables required by the
             # plugin bootstrap.
             self.logger.debug("Launch plugins: %s" % (launch_plugins,))
-            required_env = bootstrap.get_plugin_startup_env(launch_plugins)
+            required_env = bootstrap.get_plugin_startup_env(
+                launch_plugins, stable_temp_dir_id, temp_dir_root, houdini_path_mode
+            )
 
             # Add context and site info
             required_env.update(self.get_standard_plugin_environment())
 
+            # Bootstrap the engine without blocking the Houdini UI
+            if self.get_setting("async_plugin_bootstrap"):
+                required_env[bootstrap.g_async_bootstrap_env] = "1"
+
         else:
 
             # pull the env var names from the bootstrap module
@@ -121,10 +146,44 @@ class HoudiniLauncher(SoftwareLauncher):
 
             # Prepare the launch environment with variables required by the
             # classic bootstrap.
-            required_env = bootstrap.get_classic_startup_env()
+            required_env = bootstrap.get_classic_startup_env(
+                stable_temp_dir_id, temp_dir_root, houdini_path_mode
+            )
             required_env[engine_env] = self.engine_name
             required_env[context_env] = sgtk.context.serialize(self.context)
 
+        # Hand the user and the contexts resolved by the toolkit daemon to the
+        # sessions, starting the daemon if needed.
+        if self.get_setting("toolkit_daemon"):
+            from tk_houdini import toolkit_daemon
+
+            socket_path = toolkit_daemon.ensure_daemon(
+                sgtk.get_authenticated_user(), self._get_daemon_interpreter(exec_path)
+            )
+            if socket_path:
+                required_env[bootstrap.g_toolkit_daemon_env] = socket_path
+
+        # The menu definition only depends on the menu settings, the menu items
+        # are built when the menu is opened. Write it before Houdini starts so
+        # it is already on the startup path, the engine leaves it alone when it
+        # is up to date instead of writing it and refreshing the startup path
+        # cache of Houdini.
+        if self.get_setting("enable_sg_menu"):
+            from tk_houdini import ui_generation
+
+            menu_file = os.path.join(
+                required_env[bootstrap.g_temp_env], "MainMenuCommon.xml"
+            )
+            try:
+                ui_generation.write_menu_xml(
+                    menu_file,
+                    ui_generation.get_menu_name(
+                        self.get_setting("use_short_menu_name")
+                    ),
+                )
+            except (IOError, OSError) as e:
+                self.logger.debug("Unable to write %s: %s" % (menu_file, e))
+
         if file_to_open:
             # If we have a file to open, add it to the end of the args so Houdini opens the file.
             args = " ".join([args, file_to_open])
@@ -154,6 +213,43 @@ class HoudiniLauncher(SoftwareLauncher):
 
         return supported_sw_versions
 
+    def _get_daemon_interpreter(self, exec_path):
+        """
+        Returns the path to the Python interpreter running the toolkit daemon:
+        the one of the toolkit_daemon_interpreter setting, or the one shipped
+        with the Houdini being launched.
+
+        :param str exec_path: Path to the Houdini executable.
+        :returns: The path to the interpreter, or None if there isn't one.
+        """
+        interpreter = self.get_setting("toolkit_daemon_interpreter")
+        if interpreter:
+            return os.path.expanduser(os.path.expandvars(interpreter))
+
+        if sgtk.util.is_macos():
+            # /Applications/Houdini/Houdini20.0.506/Frameworks/Python.framework
+            bin_dir = os.path.join(
+                os.path.dirname(exec_path),
+                "Frameworks",
+                "Python.framework",
+                "Versions",
+                "Current",
+                "bin",
+            )
+        elif sgtk.util.is_linux():
+            # /opt/hfs20.0.506/python/bin
+            bin_dir = os.path.join(
+                os.path.dirname(os.path.dirname(exec_path)), "python", "bin"
+            )
+        else:
+            return None
+
+        for name in ("python3", "python"):
+            interpreter = os.path.join(bin_dir, name)
+            if os.path.isfile(interpreter):
+                return interpreter
+        return None
+
     def _find_software(self):
 
         # use the bundled engine icon
@@ -174,13 +270,13 @@ class HoudiniLauncher(SoftwareLauncher):
         # all the discovered executables
         sw_versions = []
 
+        template_matches = self._glob_templates(executable_templates)
+
         for executable_template in executable_templates:
 
             self.logger.debug("Processing template %s.", executable_template)
 
-            executable_matches = self._glob_and_match(
-                executable_template, self.COMPONENT_REGEX_LOOKUP
-            )
+            executable_matches = template_matches[executable_template]
 
             # Extract all products from that executable.
             for executable_path, key_dict in executable_matches:
@@ -218,3 +314,97 @@ class HoudiniLauncher(SoftwareLauncher):
                 )
 
         return sw_versions
+
+    def _glob_templates(self, executable_templates):
+        """
+        Globs the executable templates concurrently, reusing the matches of the
+        previous scan for the templates whose install folder didn't change.
+
+        The matches are cached per host in the toolkit cache folder. A cache
+        entry is keyed by the modification time of the folder the installs of
+        a template are created in, e.g. /opt for /opt/hfs{version}, which
+        changes when an install is added or removed. Changes made inside an
+        existing install folder are not detected.
+
+        :param list executable_templates: The executable templates to glob.
+        :returns: A dictionary of templates to the list of (path, key_dict)
+            tuples returned by :meth:`_glob_and_match`.
+        """
+        cache_path = os.path.join(
+            sgtk.util.LocalFileStorageManager.get_global_root(
+                sgtk.util.LocalFileStorageManager.CACHE
+            ),
+            "tk-houdini",
+            "launcher",
+            "software-%s.json" % (socket.gethostname(),),
+        )
+        try:
+            with open(cache_path, "r") as cache_file:
+                cache = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+
+        template_matches = {}
+        templates_to_glob = []
+        for executable_template in executable_templates:
+            # stat the install folder before globbing, so an install added
+            # while globbing is found by the next scan.
+            key = self._get_install_folder_key(executable_template)
+            entry = cache.get(executable_template)
+            if entry and entry.get("key") == key:
+                self.logger.debug(
+                    "Using cached matches for template %s.", executable_template
+                )
+                template_matches[executable_template] = [
+                    (executable_path, key_dict)
+                    for (executable_path, key_dict) in entry["matches"]
+                ]
+            else:
+                templates_to_glob.append((executable_template, key))
+
+        if not templates_to_glob:
+            return template_matches
+
+        # the install folders can be on slow automounts, glob them concurrently
+        with ThreadPoolExecutor(max_workers=len(templates_to_glob)) as executor:
+            results = executor.map(
+                lambda template_key: self._glob_and_match(
+                    template_key[0], self.COMPONENT_REGEX_LOOKUP
+                ),
+                templates_to_glob,
+            )
+            for (executable_template, key), matches in zip(templates_to_glob, results):
+                template_matches[executable_template] = matches
+                cache[executable_template] = {"key": key, "matches": matches}
+
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(cache_path))
+            handle, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(cache_path), prefix=".software-"
+            )
+            with os.fdopen(handle, "w") as tmp_file:
+                json.dump(cache, tmp_file)
+            os.replace(tmp_path, cache_path)
+        except (IOError, OSError) as e:
+            self.logger.debug("Unable to write %s: %s" % (cache_path, e))
+
+        return template_matches
+
+    def _get_install_folder_key(self, executable_template):
+        """
+        Returns the cache key of an executable template: the folder the
+        installs are created in and its modification time.
+
+        :param str executable_template: An executable template.
+        :returns: A list of the folder and its modification time, None if the
+            folder doesn't exist.
+        """
+        # the folder containing the first variable component of the template
+        install_folder = os.path.dirname(executable_template.split("{", 1)[0])
+        try:
+            mtime = os.stat(install_folder).st_mtime
+        except OSError:
+            mtime = None
+        return [install_folder, mtime]
@@ -13,9 +13,16 @@ Hook which chooses an environment file to use based on the current context.
 This file is almost always overridden by a configuration.
 """
 
+import os
+
 from tank import get_hook_baseclass
 
 
 class PickEnvironment(get_hook_baseclass()):
     def execute(self, context, **kwargs):
+        # the sessions using an app profile load the apps of its environment,
+        # see TK_HOUDINI_APP_PROFILE in tk_houdini/bootstrap.py
+        app_profile = os.environ.get("TK_HOUDINI_APP_PROFILE")
+        if app_profile:
+            return app_profile
         return "task"
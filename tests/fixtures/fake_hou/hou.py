@@ -0,0 +1,196 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+A minimal stand-in for Houdini's hou module, for the tests which run outside of
+a Houdini session. Only what these tests need is implemented.
+"""
+
+
+class OperationFailed(Exception):
+    pass
+
+
+class NotAvailable(Exception):
+    pass
+
+
+_application_version = (20, 5, 613)
+
+
+def applicationVersion():
+    return _application_version
+
+
+def applicationVersionString():
+    return ".".join(str(v) for v in _application_version)
+
+
+def applicationName():
+    return "hython"
+
+
+def isUIAvailable():
+    return False
+
+
+class hipFile(object):
+    """Namespace mimicking hou.hipFile."""
+
+    _path = "untitled.hip"
+
+    @classmethod
+    def path(cls):
+        return cls._path
+
+    @classmethod
+    def name(cls):
+        return cls._path
+
+    @classmethod
+    def clear(cls, suppress_save_prompt=False):
+        cls._path = "untitled.hip"
+
+    @classmethod
+    def load(cls, file_path, suppress_save_prompt=False, ignore_load_warnings=False):
+        cls._path = file_path
+
+    @classmethod
+    def save(cls, file_name=None, save_to_recent_files=True):
+        if file_name:
+            cls._path = file_name
+
+
+class hda(object):
+    """Namespace mimicking hou.hda."""
+
+    _loaded_files = []
+
+    @classmethod
+    def installFile(
+        cls, file_path, oplibraries_file=None, change_oplibraries_file=True
+    ):
+        if file_path not in cls._loaded_files:
+            cls._loaded_files.append(file_path)
+
+    @classmethod
+    def uninstallFile(
+        cls, file_path, oplibraries_file=None, change_oplibraries_file=True
+    ):
+        if file_path in cls._loaded_files:
+            cls._loaded_files.remove(file_path)
+
+    @classmethod
+    def loadedFiles(cls):
+        return list(cls._loaded_files)
+
+
+class _ShelfItem(object):
+    """Stand-in for hou.Shelf and hou.Tool."""
+
+    def __init__(self, registry, name, file_path=None, **kwargs):
+        self._registry = registry
+        self._name = name
+        self._file_path = file_path
+        self._tools = []
+        self.kwargs = kwargs
+
+    def name(self):
+        return self._name
+
+    def filePath(self):
+        return self._file_path
+
+    def setFilePath(self, file_path):
+        self._file_path = file_path
+
+    def tools(self):
+        return tuple(self._tools)
+
+    def setTools(self, tools):
+        self._tools = list(tools)
+
+    def setData(self, **kwargs):
+        self.kwargs.update(kwargs)
+
+    def destroy(self):
+        self._registry.pop(self._name, None)
+
+
+class shelves(object):
+    """Namespace mimicking hou.shelves."""
+
+    _shelves = {}
+    _tools = {}
+
+    @classmethod
+    def shelves(cls):
+        return dict(cls._shelves)
+
+    @classmethod
+    def tools(cls):
+        return dict(cls._tools)
+
+    @classmethod
+    def newShelf(cls, file_path=None, name=None, label=None):
+        shelf = _ShelfItem(cls._shelves, name, file_path, label=label)
+        cls._shelves[name] = shelf
+        return shelf
+
+    @classmethod
+    def newTool(cls, file_path=None, name=None, label=None, script=None, **kwargs):
+        tool = _ShelfItem(
+            cls._tools, name, file_path, label=label, script=script, **kwargs
+        )
+        cls._tools[name] = tool
+        return tool
+
+    @classmethod
+    def loadFile(cls, file_path):
+        import xml.etree.ElementTree as ET
+
+        root = ET.parse(file_path).getroot()
+        for element in root.findall("tool"):
+            cls._tools[element.get("name")] = _ShelfItem(
+                cls._tools,
+                element.get("name"),
+                file_path,
+                label=element.get("label"),
+                script=element.findtext("script"),
+                icon=element.get("icon"),
+            )
+        for element in root.findall("toolshelf"):
+            shelf = cls._shelves.get(element.get("name"))
+            if shelf is None:
+                shelf = cls.newShelf(
+                    file_path, element.get("name"), element.get("label")
+                )
+            shelf.setFilePath(file_path)
+            shelf.setTools(
+                [cls._tools[tool.get("name")] for tool in element.findall("memberTool")]
+            )
+
+
+class pypanel(object):
+    """Namespace mimicking hou.pypanel."""
+
+    _installed_files = []
+
+    @classmethod
+    def installFile(cls, file_path):
+        cls._installed_files.append(file_path)
+
+    @classmethod
+    def interfacesInFile(cls, file_path):
+        return []
+
+
+def refreshStartupPathCacheDirectory(path):
+    pass
@@ -0,0 +1,56 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+from unittest import mock
+
+# Required so that the SHOTGUN_HOME env var will be set
+from tank_test.tank_test_base import setUpModule  # noqa
+
+from test_hooks_base import TestHooks
+
+
+class TestAppProfile(TestHooks):
+    """
+    Tests restricting the apps of the engine with an app profile, whose
+    environment is picked by the pick_environment hook of the test
+    configuration.
+    """
+
+    def setUp(self):
+        # the environment is picked when the engine starts
+        app_profile = mock.patch.dict(os.environ, {"TK_HOUDINI_APP_PROFILE": "farm"})
+        app_profile.start()
+        self.addCleanup(app_profile.stop)
+        super().setUp()
+
+    def _check_apps(self):
+        """
+        Checks that only the apps of the profile are initialized, and that the
+        otls of the others aren't loaded.
+        """
+        self.assertEqual(self.engine.environment["name"], "farm")
+        self.assertEqual(list(self.engine.apps), ["tk-multi-setframerange"])
+        self.assertFalse(
+            [path for path in self.engine._installed_otls if "alembic" in path]
+        )
+
+    def test_profile_apps(self):
+        """
+        The apps which aren't in the profile are not initialized.
+        """
+        self._check_apps()
+
+    def test_context_change(self):
+        """
+        The profile still applies after a context change.
+        """
+        self.engine.change_context(self.create_context(self.project))
+        self._check_apps()
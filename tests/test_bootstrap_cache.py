@@ -0,0 +1,171 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "plugins", "basic", "python"))
+
+from tk_houdini_basic.bootstrap_cache import TTL_ENV, BootstrapCache  # noqa
+
+SITE = "https://example.shotgunstudio.com"
+LOGIN = "artist"
+
+
+class TestBootstrapCache(unittest.TestCase):
+    """
+    Tests the cache of the basic plugin bootstrap. It doesn't need toolkit, the
+    parsing of the info.yml file is replaced by a stand-in.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+        self.plugin_root = os.path.join(self.temp_dir, "plugin")
+        os.makedirs(self.plugin_root)
+        self.info_yml = os.path.join(self.plugin_root, "info.yml")
+        with open(self.info_yml, "w") as info_yml:
+            info_yml.write("plugin_id: basic.houdini\n")
+
+        self.cache_folder = os.path.join(self.temp_dir, "cache")
+        self.parsed = []
+
+    def _parse_info_yml(self, path):
+        """
+        Stand-in for the yaml parsing done by the plugin bootstrap.
+        """
+        self.parsed.append(path)
+        return {
+            "plugin_id": "basic.houdini",
+            "base_configuration": {"type": "app_store", "name": "tk-config-basic"},
+        }
+
+    def _make_cache(self, ttl=3600):
+        return BootstrapCache(self.cache_folder, self.plugin_root, ttl=ttl)
+
+    def _touch_info_yml(self):
+        """
+        Changes info.yml, making sure its modification time changes on file
+        systems with a coarse resolution.
+        """
+        with open(self.info_yml, "a") as info_yml:
+            info_yml.write("# changed\n")
+        mtime = os.path.getmtime(self.info_yml) + 10
+        os.utime(self.info_yml, (mtime, mtime))
+
+    def test_plugin_info(self):
+        """
+        info.yml is only parsed again when it changes.
+        """
+        expected = (
+            "basic.houdini",
+            {"type": "app_store", "name": "tk-config-basic"},
+        )
+        self.assertEqual(
+            self._make_cache().get_plugin_info(self._parse_info_yml), expected
+        )
+        self.assertEqual(
+            self._make_cache().get_plugin_info(self._parse_info_yml), expected
+        )
+        self.assertEqual(self.parsed, [self.info_yml])
+
+        self._touch_info_yml()
+        self.assertEqual(
+            self._make_cache().get_plugin_info(self._parse_info_yml), expected
+        )
+        self.assertEqual(len(self.parsed), 2)
+
+    def test_resolved_configuration(self):
+        """
+        The resolved configuration is reused by the next launches until it
+        expires or info.yml changes.
+        """
+        uri = "sgtk:descriptor:app_store?name=tk-config-basic&version=v1.0.0"
+
+        cache = self._make_cache()
+        cache.get_plugin_info(self._parse_info_yml)
+        self.assertIsNone(cache.get_resolved_configuration(SITE, LOGIN))
+        cache.set_resolved_configuration(uri, SITE, LOGIN)
+
+        cache = self._make_cache()
+        self.assertEqual(cache.get_resolved_configuration(SITE, LOGIN), uri)
+
+        # expired
+        cache = self._make_cache(ttl=0.005)
+        time.sleep(0.01)
+        self.assertIsNone(cache.get_resolved_configuration(SITE, LOGIN))
+
+        # cleared, e.g. when the configuration is a PipelineConfiguration
+        cache = self._make_cache()
+        cache.set_resolved_configuration(None)
+        self.assertIsNone(self._make_cache().get_resolved_configuration(SITE, LOGIN))
+
+        # invalidated by a change of info.yml
+        self._make_cache().set_resolved_configuration(uri, SITE, LOGIN)
+        self._touch_info_yml()
+        cache = self._make_cache()
+        self.assertIsNone(cache.get_resolved_configuration(SITE, LOGIN))
+        cache.get_plugin_info(self._parse_info_yml)
+        self.assertIsNone(cache.get_resolved_configuration(SITE, LOGIN))
+
+    def test_opt_in(self):
+        """
+        The resolved configuration is only reused when a time to live is set.
+        """
+        uri = "sgtk:descriptor:app_store?name=tk-config-basic&version=v1.0.0"
+        cache = self._make_cache()
+        cache.get_plugin_info(self._parse_info_yml)
+        cache.set_resolved_configuration(uri, SITE, LOGIN)
+
+        with mock.patch.dict(os.environ):
+            os.environ.pop(TTL_ENV, None)
+            cache = BootstrapCache(self.cache_folder, self.plugin_root)
+            self.assertIsNone(cache.get_resolved_configuration(SITE, LOGIN))
+
+            os.environ[TTL_ENV] = "3600"
+            cache = BootstrapCache(self.cache_folder, self.plugin_root)
+            self.assertEqual(cache.get_resolved_configuration(SITE, LOGIN), uri)
+
+    def test_site_and_user(self):
+        """
+        The resolved configuration is only reused for the site and the user it
+        was resolved for.
+        """
+        uri = "sgtk:descriptor:app_store?name=tk-config-basic&version=v1.0.0"
+        cache = self._make_cache()
+        cache.get_plugin_info(self._parse_info_yml)
+        cache.set_resolved_configuration(uri, SITE, LOGIN)
+
+        cache = self._make_cache()
+        self.assertEqual(cache.get_resolved_configuration(SITE, LOGIN), uri)
+        self.assertIsNone(
+            cache.get_resolved_configuration("https://other.shotgunstudio.com", LOGIN)
+        )
+        self.assertIsNone(cache.get_resolved_configuration(SITE, "someone"))
+
+    def test_unwritable_cache(self):
+        """
+        The bootstrap doesn't fail when the cache can't be written.
+        """
+        # a file where the cache folder should be
+        with open(self.cache_folder, "w"):
+            pass
+        cache = self._make_cache()
+        self.assertEqual(
+            cache.get_plugin_info(self._parse_info_yml)[0], "basic.houdini"
+        )
+        cache.set_resolved_configuration("sgtk:descriptor:path?path=/tmp")
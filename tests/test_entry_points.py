@@ -0,0 +1,97 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+from tk_houdini import entry_points  # noqa
+
+
+class TestEntryPoints(unittest.TestCase):
+    """
+    Tests the scripts of the generated menu, shelf and panels.
+    """
+
+    def setUp(self):
+        modules = mock.patch.dict(sys.modules)
+        modules.start()
+        self.addCleanup(modules.stop)
+        sys.modules.pop(entry_points.MODULE_NAME, None)
+
+    def _run_menu_items_script(self, menu_name):
+        """
+        Runs the script listing the items of a dynamic menu, which houdini
+        runs as the body of a function.
+        """
+        script = entry_points.get_menu_items_script(menu_name)
+        code = "def contents():\n%s\n" % "\n".join(
+            "    " + line for line in script.splitlines()
+        )
+        namespace = {}
+        exec(code, namespace)
+        return namespace["contents"]()
+
+    def test_menu_items(self):
+        """
+        The menu lists the items cached by the menu of the engine.
+        """
+        entry_points.register()
+        engine = mock.Mock()
+        engine._menu.get_menu_items.return_value = ["tk.app.a.b", "B"]
+        with mock.patch.object(entry_points, "_get_engine", return_value=engine):
+            self.assertEqual(
+                self._run_menu_items_script(entry_points.APPS_MENU),
+                ["tk.app.a.b", "B"],
+            )
+        engine._menu.get_menu_items.assert_called_once_with(entry_points.APPS_MENU)
+
+    def test_not_registered(self):
+        """
+        The scripts don't fail when the engine hasn't registered the module.
+        """
+        self.assertEqual(
+            self._run_menu_items_script(entry_points.CONTEXT_MENU),
+            [entry_points.NO_ENGINE_MENU_ID, "Toolkit is disabled - Click for details"],
+        )
+        with mock.patch("builtins.print") as print_mock:
+            exec(entry_points.get_launch_script("tk.app.a.b"), {})
+            exec(
+                entry_points.get_menu_command_script(),
+                {"kwargs": {"selectedtoken": "tk.app.a.b"}},
+            )
+        print_mock.assert_called_with(entry_points.NOT_LOADED_MESSAGE)
+        self.assertEqual(print_mock.call_count, 2)
+
+    def test_launch_command(self):
+        """
+        The shelf tools launch their command.
+        """
+        entry_points.register()
+        engine = mock.Mock()
+        with mock.patch.object(entry_points, "_get_engine", return_value=engine):
+            exec(entry_points.get_launch_script("tk.app.it's"), {})
+        engine.launch_command.assert_called_once_with("tk.app.it's")
+
+    def test_panel_script(self):
+        """
+        The panel scripts define the function houdini calls.
+        """
+        namespace = {}
+        exec(entry_points.get_panel_script("panel", "Panel's title", None), namespace)
+        self.assertTrue(callable(namespace["createInterface"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib
+import os
+import sys
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+import hou  # noqa
+from tk_houdini import headless  # noqa
+
+# Required so that the SHOTGUN_HOME env var will be set
+from tank_test.tank_test_base import setUpModule  # noqa
+
+from test_hooks_base import TestHooks
+
+
+class TestHeadless(TestHooks):
+    """
+    Tests starting the engine in headless mode.
+    """
+
+    def setUp(self):
+        if hasattr(hou, "ui"):
+            self.skipTest("Headless mode requires Houdini to run without a UI.")
+
+        # the modules imported by other tests of the same process can't be
+        # unloaded, so there is nothing to check once Qt is imported.
+        if headless.get_loaded_qt_modules():
+            self.skipTest("Qt is already imported, run these tests on their own.")
+
+        environ = mock.patch.dict(os.environ, {"TK_HOUDINI_HEADLESS": "1"})
+        environ.start()
+        self.addCleanup(environ.stop)
+        super().setUp()
+
+    def test_no_qt_imported(self):
+        """
+        Starting the engine doesn't import any Qt module.
+        """
+        from sgtk.platform import qt
+
+        self.assertEqual(headless.get_loaded_qt_modules(), [])
+        self.assertIsNone(qt.QtCore)
+        self.assertIsNone(qt.QtGui)
+
+    def test_qt_imports_unblocked(self):
+        """
+        The imports of Qt are only blocked while the engine starts.
+        """
+        # the engine imports its own copy of tk_houdini
+        self.assertFalse(
+            [
+                finder
+                for finder in sys.meta_path
+                if type(finder).__name__ == "QtImportBlocker"
+            ]
+        )
+
+    def test_blocker(self):
+        """
+        Imports of the Qt bindings fail while the blocker is installed.
+        """
+        blocker = headless.QtImportBlocker()
+        blocker.install()
+        try:
+            with self.assertRaises(ImportError):
+                importlib.import_module("PySide6.QtCore")
+            # other modules are still imported
+            importlib.import_module("xml.dom.minidom")
+        finally:
+            blocker.uninstall()
+
+        self.assertEqual(blocker.blocked, ["PySide6"])
+        self.assertNotIn(blocker, sys.meta_path)
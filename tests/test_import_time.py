@@ -0,0 +1,119 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import subprocess
+import sys
+import unittest
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which must not be imported as a side effect of importing tk_houdini
+# or running the classic bootstrap module import.
+HEAVY_MODULES = [
+    "xml.etree.ElementTree",
+    "PySide2",
+    "PySide6",
+    "tk_houdini.ui_generation",
+    "tank_vendor.flow_integration_sdk",
+]
+
+# Standard library modules the startup files don't need, only imported by the
+# functions of the bootstrap module using them. They are checked instead of
+# the import time, which varies too much between machines and runs.
+LAZY_STDLIB_MODULES = [
+    "getpass",
+    "hashlib",
+    "json",
+    "logging",
+    "shutil",
+    "socket",
+    "tempfile",
+    "threading",
+]
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Checks the modules imported with the engine packages, using the output of
+    ``python -X importtime`` in a subprocess where ``hou`` is a stub.
+    """
+
+    def _import_times(self, code):
+        """
+        Runs the code in a new interpreter with -X importtime.
+
+        :returns: A tuple with a dictionary of module names to cumulative
+            import times in microseconds and the list of modules imported once
+            the code ran.
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [
+                os.path.join(repo_root, "python"),
+                os.path.join(repo_root, "tests", "fixtures", "fake_hou"),
+            ]
+        )
+        # Houdini always has hou imported, do the same so the measure only
+        # covers the engine packages. Modules imported with importlib are not
+        # reported by -X importtime, so sys.modules is reported too.
+        code = "import hou\n%s\nimport sys\nprint('\\n'.join(sys.modules))" % code
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env,
+            stderr=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            fields = line[len("import time:") :].split("|")
+            try:
+                cumulative = int(fields[1])
+            except ValueError:
+                # header line
+                continue
+            times[fields[2].strip()] = cumulative
+        return times, result.stdout.split()
+
+    def test_package_import(self):
+        """
+        Importing the package doesn't import the ui generation code nor the
+        modules only some functions need.
+        """
+        times, modules = self._import_times("import tk_houdini")
+        self.assertIn("tk_houdini", times)
+        for module in HEAVY_MODULES + LAZY_STDLIB_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_classic_bootstrap_import(self):
+        """
+        The import done by the classic startup pythonrc.py file doesn't pull in
+        the heavy modules.
+        """
+        times, modules = self._import_times("import tk_houdini.bootstrap")
+        self.assertIn("tk_houdini.bootstrap", times)
+        for module in HEAVY_MODULES + LAZY_STDLIB_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_lazy_attributes(self):
+        """
+        A sub module is imported when one of its attributes is accessed, and
+        only that one.
+        """
+        times, modules = self._import_times(
+            "import tk_houdini\ntk_houdini.StartupTimeline"
+        )
+        self.assertIn("tk_houdini.startup_timeline", modules)
+        self.assertNotIn("tk_houdini.ui_generation", modules)
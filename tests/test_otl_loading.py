@@ -9,6 +9,8 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+from unittest import mock
+
 import hou
 
 import sgtk
@@ -154,3 +156,70 @@ class TestLoadingOtls(TestHooks):
             )
             in sanitized_loaded_files
         )
+
+    def test_otls_installed_once(self):
+        """
+        Checks that an otl file installed from its source isn't installed
+        again from its local copy once it has been mirrored.
+        """
+        loaded_files = hou.hda.loadedFiles()
+        self.assertTrue(self.engine._installed_otls)
+
+        with mock.patch.object(
+            self.engine,
+            "_get_resource_path",
+            side_effect=lambda path: path + ".mirrored",
+        ):
+            self.engine._load_app_otls(self.tank_temp)
+        self.assertEqual(hou.hda.loadedFiles(), loaded_files)
+
+    def test_otl_manifest(self):
+        """
+        Checks that the otl manifest returns the gathered otl files and that its
+        entries are invalidated when the otl folders change.
+        """
+        tk_houdini = self.engine.import_module("tk_houdini")
+
+        self.app_otl_folder = os.path.join(self.tank_temp, "manifest_app", "otls")
+        os.makedirs(self.app_otl_folder)
+        self._make_folder("v18.x.x")
+        otl_file = os.path.join(self.app_otl_folder, "v18.x.x", "test.otl")
+        open(otl_file, "w").close()
+
+        calls = []
+
+        def resolver(otl_path):
+            calls.append(otl_path)
+            return self.engine._get_otl_files(otl_path)
+
+        def get_otl_files():
+            manifest = tk_houdini.OtlManifest(
+                self.engine.logger, self.engine._houdini_version, self.tank_temp
+            )
+            otl_files = manifest.get_otl_files(
+                "test_app", self.app_otl_folder, resolver
+            )
+            manifest.save()
+            return [ShotgunPath.from_current_os_path(path) for path in otl_files]
+
+        self.engine._houdini_version = (18, 5, 0)
+        expected = [ShotgunPath.from_current_os_path(otl_file)]
+
+        # The first call gathers the files, the second one uses the manifest.
+        self.assertEqual(get_otl_files(), expected)
+        self.assertEqual(get_otl_files(), expected)
+        self.assertEqual(len(calls), 1)
+
+        # Adding a file to the version folder invalidates the entry. Make sure
+        # the folder modification time changes on file systems with a coarse
+        # resolution.
+        version_folder = os.path.dirname(otl_file)
+        new_otl_file = os.path.join(version_folder, "new.otl")
+        open(new_otl_file, "w").close()
+        mtime = os.path.getmtime(version_folder) + 10
+        os.utime(version_folder, (mtime, mtime))
+        self.assertEqual(
+            sorted(get_otl_files()),
+            sorted(expected + [ShotgunPath.from_current_os_path(new_otl_file)]),
+        )
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,121 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "tests", "fixtures", "fake_hou"))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+import hou  # noqa
+from tk_houdini import ui_generation  # noqa
+
+
+class TestPanelTitles(unittest.TestCase):
+    """
+    Tests the titles of the panels written to the panels file.
+    """
+
+    def setUp(self):
+        self.engine = mock.Mock()
+        # the titles the panels are shown with
+        self.engine.get_panel_info.side_effect = lambda panel_name: {
+            "menu": {"id": "menu", "title": "Shotgun"},
+        }.get(panel_name)
+        self.app = mock.Mock(display_name="Panel App")
+        self.app.descriptor.get_icon_256.return_value = None
+
+    def _make_command(self, name, callback, **properties):
+        return ui_generation.AppCommand(
+            name,
+            {"properties": properties, "callback": callback},
+            app_instance_names={},
+        )
+
+    def _make_handler(self):
+        def show_panel():
+            pass
+
+        def show_dialog():
+            pass
+
+        def show_app_panel():
+            pass
+
+        commands = [
+            self._make_command("Shotgun Panel...", show_panel),
+            self._make_command("Dialog", show_dialog),
+        ]
+        panels = [
+            # the title property is used first
+            self._make_command("titled", show_dialog, title="Titled Panel"),
+            # then the title the panel is shown with
+            self._make_command("menu", show_panel),
+            # then the name of the app
+            self._make_command("app", show_app_panel, app=self.app),
+            # then the name of the panel
+            self._make_command("unnamed", lambda: None),
+        ]
+        return ui_generation.AppCommandsPanelHandler(self.engine, commands, panels)
+
+    def test_titles(self):
+        """
+        Each fallback of the title is used in order.
+        """
+        self.assertEqual(
+            self._make_handler()._get_panel_titles(),
+            {
+                "titled": "Titled Panel",
+                "menu": "Shotgun",
+                "app": "Panel App",
+                "unnamed": "unnamed",
+            },
+        )
+
+    def test_panel_info_error(self):
+        """
+        A panel whose callback fails is titled after its app.
+        """
+        self.engine.get_panel_info.side_effect = RuntimeError("no panel")
+        titles = self._make_handler()._get_panel_titles()
+        self.assertEqual(titles["menu"], "menu")
+        self.assertEqual(titles["app"], "Panel App")
+
+    def test_create_panels(self):
+        """
+        The panels are written with the titles they are shown with.
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        panels_file = os.path.join(temp_dir, "panels.pypanel")
+
+        self._make_handler().create_panels(panels_file)
+
+        # the callback of a panel with a title property isn't run
+        self.assertEqual(
+            sorted(call[0][0] for call in self.engine.get_panel_info.call_args_list),
+            ["app", "menu", "unnamed"],
+        )
+        labels = dict(
+            (interface.get("name"), interface.get("label"))
+            for interface in ET.parse(panels_file).getroot().iter("interface")
+        )
+        self.assertEqual(labels["menu"], "Shotgun")
+        self.assertIn(panels_file, hou.pypanel._installed_files)
+
+
+if __name__ == "__main__":
+    unittest.main()
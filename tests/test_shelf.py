@@ -0,0 +1,102 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+fake_hou_path = os.path.join(repo_root, "tests", "fixtures", "fake_hou")
+sys.path.insert(0, fake_hou_path)
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+import hou  # noqa
+from tk_houdini import ui_generation  # noqa
+
+
+class TestShelf(unittest.TestCase):
+    """
+    Tests creating and tearing down the shelf against the stand-in hou module.
+    """
+
+    def setUp(self):
+        if not hou.__file__.startswith(fake_hou_path):
+            self.skipTest("The shelf tests need the stand-in hou module.")
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+        shelves = mock.patch.multiple(hou.shelves, _shelves={}, _tools={})
+        shelves.start()
+        self.addCleanup(shelves.stop)
+
+        self.engine = mock.Mock()
+        self.commands = [
+            ui_generation.AppCommand(
+                "sgtk Command %d" % i,
+                {"properties": {"type": "default"}, "callback": mock.Mock()},
+            )
+            for i in range(5)
+        ]
+
+    def _create_shelf(self, bulk_load):
+        self.engine.get_setting.side_effect = lambda name, default=None: {
+            "menu_favourites": [],
+            "bulk_shelf_load": bulk_load,
+        }.get(name, default)
+        shelf = ui_generation.AppCommandsShelf(self.engine, self.commands)
+        shelf.create_shelf(os.path.join(self.temp_dir, "sg_shelf.xml"))
+        return shelf
+
+    def _get_tool_names(self):
+        return sorted(name for name in hou.shelves.tools() if name.startswith("sgtk_"))
+
+    def test_bulk_destroy_tools(self):
+        """
+        Tearing down a shelf loaded in bulk destroys its tools.
+        """
+        shelf = self._create_shelf(bulk_load=True)
+        self.assertEqual(len(self._get_tool_names()), 5)
+        self.assertEqual(
+            len(hou.shelves.shelves()["Flow Production Tracking"].tools()), 5
+        )
+
+        shelf.destroy_tools()
+        self.assertEqual(self._get_tool_names(), [])
+        self.assertEqual(hou.shelves.shelves()["Flow Production Tracking"].tools(), ())
+
+        # the shelf is created again by the next engine
+        self._create_shelf(bulk_load=True)
+        self.assertEqual(len(self._get_tool_names()), 5)
+
+    def test_bulk_destroy_shelf(self):
+        """
+        Destroying a shelf loaded in bulk doesn't leave any tool behind.
+        """
+        shelf = self._create_shelf(bulk_load=True)
+        shelf.destroy_shelf()
+        self.assertEqual(self._get_tool_names(), [])
+        self.assertNotIn("Flow Production Tracking", hou.shelves.shelves())
+
+    def test_destroy_tools(self):
+        """
+        The tools created one at a time are destroyed one at a time.
+        """
+        shelf = self._create_shelf(bulk_load=False)
+        self.assertEqual(len(self._get_tool_names()), 5)
+        shelf.destroy_tools()
+        self.assertEqual(self._get_tool_names(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
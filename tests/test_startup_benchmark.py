@@ -0,0 +1,361 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Startup regression benchmark.
+
+Starts the engine against the stand-in hou module, with synthetic apps shipping
+otl trees, then builds the menu, shelf and panels of 10, 100 and 500 registered
+commands and 0, 10 and 50 panels. The wall time, the allocations and the file
+system calls of each phase are written to a json file, and compared with a
+baseline when one is given.
+
+The benchmark is skipped unless TK_HOUDINI_BENCHMARK_OUTPUT is set::
+
+    TK_HOUDINI_BENCHMARK_OUTPUT=startup.json venv/bin/python -m pytest tests/test_startup_benchmark.py
+
+To check for regressions, set TK_HOUDINI_BENCHMARK_BASELINE to the output of a
+previous run. A phase regresses when it makes more file system calls than in
+the baseline, or when its wall time or allocations grow by more than
+TK_HOUDINI_BENCHMARK_TOLERANCE, 0.5 (50%) by default. Run it with the python of
+the testing environment rather than hython, so the stand-in hou module is used.
+"""
+
+import builtins
+import collections
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+fake_hou_path = os.path.join(repo_root, "tests", "fixtures", "fake_hou")
+sys.path.insert(0, fake_hou_path)
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+import hou  # noqa
+import sgtk  # noqa
+
+# Required so that the SHOTGUN_HOME env var will be set
+from tank_test.tank_test_base import TankTestBase, setUpModule  # noqa
+
+OUTPUT_ENV = "TK_HOUDINI_BENCHMARK_OUTPUT"
+BASELINE_ENV = "TK_HOUDINI_BENCHMARK_BASELINE"
+TOLERANCE_ENV = "TK_HOUDINI_BENCHMARK_TOLERANCE"
+
+# Numbers of registered commands and panels of the scenarios.
+COMMAND_COUNTS = [10, 100, 500]
+PANEL_COUNTS = [0, 10, 50]
+
+# Functions of the os module counted as file system calls. The os.path
+# functions are counted through the os.stat and os.lstat calls they make.
+FILESYSTEM_FUNCTIONS = [
+    "stat",
+    "lstat",
+    "listdir",
+    "scandir",
+    "mkdir",
+    "remove",
+    "rename",
+    "replace",
+    "utime",
+]
+
+# Wall times and allocations below these values are not compared, they are
+# too noisy.
+_MIN_WALL_MS = 5.0
+_MIN_ALLOCATED_KB = 64.0
+
+
+class PhaseProfiler(object):
+    """
+    Records the wall time, the allocations and the file system calls of the
+    phases of a scenario.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager profiling the wrapped block as the phase ``name``.
+        """
+        counts = collections.Counter()
+        originals = self._patch_filesystem(counts)
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            for (module, attr), original in originals.items():
+                setattr(module, attr, original)
+
+            self.results[name] = {
+                "wall_ms": round(wall * 1000, 3),
+                "allocated_kb": round((memory_after - memory_before) / 1024.0, 1),
+                "peak_kb": round((memory_peak - memory_before) / 1024.0, 1),
+                "fs_calls": dict(sorted(counts.items())),
+                "fs_calls_total": sum(counts.values()),
+            }
+
+    def _patch_filesystem(self, counts):
+        """
+        Replaces the file system functions with wrappers counting their calls.
+
+        :returns: A dictionary of (module, attribute name) to the original
+            functions.
+        """
+        originals = {}
+
+        def wrap(module, attr, key):
+            original = getattr(module, attr)
+            originals[(module, attr)] = original
+
+            def counting(*args, **kwargs):
+                counts[key] += 1
+                return original(*args, **kwargs)
+
+            setattr(module, attr, counting)
+
+        for name in FILESYSTEM_FUNCTIONS:
+            wrap(os, name, name)
+        wrap(builtins, "open", "open")
+        wrap(io, "open", "open")
+        return originals
+
+
+class SyntheticApp(object):
+    """
+    Stand-in for an app shipping otls. Only what the engine startup uses is
+    implemented.
+    """
+
+    class _Descriptor(object):
+        def __init__(self, uri):
+            self._uri = uri
+
+        def get_uri(self):
+            return self._uri
+
+    def __init__(self, name, disk_location):
+        self.name = name
+        self.display_name = name
+        self.version = "v1.0.0"
+        self.disk_location = disk_location
+        self.descriptor = self._Descriptor("sgtk:descriptor:path?path=%s" % name)
+
+
+class TestStartupBenchmark(TankTestBase):
+    """
+    Runs the startup benchmark scenarios.
+    """
+
+    def setUp(self):
+        if not os.environ.get(OUTPUT_ENV):
+            self.skipTest("Set %s to run the startup benchmark." % OUTPUT_ENV)
+        if not hou.__file__.startswith(fake_hou_path):
+            self.skipTest("The startup benchmark needs the stand-in hou module.")
+
+        super().setUp()
+        self.setup_fixtures()
+
+        from tk_houdini import bootstrap
+
+        temp_dir = os.path.join(self.tank_temp, "tk-houdini-temp")
+        os.makedirs(temp_dir)
+        environ = mock.patch.dict(
+            os.environ,
+            {bootstrap.g_temp_env: temp_dir, bootstrap.g_headless_env: "1"},
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.temp_dir = temp_dir
+
+        self.context = self.tk.context_from_entity("Project", self.project["id"])
+
+    def _make_apps(self, app_count, root):
+        """
+        Creates apps with an otl tree each: otls at the root of the otls folder
+        and in version folders, only some of which match the Houdini version.
+        """
+        apps = {}
+        major = hou.applicationVersion()[0]
+        for i in range(app_count):
+            app_folder = os.path.join(root, "app_%03d" % i)
+            otl_folders = [
+                os.path.join(app_folder, "otls"),
+                os.path.join(app_folder, "otls", "v%d.x.x" % major),
+                os.path.join(app_folder, "otls", "v%d.0.x" % (major - 1)),
+                os.path.join(app_folder, "otls", "v%d.x.x" % (major + 1)),
+            ]
+            for folder in otl_folders:
+                os.makedirs(folder)
+                for j in range(2):
+                    with open(os.path.join(folder, "node_%d.otl" % j), "w"):
+                        pass
+            apps["tk-app-%03d" % i] = SyntheticApp("tk-app-%03d" % i, app_folder)
+        return apps
+
+    def _register_commands(self, engine, command_count, panel_count):
+        """
+        Registers synthetic commands and panels.
+        """
+        for i in range(command_count):
+            engine.register_command(
+                "Synthetic Command %d" % i,
+                lambda: None,
+                {
+                    "type": "context_menu" if i % 10 == 0 else "default",
+                    "description": "Synthetic command %d." % i,
+                    "short_name": "synthetic_command_%d" % i,
+                },
+            )
+
+        panel_ids = {}
+        for i in range(panel_count):
+
+            def show_panel(name="panel_%d" % i):
+                engine.show_panel(panel_ids[name], name.title(), engine, object)
+
+            panel_ids["panel_%d" % i] = engine.register_panel(
+                show_panel, "panel_%d" % i
+            )
+
+    def _run_scenario(self, command_count, panel_count):
+        """
+        Runs a scenario and returns the results of its phases.
+        """
+        profiler = PhaseProfiler()
+        root = os.path.join(
+            self.tank_temp, "scenario_%d_%d" % (command_count, panel_count)
+        )
+        apps = self._make_apps(max(1, command_count // 10), root)
+
+        with mock.patch.object(
+            sgtk.platform.Engine, "apps", new_callable=mock.PropertyMock
+        ) as apps_property:
+            apps_property.return_value = apps
+
+            with profiler.phase("start_engine"):
+                engine = sgtk.platform.start_engine("tk-houdini", self.tk, self.context)
+            try:
+                tk_houdini = engine.import_module("tk_houdini")
+                self._register_commands(engine, command_count, panel_count)
+
+                with profiler.phase("get_registered_commands"):
+                    commands = tk_houdini.get_registered_commands(engine)
+                    panel_commands = tk_houdini.get_registered_panels(engine)
+
+                with profiler.phase("get_ui_cache_key"):
+                    tk_houdini.get_ui_cache_key(engine, commands, panel_commands)
+
+                with profiler.phase("create_menu"):
+                    tk_houdini.AppCommandsMenu(engine, commands).create_menu(
+                        os.path.join(root, "MainMenuCommon.xml")
+                    )
+
+                with profiler.phase("create_shelf"):
+                    shelf = tk_houdini.AppCommandsShelf(engine, commands)
+                    shelf.destroy_tools()
+                    shelf.create_shelf(os.path.join(root, "sg_shelf.xml"))
+
+                if panel_commands:
+                    with profiler.phase("create_panels"):
+                        tk_houdini.AppCommandsPanelHandler(
+                            engine, commands, panel_commands
+                        ).create_panels(os.path.join(root, "sg_panels.pypanel"))
+
+                # a second load of the otls, as after a context switch
+                with profiler.phase("reload_app_otls"):
+                    engine._load_app_otls(self.temp_dir)
+            finally:
+                engine.destroy()
+
+        return profiler.results
+
+    def test_startup(self):
+        """
+        Runs the scenarios, writes the results and compares them with the
+        baseline.
+        """
+        results = {
+            "python": "%d.%d" % sys.version_info[:2],
+            "houdini": hou.applicationVersionString(),
+            "scenarios": {},
+        }
+        for command_count in COMMAND_COUNTS:
+            for panel_count in PANEL_COUNTS:
+                name = "commands=%d,panels=%d" % (command_count, panel_count)
+                results["scenarios"][name] = self._run_scenario(
+                    command_count, panel_count
+                )
+
+        with open(os.environ[OUTPUT_ENV], "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+        baseline_path = os.environ.get(BASELINE_ENV)
+        if baseline_path:
+            with open(baseline_path) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = get_regressions(
+                baseline, results, float(os.environ.get(TOLERANCE_ENV, 0.5))
+            )
+            self.assertEqual(regressions, [], "\n".join(regressions))
+
+
+def get_regressions(baseline, results, tolerance):
+    """
+    Compares benchmark results with a baseline.
+
+    :param dict baseline: The results of a previous run.
+    :param dict results: The results to check.
+    :param float tolerance: The relative increase of the wall time and of the
+        allocations allowed.
+    :returns: A list of messages describing the regressions.
+    """
+    regressions = []
+    for scenario, phases in sorted(results["scenarios"].items()):
+        for phase, result in sorted(phases.items()):
+            reference = baseline["scenarios"].get(scenario, {}).get(phase)
+            if reference is None:
+                continue
+
+            label = "%s %s" % (scenario, phase)
+            if result["fs_calls_total"] > reference["fs_calls_total"]:
+                regressions.append(
+                    "%s: %d file system calls, %d in the baseline %s"
+                    % (
+                        label,
+                        result["fs_calls_total"],
+                        reference["fs_calls_total"],
+                        result["fs_calls"],
+                    )
+                )
+            for key, minimum in (
+                ("wall_ms", _MIN_WALL_MS),
+                ("allocated_kb", _MIN_ALLOCATED_KB),
+            ):
+                limit = max(reference[key] * (1 + tolerance), minimum)
+                if result[key] > limit:
+                    regressions.append(
+                        "%s: %s is %s, %s in the baseline"
+                        % (label, key, result[key], reference[key])
+                    )
+    return regressions
@@ -0,0 +1,107 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+from tk_houdini import bootstrap, ui_generation  # noqa
+
+
+@unittest.skipUnless(hasattr(os, "getuid"), "Ownership checks are posix only.")
+class TestStableTempDir(unittest.TestCase):
+    """
+    Tests the stable temp directory the engine writes its startup files to.
+    """
+
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._root)
+
+    def _get_mode(self, path):
+        return stat.S_IMODE(os.lstat(path).st_mode)
+
+    def test_private(self):
+        """
+        The directory is only accessible by the current user and reused.
+        """
+        temp_dir, stable = bootstrap._get_temp_dir("config", self._root)
+        self.assertTrue(stable)
+        self.assertEqual(self._get_mode(temp_dir), 0o700)
+        self.assertEqual(self._get_mode(os.path.dirname(temp_dir)), 0o700)
+        self.assertEqual(
+            bootstrap._get_temp_dir("config", self._root), (temp_dir, True)
+        )
+
+    def test_permissions_restricted(self):
+        """
+        An existing directory of the current user is restricted to them.
+        """
+        temp_dir, _ = bootstrap._get_temp_dir("config", self._root)
+        os.chmod(temp_dir, 0o777)
+        bootstrap._get_temp_dir("config", self._root)
+        self.assertEqual(self._get_mode(temp_dir), 0o700)
+
+    def test_other_owner(self):
+        """
+        A directory owned by another user isn't used.
+        """
+        temp_dir, _ = bootstrap._get_temp_dir("config", self._root)
+        with mock.patch.object(os, "getuid", return_value=os.getuid() + 1):
+            other_dir, stable = bootstrap._get_temp_dir("config", self._root)
+        self.assertFalse(stable)
+        self.assertNotEqual(other_dir, temp_dir)
+        self.assertEqual(os.path.dirname(other_dir), self._root)
+
+    def test_symlink(self):
+        """
+        A symlink in place of the directory isn't followed.
+        """
+        temp_dir, _ = bootstrap._get_temp_dir("config", self._root)
+        shutil.rmtree(temp_dir)
+        target = tempfile.mkdtemp(dir=self._root)
+        os.symlink(target, temp_dir)
+        other_dir, stable = bootstrap._get_temp_dir("config", self._root)
+        self.assertFalse(stable)
+        self.assertNotEqual(other_dir, temp_dir)
+
+    def test_menu_file(self):
+        """
+        The menu file shared by the sessions is replaced atomically: it is left
+        alone when it can't be written.
+        """
+        temp_dir, _ = bootstrap._get_temp_dir("config", self._root)
+        menu_file = os.path.join(temp_dir, "MainMenuCommon.xml")
+        self.assertTrue(ui_generation.write_menu_xml(menu_file, "PTR"))
+        with open(menu_file) as menu_file_handle:
+            content = menu_file_handle.read()
+
+        with mock.patch.object(os, "replace", side_effect=OSError("failed")):
+            with self.assertRaises(OSError):
+                ui_generation.write_menu_xml(menu_file, "Flow Production Tracking")
+        with open(menu_file) as menu_file_handle:
+            self.assertEqual(menu_file_handle.read(), content)
+        # no temp file is left behind
+        self.assertFalse(
+            [name for name in os.listdir(temp_dir) if name.startswith(".MainMenu")]
+        )
+
+        self.assertFalse(ui_generation.write_menu_xml(menu_file, "PTR"))
+
+
+if __name__ == "__main__":
+    unittest.main()
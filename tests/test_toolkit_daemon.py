@@ -0,0 +1,183 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+import sgtk
+
+# Required so that the SHOTGUN_HOME env var will be set
+from tank_test.tank_test_base import setUpModule  # noqa
+
+from test_hooks_base import TestHooks
+
+
+class TestToolkitDaemon(TestHooks):
+    """
+    Tests the toolkit daemon against the mocked site of the test project.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tk_houdini = self.engine.import_module("tk_houdini")
+
+        # the temp folder of the tests can be too deep for a socket path
+        socket_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_dir)
+        self.socket_path = os.path.join(socket_dir, "daemon.sock")
+
+        self.daemon = self.tk_houdini.ToolkitDaemon(self.socket_path, idle_timeout=30)
+        thread = threading.Thread(target=self.daemon.serve)
+        thread.start()
+        self.addCleanup(thread.join, 10)
+        self.addCleanup(self._query, {"request": "shutdown"})
+
+        # wait for the daemon to listen
+        for _ in range(100):
+            if self._query({"request": "ping"}):
+                break
+            threading.Event().wait(0.05)
+
+    def _query(self, request):
+        return self.tk_houdini.toolkit_daemon.query(self.socket_path, request)
+
+    def test_requests(self):
+        """
+        The daemon resolves the pipeline configuration and the contexts the
+        sessions ask for.
+        """
+        response = self._query({"request": "ping"})
+        self.assertEqual(response["pid"], os.getpid())
+        self.assertIsNone(response["login"])
+
+        response = self._query({"request": "tank_from_path", "path": self.project_root})
+        self.assertEqual(
+            response["pipeline_configuration"],
+            self.tk.pipeline_configuration.get_path(),
+        )
+        self.assertIn("work_path", response["templates"])
+
+        request = {
+            "request": "context_from_entity",
+            "entity_type": "Task",
+            "entity_id": self._task["id"],
+            "path": self.project_root,
+        }
+        context = sgtk.context.deserialize(self._query(request)["context"])
+        self.assertEqual(context, self._asset_task_ctx)
+
+        # the context is cached
+        self.assertEqual(len(self.daemon._contexts), 1)
+        self._query(request)
+        self.assertEqual(len(self.daemon._contexts), 1)
+
+        response = self._query(
+            {"request": "context_from_path", "path": self.project_root}
+        )
+        context = sgtk.context.deserialize(response["context"])
+        self.assertEqual(context.project["id"], self.project["id"])
+
+        # the toolkit instances expire with the contexts
+        self.daemon._context_ttl = 0
+        tk = self.daemon._get_tank(self.project_root)
+        self.assertIsNot(self.daemon._get_tank(self.project_root), tk)
+
+        self._query({"request": "invalidate"})
+        self.assertEqual(self.daemon._contexts, {})
+
+        # unknown requests and failures return None
+        self.assertIsNone(self._query({"request": "unknown"}))
+        self.assertIsNone(self._query({"request": "context_from_path"}))
+
+    def test_other_user(self):
+        """
+        The launcher restarts a daemon running for another user.
+        """
+        toolkit_daemon = self.tk_houdini.toolkit_daemon
+        user = mock.Mock(host="https://other.shotgunstudio.com", login="other")
+        with mock.patch.object(toolkit_daemon.subprocess, "Popen") as popen_mock:
+            with mock.patch.object(
+                sgtk.authentication, "serialize_user", return_value="user"
+            ):
+                toolkit_daemon.ensure_daemon(None, sys.executable, self.socket_path)
+                popen_mock.assert_not_called()
+
+                toolkit_daemon.ensure_daemon(user, sys.executable, self.socket_path)
+        popen_mock.assert_called_once()
+        self.assertEqual(popen_mock.call_args[0][0][0], sys.executable)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_unsupported(self):
+        """
+        The daemon isn't used where Unix sockets aren't available, or without
+        an interpreter to run it.
+        """
+        toolkit_daemon = self.tk_houdini.toolkit_daemon
+        with mock.patch.object(toolkit_daemon.subprocess, "Popen") as popen_mock:
+            with mock.patch.object(toolkit_daemon.sys, "platform", "win32"):
+                self.assertFalse(toolkit_daemon.is_supported())
+                self.assertIsNone(self._query({"request": "ping"}))
+                self.assertIsNone(
+                    toolkit_daemon.ensure_daemon(
+                        None, sys.executable, self.socket_path + ".new"
+                    )
+                )
+            self.assertIsNone(
+                toolkit_daemon.ensure_daemon(
+                    None, self.socket_path + ".missing", self.socket_path + ".new"
+                )
+            )
+        popen_mock.assert_not_called()
+
+    def test_resolve_context_from_path(self):
+        """
+        The sessions resolve the context of the files they open with the toolkit
+        instance of their engine, and keep their context when it is the same.
+        """
+        toolkit_daemon = self.tk_houdini.toolkit_daemon
+        tk, context = toolkit_daemon.resolve_context_from_path(
+            self.socket_path, self.project_root, self.engine
+        )
+        self.assertIs(tk, self.engine.sgtk)
+        self.assertEqual(context.project["id"], self.project["id"])
+        self.assertIsNone(context.task)
+
+        with mock.patch.object(
+            type(self.engine), "context", new_callable=mock.PropertyMock
+        ) as context_mock:
+            context_mock.return_value = context
+            self.assertIs(
+                toolkit_daemon.resolve_context_from_path(
+                    self.socket_path, self.project_root, self.engine
+                )[1],
+                context,
+            )
+
+        # files outside of the pipeline configuration are resolved by the
+        # sessions
+        self.assertIsNone(
+            toolkit_daemon.resolve_context_from_path(
+                self.socket_path, tempfile.gettempdir(), self.engine
+            )
+        )
+
+    def test_not_running(self):
+        """
+        The sessions bootstrap on their own when the daemon isn't running.
+        """
+        self.assertIsNone(
+            self.tk_houdini.toolkit_daemon.query(
+                self.socket_path + ".missing", {"request": "ping"}
+            )
+        )
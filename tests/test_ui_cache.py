@@ -0,0 +1,115 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+from tk_houdini import ui_cache  # noqa
+
+
+class _Command(object):
+    """
+    Stand-in for an `AppCommand`.
+    """
+
+    def __init__(self, name, properties=None):
+        self.name = name
+        self.properties = properties or {}
+
+    def get_id(self):
+        return "tk.app.test.%s" % self.name
+
+    def get_type(self):
+        return "default"
+
+    def get_icon(self):
+        return None
+
+    def get_description(self):
+        return None
+
+    def get_documentation_url_str(self):
+        return None
+
+    def get_app_name(self):
+        return "Test App"
+
+    def get_app_instance_name(self):
+        return "tk-multi-test"
+
+
+class TestUICache(unittest.TestCase):
+    """
+    Tests the cache of the generated shelf and panel definition files.
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        self.engine_folder = os.path.join(self.root, "tk-houdini")
+        os.makedirs(self.engine_folder)
+        self.engine_file = os.path.join(self.engine_folder, "engine.py")
+        with open(self.engine_file, "w") as engine_file:
+            engine_file.write("# engine\n")
+
+        self.engine = mock.Mock(
+            version="v1.0.0", disk_location=self.engine_folder, apps={}
+        )
+        self.engine.name = "tk-houdini"
+        self.engine.get_setting.return_value = []
+
+    def _get_key(self, panel_properties=None):
+        return ui_cache.get_ui_cache_key(
+            self.engine, [_Command("cmd")], [_Command("panel", panel_properties)]
+        )
+
+    def test_panel_title(self):
+        """
+        The key changes with the titles the panels are registered with.
+        """
+        key = self._get_key({"title": "My Panel"})
+        self.assertEqual(key, self._get_key({"title": "My Panel"}))
+        self.assertNotEqual(key, self._get_key({"title": "Other Panel"}))
+
+    def test_dev_version(self):
+        """
+        The files of a bundle without a version are part of the key.
+        """
+        key = self._get_key()
+        self.engine.version = "Undefined"
+        dev_key = self._get_key()
+        self.assertNotEqual(key, dev_key)
+        self.assertEqual(dev_key, self._get_key())
+
+        with open(self.engine_file, "a") as engine_file:
+            engine_file.write("# edited\n")
+        self.assertNotEqual(dev_key, self._get_key())
+
+    def test_read_write(self):
+        """
+        The content of the cached files is returned until it is pruned.
+        """
+        cache = ui_cache.UICache(mock.Mock(), os.path.join(self.root, "cache"))
+        self.assertIsNone(cache.read("key", "sg_shelf.xml"))
+        cache.write("key", "sg_shelf.xml", b"<shelfDocument/>")
+        self.assertEqual(cache.read("key", "sg_shelf.xml"), b"<shelfDocument/>")
+        self.assertIsNone(cache.read("other key", "sg_shelf.xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+from tk_houdini import ui_generation, ui_snapshot  # noqa
+
+
+class _Context(object):
+    """
+    Stand-in for a toolkit context.
+    """
+
+    def __init__(self, task_id):
+        self._task_id = task_id
+
+    def to_dict(self):
+        return {"task": {"type": "Task", "id": self._task_id}}
+
+
+class TestUISnapshotCache(unittest.TestCase):
+    """
+    Tests the cache of the UI state of the contexts.
+    """
+
+    def _make_snapshot(self, command_set_hash="hash"):
+        return ui_snapshot.UISnapshot(mock.Mock(command_set_hash=command_set_hash))
+
+    def test_get(self):
+        """
+        The snapshot of a context is returned while the commands are the same.
+        """
+        cache = ui_snapshot.UISnapshotCache()
+        snapshot = self._make_snapshot()
+        cache.put(_Context(1), snapshot)
+        self.assertIs(cache.get(_Context(1), "hash"), snapshot)
+        self.assertIsNone(cache.get(_Context(2), "hash"))
+
+        # the commands changed, the snapshot is dropped
+        self.assertIsNone(cache.get(_Context(1), "other hash"))
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        """
+        The least recently used snapshots are evicted.
+        """
+        cache = ui_snapshot.UISnapshotCache(max_count=2)
+        cache.put(_Context(1), self._make_snapshot())
+        cache.put(_Context(2), self._make_snapshot())
+        self.assertIsNotNone(cache.get(_Context(1), "hash"))
+        cache.put(_Context(3), self._make_snapshot())
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(_Context(2), "hash"))
+        self.assertIsNotNone(cache.get(_Context(1), "hash"))
+        self.assertIsNotNone(cache.get(_Context(3), "hash"))
+
+        disabled_cache = ui_snapshot.UISnapshotCache(max_count=0)
+        disabled_cache.put(_Context(1), self._make_snapshot())
+        self.assertEqual(len(disabled_cache), 0)
+
+    def test_expiry(self):
+        """
+        The snapshots older than the maximum age are dropped.
+        """
+        cache = ui_snapshot.UISnapshotCache(max_age=60)
+        cache.put(_Context(1), self._make_snapshot())
+        with mock.patch.object(time, "time", return_value=time.time() + 120):
+            self.assertIsNone(cache.get(_Context(1), "hash"))
+
+
+class TestCommandIndex(unittest.TestCase):
+    """
+    Tests telling whether the command index of an engine is current.
+    """
+
+    def _make_engine(self):
+        engine = mock.Mock(
+            context=mock.Mock(filesystem_locations=[]),
+            disk_location=repo_root,
+            apps={},
+            panels={},
+        )
+        engine._safe_path_join = os.path.join
+        engine._get_resource_path = lambda path: path
+        engine._command_index = None
+        engine.commands = {
+            "Command A": {"properties": {"type": "default"}, "callback": mock.Mock()},
+        }
+        return engine
+
+    def test_is_current(self):
+        """
+        The index is rebuilt when a command is replaced by another one, even
+        if the number of commands is the same.
+        """
+        engine = self._make_engine()
+        index = ui_generation.get_command_index(engine)
+        self.assertTrue(index.is_current(engine))
+        self.assertIs(ui_generation.get_command_index(engine), index)
+
+        del engine.commands["Command A"]
+        engine.commands["Command B"] = {
+            "properties": {"type": "default"},
+            "callback": mock.Mock(),
+        }
+        self.assertFalse(index.is_current(engine))
+        new_index = ui_generation.get_command_index(engine)
+        self.assertIsNot(new_index, index)
+        self.assertEqual(
+            [cmd.name for cmd in new_index.commands],
+            ["Jump to Flow Production Tracking", "Command B"],
+        )
+
+        engine.context = mock.Mock(filesystem_locations=[])
+        self.assertFalse(new_index.is_current(engine))
+
+    def test_command_set_hash(self):
+        """
+        The hash depends on the names and properties of the commands, not on
+        their callbacks.
+        """
+        engine = self._make_engine()
+        command_set_hash = ui_snapshot.get_command_set_hash(engine)
+
+        engine.commands["Command A"]["callback"] = mock.Mock()
+        self.assertEqual(ui_snapshot.get_command_set_hash(engine), command_set_hash)
+
+        engine.commands["Command A"]["properties"]["description"] = "A command."
+        self.assertNotEqual(ui_snapshot.get_command_set_hash(engine), command_set_hash)
+
+    def test_update_callbacks(self):
+        """
+        The callbacks of the commands registered again are bound to the index.
+        """
+        engine = self._make_engine()
+        index = ui_generation.get_command_index(engine)
+
+        callback = mock.Mock()
+        engine.commands["Command A"] = {
+            "properties": {"type": "default"},
+            "callback": callback,
+        }
+        self.assertIs(ui_generation.get_command_index(engine), index)
+        self.assertIs(index.callbacks["tk.app.None.command_a"], callback)
+        self.assertIs(index.commands_by_id["tk.app.None.command_a"].callback, callback)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+fake_hou_path = os.path.join(repo_root, "tests", "fixtures", "fake_hou")
+sys.path.insert(0, os.path.join(repo_root, "python"))
+sys.path.insert(0, fake_hou_path)
+
+import hou  # noqa
+from tk_houdini import worker_pool  # noqa
+
+
+class FakeEngine(object):
+    """
+    Stand-in for the engine, recording the hooks it executes.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.hooks = []
+
+    def execute_hook_expression(self, hook_expression, method_name, **kwargs):
+        self.hooks.append((hook_expression, method_name, kwargs, self.context))
+        return {"scene": hou.hipFile.path()}
+
+
+class FakeWorker(worker_pool.Worker):
+    """
+    Worker using a fake engine, the contexts are plain strings.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._engine = FakeEngine("project")
+
+    def _deserialize_context(self, serialized_context):
+        return serialized_context
+
+    def _change_context(self, context):
+        self._engine.context = context
+
+    def _get_current_engine(self):
+        return self._engine
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are required.")
+class TestWorkerPool(unittest.TestCase):
+    """
+    Tests the worker pool with the stand-in hou module and a local client.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.socket_path = os.path.join(self.temp_dir, "pool.sock")
+        hou.hipFile.clear()
+
+    def _listen(self):
+        listening_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listening_socket.bind(self.socket_path)
+        listening_socket.listen(4)
+        self.addCleanup(listening_socket.close)
+        return listening_socket
+
+    def test_worker(self):
+        """
+        A worker clears the scene, switches context, opens the hip file and
+        executes the hook of each job.
+        """
+        worker = FakeWorker(max_jobs=3)
+        thread = threading.Thread(target=worker.serve, args=(self._listen(),))
+        thread.start()
+
+        response = worker_pool.submit_job(
+            self.socket_path,
+            {
+                "id": 1,
+                "context": "shot",
+                "hip_file": "/jobs/shot.hip",
+                "hook": "{config}/farm/export.py",
+                "kwargs": {"frames": [1, 10]},
+                "save_as": "/jobs/shot_v002.hip",
+            },
+            timeout=10,
+        )
+        self.assertTrue(response["success"], response["error"])
+        self.assertEqual(response["id"], 1)
+        self.assertEqual(response["result"], {"scene": "/jobs/shot.hip"})
+        self.assertEqual(response["hip_file"], "/jobs/shot_v002.hip")
+        self.assertEqual(
+            worker._engine.hooks,
+            [("{config}/farm/export.py", "execute", {"frames": [1, 10]}, "shot")],
+        )
+
+        # the scene of the previous job is cleared
+        response = worker_pool.submit_job(self.socket_path, {"id": 2}, timeout=10)
+        self.assertTrue(response["success"])
+        self.assertEqual(response["hip_file"], "untitled.hip")
+
+        # a failing job doesn't stop the worker
+        worker._engine.execute_hook_expression = None
+        response = worker_pool.submit_job(
+            self.socket_path, {"id": 3, "hook": "{config}/farm/export.py"}, timeout=10
+        )
+        self.assertFalse(response["success"])
+        self.assertIn("not callable", response["error"])
+
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+
+    def test_pool(self):
+        """
+        The workers of a pool share the socket and are replaced once they ran
+        their jobs.
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [fake_hou_path, os.path.join(repo_root, "python")]
+        )
+        pool = worker_pool.WorkerPool(
+            self.socket_path,
+            2,
+            command=worker_pool.get_worker_command(sys.executable),
+            max_jobs=2,
+            env=env,
+        )
+        pool.start()
+        self.addCleanup(pool.stop)
+        thread = threading.Thread(target=pool.run, args=(0.1,))
+        thread.start()
+
+        # only the current user can connect, and a second pool doesn't replace
+        # the socket of a running one
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.listdir(self.temp_dir), ["pool.sock"])
+        with self.assertRaises(RuntimeError):
+            worker_pool.WorkerPool(self.socket_path, 1).start()
+
+        responses = [
+            worker_pool.submit_job(
+                self.socket_path,
+                {"id": i, "hip_file": "/jobs/%d.hip" % i},
+                timeout=30,
+            )
+            for i in range(6)
+        ]
+        pool.stop()
+        thread.join(10)
+
+        for i, response in enumerate(responses):
+            self.assertTrue(response["success"], response["error"])
+            self.assertEqual(response["hip_file"], "/jobs/%d.hip" % i)
+        # each worker runs 2 jobs at most
+        self.assertGreaterEqual(len(set(r["worker"] for r in responses)), 3)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+        # jobs using the engine fail without toolkit
+        pool = worker_pool.WorkerPool(
+            self.socket_path,
+            1,
+            command=worker_pool.get_worker_command(sys.executable),
+            env=env,
+        )
+        pool.start()
+        self.addCleanup(pool.stop)
+        response = worker_pool.submit_job(
+            self.socket_path, {"hook": "{config}/farm/export.py"}, timeout=30
+        )
+        self.assertFalse(response["success"])
+        self.assertIn("engine is not started", response["error"])
@@ -0,0 +1,158 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repo_root, "python"))
+
+from tk_houdini import zip_bundle  # noqa
+
+
+class TestZipBundle(unittest.TestCase):
+    """
+    Tests the zip archive of the engine python packages.
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.bundle_path = zip_bundle.build_bundle(
+            repo_root, os.path.join(temp_dir, "tk-houdini-test.zip")
+        )
+
+    def _run(self, code):
+        """
+        Runs code in a new interpreter with only the archive on sys.path.
+        """
+        return subprocess.check_output(
+            [
+                sys.executable,
+                "-B",
+                "-I",
+                "-c",
+                "import sys; sys.path.insert(0, %r)\n%s" % (self.bundle_path, code),
+            ],
+            universal_newlines=True,
+        ).split()
+
+    def test_content(self):
+        """
+        The archive holds the source and bytecode of the packages.
+        """
+        with zipfile.ZipFile(self.bundle_path) as bundle:
+            names = set(bundle.namelist())
+        for name in [
+            "tk_houdini/__init__.py",
+            "tk_houdini/bootstrap.py",
+            "flowam/host.py",
+            "tk_houdini_basic/plugin_bootstrap.py",
+        ]:
+            self.assertIn(name, names)
+            self.assertIn(name + "c", names)
+        self.assertFalse([name for name in names if "__pycache__" in name])
+
+    def test_import(self):
+        """
+        The packages are imported from the archive, and the engine root is
+        found from them as from the folders.
+        """
+        output = self._run(
+            "import os, zipimport\n"
+            "from tk_houdini import bootstrap\n"
+            "import flowam, tk_houdini_basic.bootstrap_cache\n"
+            "print(isinstance(bootstrap.__loader__, zipimport.zipimporter))\n"
+            "print(tk_houdini_basic.bootstrap_cache.__file__)\n"
+            "print(os.path.normpath("
+            "os.path.join(os.path.dirname(bootstrap.__file__), '..', '..')))\n"
+        )
+        self.assertEqual(output[0], "True")
+        self.assertTrue(output[1].startswith(self.bundle_path))
+        self.assertEqual(output[2], os.path.dirname(self.bundle_path))
+
+    def test_signature(self):
+        """
+        The archive is only validated while the sources it was built from
+        didn't change.
+        """
+        stamp_path = self.bundle_path + zip_bundle.STAMP_EXTENSION
+        self.assertTrue(os.path.isfile(stamp_path))
+        self.assertTrue(zip_bundle.check_bundle(repo_root, self.bundle_path))
+
+        with mock.patch.object(
+            zip_bundle, "get_source_signature", return_value="changed"
+        ), self.assertLogs(zip_bundle.logger, "WARNING"):
+            self.assertFalse(zip_bundle.check_bundle(repo_root, self.bundle_path))
+        self.assertFalse(os.path.exists(stamp_path))
+
+        # archives built before the signature was recorded aren't used
+        old_bundle_path = self.bundle_path + ".old.zip"
+        with zipfile.ZipFile(old_bundle_path, "w") as bundle:
+            bundle.writestr("tk_houdini/__init__.py", "")
+        self.assertFalse(zip_bundle.is_bundle_current(repo_root, old_bundle_path))
+
+    def test_startup_check(self):
+        """
+        The startup files use the archive while it matches its stamp, without
+        importing this module.
+        """
+        pythonrc_path = os.path.join(
+            repo_root,
+            "classic_startup",
+            "python%d.%dlibs" % sys.version_info[:2],
+            "pythonrc.py",
+        )
+        if not os.path.isfile(pythonrc_path):
+            self.skipTest("No startup file for this python version.")
+
+        # only define the function, running the file starts toolkit
+        with open(pythonrc_path) as pythonrc_file:
+            module = ast.parse(pythonrc_file.read())
+        module.body = [
+            node
+            for node in module.body
+            if isinstance(node, ast.Import)
+            or getattr(node, "name", None) == "_get_bundle_path"
+        ]
+        namespace = {}
+        exec(compile(module, pythonrc_path, "exec"), namespace)
+        get_bundle_path = namespace["_get_bundle_path"]
+
+        engine_root_path = os.path.dirname(self.bundle_path)
+        bundle_path = zip_bundle.get_bundle_path(engine_root_path)
+        self.assertIsNone(get_bundle_path(engine_root_path))
+
+        os.rename(self.bundle_path, bundle_path)
+        zip_bundle.write_stamp(bundle_path)
+        self.assertEqual(get_bundle_path(engine_root_path), bundle_path)
+        with mock.patch.dict(os.environ, {zip_bundle.BUNDLE_ENV: "0"}):
+            self.assertIsNone(get_bundle_path(engine_root_path))
+
+        # an archive replaced without being validated isn't used
+        with open(bundle_path, "ab") as bundle_file:
+            bundle_file.write(b"\0")
+        with mock.patch.object(sys, "stderr"):
+            self.assertIsNone(get_bundle_path(engine_root_path))
+
+    def test_benchmark(self):
+        """
+        The benchmark times the imports from the folders and the archive.
+        """
+        times = zip_bundle.benchmark(repo_root, self.bundle_path, repeat=1)
+        self.assertEqual(sorted(times), ["bundle", "folders"])
+        self.assertTrue(all(t > 0 for t in times.values()))